@@ -0,0 +1,194 @@
+"""
+Synthetic input generators for the benchmark suite.
+
+Every generator is seeded, so the same arguments always produce the same
+file, and writes in blocks so 50M-row inputs never have to fit in memory.
+"""
+
+import gzip
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import numpy as np
+import pandas as pd
+
+from bioconverter.bgzf import BgzfWriter
+from bioconverter.writers import COMPRESSION_EXTENSIONS, open_output
+
+# Rows generated and written per block
+BLOCK_ROWS = 500_000
+
+CHROM_LENGTHS = np.array([
+    248956422, 242193529, 198295559, 190214555, 181538259, 170805979, 159345973,
+    145138636, 138394717, 133797422, 135086622, 133275309, 114364328, 107043718,
+    101991189, 90338345, 83257441, 80373285, 58617616, 64444167, 46709983, 50818468,
+])
+BASES = np.array(list("ACGT"))
+
+
+def open_sink(path: str, compression: Optional[str]) -> BinaryIO:
+    """Binary output for a generated file: plain, gzip, BGZF, zstd or lz4."""
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "bgzip":
+        return BgzfWriter(path, level=6)
+    return open_output(path, compression)
+
+
+def input_path(data_dir: str, name: str, ext: str, compression: Optional[str]) -> Path:
+    """``<data_dir>/<name><ext>[.gz|.zst|.lz4]``"""
+    return Path(data_dir) / f"{name}{ext}{COMPRESSION_EXTENSIONS.get(compression, '')}"
+
+
+def _write_blocks(
+    path: Path,
+    compression: Optional[str],
+    n_rows: int,
+    make_block,
+    header: bytes = b"",
+    sep: str = "\t",
+) -> Path:
+    """Write ``make_block(rng, start, n)`` frames to ``path`` unless it already exists."""
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    rng = np.random.default_rng(20240101)
+    sink = open_sink(str(tmp_path), compression)
+    try:
+        sink.write(header)
+        for start in range(0, n_rows, BLOCK_ROWS):
+            block = make_block(rng, start, min(BLOCK_ROWS, n_rows - start))
+            text = block.to_csv(
+                sep=sep, index=False, header=start == 0 and not header, lineterminator="\n"
+            )
+            sink.write(text.encode("utf-8"))
+    finally:
+        sink.close()
+    tmp_path.rename(path)
+    return path
+
+
+def _alleles(rng, n):
+    ref = rng.integers(0, 4, n)
+    alt = (ref + rng.integers(1, 4, n)) % 4
+    return BASES[ref], BASES[alt]
+
+
+def gwas_sumstats(data_dir: str, n_rows: int, compression: Optional[str] = None) -> Path:
+    """GWAS summary statistics (CHR BP SNP A1 A2 FRQ BETA SE P N), tab separated."""
+    weights = CHROM_LENGTHS / CHROM_LENGTHS.sum()
+    per_chrom = np.floor(weights * n_rows).astype(np.int64)
+    per_chrom[0] += n_rows - per_chrom.sum()
+    chrom_of_row = np.repeat(np.arange(1, 23), per_chrom)
+
+    def make_block(rng, start, n):
+        chrom = chrom_of_row[start:start + n]
+        beta = rng.normal(0, 0.05, n)
+        se = rng.uniform(0.005, 0.05, n)
+        a1, a2 = _alleles(rng, n)
+        bp = rng.integers(1, CHROM_LENGTHS[chrom - 1])
+        return pd.DataFrame({
+            "CHR": chrom,
+            "BP": bp[np.lexsort((bp, chrom))],
+            "SNP": np.char.add("rs", (start + np.arange(n)).astype(str)),
+            "A1": a1,
+            "A2": a2,
+            "FRQ": rng.uniform(0.01, 0.99, n).round(4),
+            "BETA": beta.round(5),
+            "SE": se.round(5),
+            "P": np.exp(-np.abs(beta / se) ** 2 / 2).round(8),
+            "N": rng.integers(10_000, 500_000, n),
+        })
+
+    path = input_path(data_dir, f"gwas_{n_rows}", ".tsv", compression)
+    return _write_blocks(path, compression, n_rows, make_block)
+
+
+def plink_assoc(data_dir: str, n_rows: int) -> Path:
+    """PLINK .assoc.linear style output: space-padded, whitespace-delimited columns."""
+    path = Path(data_dir) / f"plink_{n_rows}.assoc.linear"
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(20240102)
+    with open(path, "w") as handle:
+        handle.write(
+            f"{'CHR':>4} {'SNP':>14} {'BP':>12} {'A1':>3} {'TEST':>6} "
+            f"{'NMISS':>7} {'BETA':>10} {'STAT':>10} {'P':>12}\n"
+        )
+        for start in range(0, n_rows, BLOCK_ROWS):
+            n = min(BLOCK_ROWS, n_rows - start)
+            beta = rng.normal(0, 0.05, n)
+            stat = beta / rng.uniform(0.005, 0.05, n)
+            lines = [
+                f"{c:>4} {'rs' + str(start + i):>14} {bp:>12} {a:>3} {'ADD':>6} "
+                f"{nm:>7} {b:>10.4g} {s:>10.4g} {p:>12.4g}\n"
+                for i, (c, bp, a, nm, b, s, p) in enumerate(zip(
+                    rng.integers(1, 23, n),
+                    rng.integers(1, 200_000_000, n),
+                    BASES[rng.integers(0, 4, n)],
+                    rng.integers(1000, 5000, n),
+                    beta,
+                    stat,
+                    np.exp(-stat ** 2 / 2),
+                ))
+            ]
+            handle.writelines(lines)
+    return path
+
+
+def multisample_vcf(
+    data_dir: str, n_variants: int, n_samples: int, compression: Optional[str] = None
+) -> Path:
+    """VCF with ``n_samples`` genotype columns (GT:DS)."""
+    samples = [f"S{i:05d}" for i in range(n_samples)]
+    header = (
+        "##fileformat=VCFv4.2\n"
+        "##source=bioconverter-benchmarks\n"
+        '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+        '##FORMAT=<ID=DS,Number=1,Type=Float,Description="Dosage">\n'
+        + "#" + "\t".join(["CHROM", "POS", "ID", "REF", "ALT", "QUAL", "FILTER", "INFO", "FORMAT"] + samples)
+        + "\n"
+    ).encode("utf-8")
+    genotypes = np.array(["0|0:0", "0|1:1", "1|0:1", "1|1:2"])
+
+    def make_block(rng, start, n):
+        ref, alt = _alleles(rng, n)
+        columns = {
+            "CHROM": np.repeat(1, n),
+            "POS": start * 10 + np.arange(n) * 10 + 1,
+            "ID": np.char.add("rs", (start + np.arange(n)).astype(str)),
+            "REF": ref,
+            "ALT": alt,
+            "QUAL": ".",
+            "FILTER": "PASS",
+            "INFO": ".",
+            "FORMAT": "GT:DS",
+        }
+        gt = genotypes[rng.choice(4, size=(n, n_samples), p=[0.6, 0.15, 0.15, 0.1])]
+        frame = pd.DataFrame(columns)
+        return pd.concat([frame, pd.DataFrame(gt, columns=samples)], axis=1)
+
+    path = input_path(data_dir, f"vcf_{n_variants}x{n_samples}", ".vcf", compression)
+    return _write_blocks(path, compression, n_variants, make_block, header=header)
+
+
+def proteomics_matrix(data_dir: str, n_proteins: int, n_samples: int) -> Path:
+    """Wide protein x sample intensity matrix with identifier columns (CSV)."""
+    samples = [f"Intensity_S{i:04d}" for i in range(n_samples)]
+
+    def make_block(rng, start, n):
+        ids = start + np.arange(n)
+        frame = pd.DataFrame({
+            "Protein_ID": np.char.add("P", ids.astype(str)),
+            "Gene_Name": np.char.add("GENE", ids.astype(str)),
+            "Peptide_Count": rng.integers(1, 60, n),
+        })
+        values = rng.lognormal(20, 2, size=(n, n_samples)).round(1)
+        return pd.concat([frame, pd.DataFrame(values, columns=samples)], axis=1)
+
+    path = Path(data_dir) / f"proteomics_{n_proteins}x{n_samples}.csv"
+    return _write_blocks(path, None, n_proteins, make_block, sep=",")
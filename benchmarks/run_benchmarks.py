@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the conversion hot paths.
+
+Generates seeded synthetic inputs (GWAS summary statistics, multi-sample
+VCFs, wide proteomics matrices, whitespace-delimited PLINK output) and times
+readers, standardize_columns, process_large_file and save_results across
+reader engines, compressions and output formats.
+
+Each case runs in a fresh process, so the peak RSS reported is that case's
+own (``setup_peak_rss_mb`` is the peak before the timed part: imports and,
+for standardize/save_results, loading the input). Results (rows/s, wall and
+CPU seconds, peak RSS, output bytes) are written to a JSON file with the
+environment they were measured in, for comparing releases:
+
+    python benchmarks/run_benchmarks.py --gwas-rows 1000000 --output results.json
+    python benchmarks/run_benchmarks.py --gwas-rows 1000000,10000000,50000000 \\
+        --only read,process_large_file
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import datagen  # noqa: E402
+
+GROUPS = ("read", "standardize", "vcf", "process_large_file", "save_results", "convert")
+
+INPUT_COMPRESSIONS = (None, "gzip", "bgzip", "zstd", "lz4")
+
+READ_ENGINES = ("c", "pyarrow", "c+memory_map")
+
+LARGE_FILE_OUTPUTS = (
+    ("csv", None),
+    ("tsv", "bgzip"),
+    ("tsv", "zstd"),
+    ("arrow", None),
+    ("dataset", None),
+)
+
+SAVE_OUTPUTS = (
+    ("tsv", None),
+    ("tsv", "gzip"),
+    ("tsv", "bgzip"),
+    ("csv", "zstd"),
+    ("parquet", None),
+    ("parquet", "zstd"),
+    ("arrow", None),
+    ("arrow", "lz4"),
+)
+
+GWAS_MAPPING = {"CHR": "chr", "BP": "pos", "SNP": "rsid", "A1": "effect_allele",
+                "A2": "other_allele", "FRQ": "eaf", "BETA": "beta", "SE": "se",
+                "P": "pval", "N": "n"}
+
+
+def _codec_available(compression: Optional[str]) -> bool:
+    if compression not in ("zstd", "lz4"):
+        return True
+    from bioconverter.decompression import require_codec
+
+    try:
+        require_codec(compression)
+    except ImportError:
+        return False
+    return True
+
+
+def _path_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+    return path.stat().st_size if path.exists() else 0
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# --- cases (run in the child process) ---------------------------------------
+
+
+def _run_read(case: Dict, out_dir: Path):
+    from bioconverter.convertor import read_delimited
+
+    engine = case["engine"]
+    kwargs = {"sep": "\t"}
+    if engine == "pyarrow":
+        kwargs["engine"] = "pyarrow"
+    elif engine == "c+memory_map":
+        kwargs["memory_map"] = True
+    compression = {"bgzip": "gzip"}.get(case["compression"], case["compression"])
+    df = read_delimited(case["input"], compression=compression, **kwargs)
+    return len(df), None
+
+
+def _load_gwas(case: Dict):
+    from bioconverter.convertor import read_delimited
+
+    return read_delimited(case["input"], sep="\t")
+
+
+def _run_standardize(case: Dict, out_dir: Path, df):
+    from bioconverter.convertor import standardize_columns
+
+    result = standardize_columns(df, keep_unmatched=True)
+    return len(result), None
+
+
+def _run_vcf(case: Dict, out_dir: Path):
+    from bioconverter.convertor import read_vcf_file
+
+    compression = "gzip" if case["compression"] else None
+    df = read_vcf_file(case["input"], compression)
+    return len(df), None
+
+
+def _run_process_large_file(case: Dict, out_dir: Path):
+    from bioconverter.interactive_converter import process_large_file
+    from bioconverter.writers import COMPRESSION_EXTENSIONS
+
+    output = out_dir / ("out" if case["output_format"] == "dataset" else
+                        f"out.{case['output_format']}"
+                        f"{COMPRESSION_EXTENSIONS.get(case['output_compression'], '')}")
+    summary = process_large_file(
+        case["input"],
+        str(output),
+        GWAS_MAPPING,
+        chunksize=case.get("chunksize", 500_000),
+        verbose=False,
+        coerce_types=True,
+        output_format=case["output_format"],
+        output_compression=case["output_compression"],
+        sep="\t",
+    )
+    return summary["rows_processed"], output
+
+
+def _run_save_results(case: Dict, out_dir: Path, df):
+    from bioconverter.convertor import save_results
+
+    saved = save_results(
+        {case["input"]: df},
+        str(out_dir),
+        output_format=case["output_format"],
+        compression=case["output_compression"],
+    )
+    return len(df), Path(next(iter(saved.values())))
+
+
+def _load_standardized(case: Dict):
+    from bioconverter.convertor import standardize_columns
+
+    return standardize_columns(_load_gwas(case), column_mapping=GWAS_MAPPING)
+
+
+def _run_convert(case: Dict, out_dir: Path):
+    from bioconverter.convertor import convert_single_file
+
+    df = convert_single_file(case["input"], verbose=False, coerce_types=True)
+    return len(df), None
+
+
+RUNNERS = {
+    "read": (_run_read, None),
+    "standardize": (_run_standardize, _load_gwas),
+    "vcf": (_run_vcf, None),
+    "process_large_file": (_run_process_large_file, None),
+    "save_results": (_run_save_results, _load_standardized),
+    "convert": (_run_convert, None),
+}
+
+
+def _child(case: Dict, queue) -> None:
+    """Run one case and report its measurements."""
+    try:
+        runner, setup = RUNNERS[case["group"]]
+        out_dir = Path(tempfile.mkdtemp(prefix="bioconverter_bench_"))
+        try:
+            args = (setup(case),) if setup else ()
+            setup_rss = _peak_rss_mb()
+            wall, cpu = time.perf_counter(), time.process_time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                rows, output = runner(case, out_dir, *args)
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            output_bytes = _path_size(output) if output is not None else None
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        queue.put({
+            "rows": rows,
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "rows_per_s": round(rows / wall) if wall > 0 else None,
+            "peak_rss_mb": _peak_rss_mb(),
+            "setup_peak_rss_mb": setup_rss,
+            "input_bytes": _path_size(Path(case["input"])),
+            "output_bytes": output_bytes,
+        })
+    except Exception as e:  # reported, not raised: one failing case must not stop the suite
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(case: Dict, timeout: Optional[float] = None) -> Dict:
+    """Run a case in a fresh process and return its result record."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(case, queue))
+    process.start()
+    try:
+        measurement = queue.get(timeout=timeout)
+    except Exception:
+        measurement = {"error": "timed out or crashed"}
+    process.join()
+    record = {key: value for key, value in case.items() if key != "input"}
+    record["input"] = Path(case["input"]).name
+    record.update(measurement)
+    return record
+
+
+# --- suite ------------------------------------------------------------------
+
+
+def build_cases(args) -> List[Dict]:
+    """Generate inputs as needed and list the cases to run."""
+    groups = set(args.only.split(",")) if args.only else set(GROUPS)
+    data_dir = args.data_dir
+    cases = []
+    gwas_rows = [int(n) for n in args.gwas_rows.split(",")]
+
+    for n_rows in gwas_rows:
+        plain = str(datagen.gwas_sumstats(data_dir, n_rows))
+        if "read" in groups:
+            for compression in INPUT_COMPRESSIONS:
+                if not _codec_available(compression):
+                    continue
+                path = str(datagen.gwas_sumstats(data_dir, n_rows, compression))
+                for engine in READ_ENGINES:
+                    if engine == "c+memory_map" and compression is not None:
+                        continue
+                    cases.append({"group": "read", "dataset": f"gwas_{n_rows}", "input": path,
+                                  "engine": engine, "compression": compression})
+        if "standardize" in groups:
+            cases.append({"group": "standardize", "dataset": f"gwas_{n_rows}", "input": plain})
+        if "process_large_file" in groups:
+            for output_format, output_compression in LARGE_FILE_OUTPUTS:
+                if _codec_available(output_compression):
+                    cases.append({"group": "process_large_file", "dataset": f"gwas_{n_rows}",
+                                  "input": plain, "output_format": output_format,
+                                  "output_compression": output_compression})
+        if "save_results" in groups:
+            for output_format, output_compression in SAVE_OUTPUTS:
+                if _codec_available(output_compression):
+                    cases.append({"group": "save_results", "dataset": f"gwas_{n_rows}",
+                                  "input": plain, "output_format": output_format,
+                                  "output_compression": output_compression})
+
+    if "vcf" in groups:
+        n_variants, n_samples = (int(n) for n in args.vcf.split("x"))
+        for compression in (None, "bgzip"):
+            path = str(datagen.multisample_vcf(data_dir, n_variants, n_samples, compression))
+            cases.append({"group": "vcf", "dataset": f"vcf_{args.vcf}", "input": path,
+                          "compression": compression})
+
+    if "convert" in groups:
+        n_proteins, n_samples = (int(n) for n in args.proteomics.split("x"))
+        cases.append({"group": "convert", "dataset": f"proteomics_{args.proteomics}",
+                      "input": str(datagen.proteomics_matrix(data_dir, n_proteins, n_samples))})
+        cases.append({"group": "convert", "dataset": f"plink_{args.plink_rows}",
+                      "input": str(datagen.plink_assoc(data_dir, args.plink_rows))})
+    return cases
+
+
+def environment() -> Dict[str, object]:
+    """Versions and machine details stored with the results."""
+    import numpy
+    import pandas
+
+    import bioconverter
+
+    try:
+        import pyarrow
+
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "bioconverter": bioconverter.__version__,
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def _case_label(record: Dict) -> str:
+    details = [
+        str(record[key])
+        for key in ("engine", "compression", "output_format", "output_compression")
+        if key in record
+    ]
+    return f"{record['group']:<18} {record['dataset']:<22} {' '.join(details):<22}"
+
+
+def compare(old_file: str, new_file: str, threshold: float = 0.1) -> int:
+    """Print rows/s changes between two result files; exit status 1 on regressions."""
+    def load(path):
+        with open(path) as handle:
+            return {_case_label(r): r for r in json.load(handle)["results"] if "error" not in r}
+
+    old, new = load(old_file), load(new_file)
+    regressions = 0
+    for label in sorted(old.keys() & new.keys()):
+        before, after = old[label]["rows_per_s"], new[label]["rows_per_s"]
+        if not before or not after:
+            continue
+        change = after / before - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{label} {before:>12,} -> {after:>12,} rows/s ({change:+.1%}){flag}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=str(Path(__file__).resolve().parent / ".data"),
+                        help="Where generated inputs are kept (reused between runs)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Results file (JSON)")
+    parser.add_argument("--gwas-rows", default="1000000",
+                        help="Comma-separated GWAS sizes, e.g. 1000000,10000000,50000000")
+    parser.add_argument("--vcf", default="100000x100", help="VCF variants x samples")
+    parser.add_argument("--proteomics", default="20000x500", help="Proteomics proteins x samples")
+    parser.add_argument("--plink-rows", type=int, default=1000000, help="PLINK output rows")
+    parser.add_argument("--only", help=f"Comma-separated groups to run ({', '.join(GROUPS)})")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per case; the fastest is kept")
+    parser.add_argument("--timeout", type=float, help="Seconds allowed per case")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="Compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+
+    print("Preparing inputs...")
+    cases = build_cases(args)
+    results = []
+    for i, case in enumerate(cases, 1):
+        runs = [run_case(case, args.timeout) for _ in range(max(1, args.repeat))]
+        ok = [run for run in runs if "error" not in run]
+        record = min(ok, key=lambda run: run["wall_s"]) if ok else runs[0]
+        record["repeat"] = len(runs)
+        results.append(record)
+        if "error" in record:
+            summary = f"ERROR {record['error']}"
+        else:
+            summary = (f"{record['rows_per_s']:>12,} rows/s  {record['peak_rss_mb']} MB peak"
+                       + (f"  {record['output_bytes']:,} B out" if record["output_bytes"] else ""))
+        print(f"[{i}/{len(cases)}] {_case_label(record)} {summary}")
+
+    with open(args.output, "w") as handle:
+        json.dump({"environment": environment(), "results": results}, handle, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
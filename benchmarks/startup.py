@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Startup-time check for the package import and the CLI.
+
+Workflow managers start the CLI once per file, so its fixed cost matters as
+much as conversion throughput. Each case runs in fresh interpreters; the best
+of ``--repeat`` runs, minus the cost of starting a bare interpreter, is
+compared with its target. Commands that do not convert anything must also
+not import pandas, numpy, pyarrow or scipy at all, which is checked exactly
+(timings vary between machines, imported modules do not).
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 20 --output startup.json
+
+Exits with status 1 if a target is missed or a heavy module is imported.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "scipy")
+
+# name -> (Python statements run in the child, target overhead in ms)
+CASES = {
+    "import": ("import bioconverter", 50),
+    "cli --help": ("from bioconverter.cli import main; main(['--help'])", 100),
+    "cli --show-patterns": ("from bioconverter.cli import main; main(['--show-patterns'])", 100),
+}
+
+# Reports the heavy modules a case imported (run after the case's statements)
+_REPORT_MODULES = (
+    "import json, sys; "
+    f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]), file=sys.stderr)"
+)
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def _wrap(statements: str) -> str:
+    """Run ``statements``, treating SystemExit (argparse --help) as the end of the case."""
+    return f"try:\n    {statements}\nexcept SystemExit:\n    pass\n"
+
+
+def best_time(code: str, repeat: int) -> float:
+    """Fastest wall time, in seconds, of ``python -c code`` over ``repeat`` runs."""
+    best = float("inf")
+    env = _child_env()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code], env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def heavy_imports(statements: str) -> List[str]:
+    """Heavy modules imported by ``statements``."""
+    result = subprocess.run(
+        [sys.executable, "-c", _wrap(statements) + _REPORT_MODULES],
+        env=_child_env(), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True,
+    )
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+def run(repeat: int, scale: float = 1.0) -> List[Dict[str, object]]:
+    """Time every case and check it against its target (scaled by ``scale``)."""
+    baseline = best_time("pass", repeat)
+    results = []
+    for name, (statements, target_ms) in CASES.items():
+        overhead_ms = (best_time(_wrap(statements), repeat) - baseline) * 1000
+        heavy = heavy_imports(statements)
+        results.append({
+            "case": name,
+            "overhead_ms": round(overhead_ms, 1),
+            "target_ms": target_ms * scale,
+            "heavy_imports": heavy,
+            "ok": overhead_ms <= target_ms * scale and not heavy,
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per case (best is kept)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply the targets (for slow CI machines)")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.scale)
+    print(f"{'Case':22s} {'Overhead':>10s} {'Target':>10s}  Heavy imports")
+    for record in results:
+        print(
+            f"{record['case']:22s} {record['overhead_ms']:8.1f}ms {record['target_ms']:8.0f}ms  "
+            f"{', '.join(record['heavy_imports']) or '-'}{'' if record['ok'] else '  FAIL'}"
+        )
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"python": sys.version.split()[0], "results": results}, handle, indent=2)
+    return 0 if all(record["ok"] for record in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
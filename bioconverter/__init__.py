@@ -4,32 +4,113 @@ bioconverter - A unified toolkit for bioinformatics data format conversion
 
 __version__ = "0.1.4"
 
-# Import main modules for easier access
-from .convertor import (
-    convert_single_file,
-    convert_multiple_files,
-    read_data,
-    read_vcf_file,
-    match_columns,
-    create_genetic_column_patterns,
-)
-
-from .interactive_converter import (
-    auto_suggest_mapping,
-    auto_detect_omics_type,
-    interactive_column_mapping,
-    process_large_file,
-    suggest_chunk_size,
-)
-
-from .conversion_report import ConversionReport
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names -> module defining them. Modules are imported on first access
+# (PEP 562), so ``import bioconverter`` and the CLI's --help do not pay for
+# pandas, pyarrow and scipy until a conversion needs them.
+_LAZY_IMPORTS = {
+    # Main conversion functions
+    "convert_single_file": "convertor",
+    "convert_multiple_files": "convertor",
+    "read_data": "convertor",
+    "read_vcf_file": "convertor",
+    "read_regions": "convertor",
+    "match_columns": "convertor",
+    "create_genetic_column_patterns": "convertor",
+    "convert_many": "async_convert",
+    # Interactive functions
+    "auto_suggest_mapping": "interactive_converter",
+    "auto_detect_omics_type": "interactive_converter",
+    "interactive_column_mapping": "interactive_converter",
+    "process_large_file": "interactive_converter",
+    "suggest_chunk_size": "interactive_converter",
+    # Report class
+    "ConversionReport": "conversion_report",
+    "BatchReport": "conversion_report",
+    "merge_files": "merge",
+    "plan_merge": "merge",
+    "align_frames": "alignment",
+    "align_files": "alignment",
+    "variant_hash_keys": "variants",
+    "packed_variant_keys": "variants",
+    "add_variant_key": "variants",
+    # Post-mapping stages
+    "coerce_standard_columns": "coercion",
+    "derive_statistics": "derivation",
+    # Coordinate sort and region queries
+    "sort_by_coordinates": "genomic_index",
+    "write_indexed_table": "genomic_index",
+    "query_region": "genomic_index",
+    "query_regions": "genomic_index",
+    # Partitioned Parquet datasets
+    "write_parquet_dataset": "dataset",
+    # Profiling hooks
+    "ConversionHook": "profiling",
+    "CProfileHook": "profiling",
+    "SamplingProfilerHook": "profiling",
+    "TraceFileHook": "profiling",
+    # Progress reporting
+    "ProgressHook": "progress",
+    "ProgressBar": "progress",
+    # Long-lived conversion worker
+    "ConversionWorker": "worker",
+    "submit_job": "worker",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
+
+if TYPE_CHECKING:  # pragma: no cover - for type checkers and IDEs only
+    from .async_convert import convert_many
+    from .coercion import coerce_standard_columns
+    from .conversion_report import BatchReport, ConversionReport
+    from .convertor import (
+        convert_multiple_files,
+        convert_single_file,
+        create_genetic_column_patterns,
+        match_columns,
+        read_data,
+        read_regions,
+        read_vcf_file,
+    )
+    from .dataset import write_parquet_dataset
+    from .merge import merge_files, plan_merge
+    from .alignment import align_files, align_frames
+    from .variants import add_variant_key, packed_variant_keys, variant_hash_keys
+    from .derivation import derive_statistics
+    from .genomic_index import query_region, query_regions, sort_by_coordinates, write_indexed_table
+    from .interactive_converter import (
+        auto_detect_omics_type,
+        auto_suggest_mapping,
+        interactive_column_mapping,
+        process_large_file,
+        suggest_chunk_size,
+    )
+    from .profiling import ConversionHook, CProfileHook, SamplingProfilerHook, TraceFileHook
+    from .progress import ProgressBar, ProgressHook
+    from .worker import ConversionWorker, submit_job
 
 __all__ = [
     # Main conversion functions
     "convert_single_file",
     "convert_multiple_files",
+    "convert_many",
     "read_data",
     "read_vcf_file",
+    "read_regions",
     "match_columns",
     "create_genetic_column_patterns",
     # Interactive functions
@@ -40,4 +121,35 @@ __all__ = [
     "suggest_chunk_size",
     # Report class
     "ConversionReport",
+    "BatchReport",
+    # Post-mapping stages
+    "coerce_standard_columns",
+    "derive_statistics",
+    # Coordinate sort and region queries
+    "sort_by_coordinates",
+    "write_indexed_table",
+    "query_region",
+    "query_regions",
+    # Partitioned Parquet datasets
+    "write_parquet_dataset",
+    # Streaming merge of many inputs into one table
+    "merge_files",
+    "plan_merge",
+    # Cross-study variant alignment
+    "align_frames",
+    "align_files",
+    "variant_hash_keys",
+    "packed_variant_keys",
+    "add_variant_key",
+    # Profiling hooks
+    "ConversionHook",
+    "CProfileHook",
+    "SamplingProfilerHook",
+    "TraceFileHook",
+    # Progress reporting
+    "ProgressHook",
+    "ProgressBar",
+    # Long-lived conversion worker
+    "ConversionWorker",
+    "submit_job",
 ]
@@ -0,0 +1,407 @@
+"""
+Alignment Module
+Joins studies on their variants and aligns effect alleles to a reference study
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .convertor import detect_file_format
+from .decompression import STREAM_COMPRESSIONS, open_input
+from .genomic_index import chromosome_sort_key
+from .profiling import HookSpec
+from .stage_timing import StageTimer
+from .variants import VARIANT_KEY_COLUMN, allele_columns, encode_alleles, variant_hash_keys
+from .writers import open_table_writer
+
+# Orientation of a study's alleles relative to the reference
+ALIGN_MISSING = 0  # variant not in the study (or alleles incompatible)
+ALIGN_SAME = 1  # same effect allele
+ALIGN_SWAPPED = -1  # effect and other allele swapped
+ALIGN_STRAND = 2  # same effect allele on the opposite strand
+ALIGN_STRAND_SWAPPED = -2  # swapped, on the opposite strand
+
+# How statistics change when the effect allele is swapped
+NEGATED_COLUMNS = ("beta", "z", "t_stat", "log2fc")
+INVERTED_COLUMNS = ("or",)
+COMPLEMENTED_COLUMNS = ("frq",)
+
+# Columns not carried over from studies: the join key and the allele columns
+_KEY_COLUMNS = ("chr", "pos", "a1", "a2", "ref", "alt", VARIANT_KEY_COLUMN)
+
+
+def allele_orientation(
+    ref_effect, ref_other, study_effect, study_other
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Orientation of each study row's alleles relative to the reference row.
+
+    Vectorized over rows: alleles are normalized once per distinct value
+    and compared as integer codes.
+    A palindromic SNP (A/T or C/G) looks the same on both strands, so its
+    strand cannot be told from the alleles; it is aligned as written
+    (``ALIGN_SAME`` or ``ALIGN_SWAPPED``) and flagged as ambiguous.
+
+    Returns:
+        Tuple of (orientation codes as int8, palindromic flags as bool)
+    """
+    ((r1, r1_comp), (r2, _), (s1, s1_comp), (s2, s2_comp)), _ = encode_alleles(
+        ref_effect, ref_other, study_effect, study_other
+    )
+    present = (r1 >= 0) & (r2 >= 0) & (s1 >= 0) & (s2 >= 0)
+    orientation = np.select(
+        [
+            present & (s1 == r1) & (s2 == r2),
+            present & (s1 == r2) & (s2 == r1),
+            present & (s1_comp == r1) & (s2_comp == r2),
+            present & (s1_comp == r2) & (s2_comp == r1),
+        ],
+        [ALIGN_SAME, ALIGN_SWAPPED, ALIGN_STRAND, ALIGN_STRAND_SWAPPED],
+        ALIGN_MISSING,
+    ).astype(np.int8)
+    palindromic = present & (r1_comp == r2) & (r1 != r2)
+    return orientation, palindromic
+
+
+def harmonise_statistics(study: pd.DataFrame, orientation: np.ndarray) -> pd.DataFrame:
+    """
+    Express a study's statistics in the reference's effect allele.
+
+    Where the alleles are swapped, beta/z/t_stat/log2fc change sign, odds
+    ratios are inverted and frequencies complemented; rows that did not
+    match are set to missing.
+    """
+    result = study.copy()
+    swapped = orientation < 0
+    missing = orientation == ALIGN_MISSING
+    for column in result.columns:
+        values = result[column]
+        if column in NEGATED_COLUMNS + INVERTED_COLUMNS + COMPLEMENTED_COLUMNS:
+            values = pd.to_numeric(values, errors="coerce").astype("float64")
+            if column in NEGATED_COLUMNS:
+                values = values.where(~swapped, -values)
+            elif column in INVERTED_COLUMNS:
+                values = values.where(~swapped, 1.0 / values)
+            else:
+                values = values.where(~swapped, 1.0 - values)
+        result[column] = values.mask(missing) if missing.any() else values
+    return result
+
+
+def _has_packed_keys(df: pd.DataFrame) -> bool:
+    """Whether a table has a complete packed variant key column (``--variant-key``)."""
+    return VARIANT_KEY_COLUMN in df.columns and not df[VARIANT_KEY_COLUMN].isna().any()
+
+
+def _variant_keys(df: pd.DataFrame, alleles: Tuple[str, str], packed: bool) -> np.ndarray:
+    """Join keys of a table: its packed variant keys, or hashed keys built here."""
+    if packed:
+        return df[VARIANT_KEY_COLUMN].to_numpy(dtype=np.int64)
+    return variant_hash_keys(df, alleles=alleles)
+
+
+def _join_study(
+    reference: pd.DataFrame,
+    ref_keys: np.ndarray,
+    ref_alleles: Tuple[str, str],
+    study: pd.DataFrame,
+    name: str,
+    drop_ambiguous: bool,
+    packed: bool = False,
+) -> pd.DataFrame:
+    """Study columns (prefixed with ``name``) aligned to the reference rows."""
+    study_alleles = allele_columns(study)
+    study_keys = _variant_keys(study, study_alleles, packed)
+    # A variant listed twice in a study is joined on its first row
+    first = ~pd.Index(study_keys).duplicated()
+    study, study_keys = study[first], study_keys[first]
+    rows = pd.Index(study_keys).get_indexer(ref_keys)
+    found = rows >= 0
+    if len(study):
+        matched = study.iloc[np.where(found, rows, 0)].reset_index(drop=True)
+    else:
+        matched = study.reindex(range(len(reference)))
+
+    orientation, palindromic = allele_orientation(
+        reference[ref_alleles[0]], reference[ref_alleles[1]],
+        matched[study_alleles[0]], matched[study_alleles[1]],
+    )
+    orientation[~found] = ALIGN_MISSING
+    if drop_ambiguous:
+        orientation[palindromic] = ALIGN_MISSING
+    stats = matched[[col for col in matched.columns if col not in _KEY_COLUMNS]]
+    stats = harmonise_statistics(stats, orientation)
+    stats.columns = [f"{name}_{col}" for col in stats.columns]
+    stats[f"{name}_orientation"] = orientation
+    stats[f"{name}_ambiguous"] = palindromic & (orientation != ALIGN_MISSING)
+    stats.index = reference.index
+    return stats
+
+
+def align_frames(
+    reference: pd.DataFrame,
+    studies: Dict[str, pd.DataFrame],
+    how: str = "left",
+    drop_ambiguous: bool = False,
+) -> pd.DataFrame:
+    """
+    Join studies to a reference study in memory and align their effect alleles.
+
+    Variants are matched on a hashed key of chromosome, position and the
+    canonical allele pair (``variant_hash_keys``), built once per table, so
+    swapped or strand-flipped alleles still match. Tables converted with a
+    packed ``variant_key`` column are joined on it directly. Each study contributes
+    its columns prefixed with its name, with statistics expressed in the
+    reference's effect allele, plus ``<name>_orientation`` (an ``ALIGN_*``
+    code) and ``<name>_ambiguous`` (palindromic SNPs, whose strand cannot
+    be told from the alleles).
+
+    Args:
+        reference: Standardized reference table (chr, pos and a1/a2 or alt/ref)
+        studies: Standardized studies {name: table}
+        how: 'left' keeps every reference variant, 'inner' only those found
+            in every study
+        drop_ambiguous: Treat palindromic SNPs as not found
+
+    Returns:
+        Reference columns followed by every study's aligned columns
+    """
+    if how not in ("left", "inner"):
+        raise ValueError(f"how must be 'left' or 'inner', not {how!r}")
+    ref_alleles = allele_columns(reference)
+    reference = reference.reset_index(drop=True)
+    ref_packed = _has_packed_keys(reference)
+    ref_keys = {}  # packed or hashed -> reference join keys
+    parts = [reference]
+    for name, study in studies.items():
+        packed = ref_packed and _has_packed_keys(study)
+        if packed not in ref_keys:
+            ref_keys[packed] = _variant_keys(reference, ref_alleles, packed)
+        parts.append(
+            _join_study(reference, ref_keys[packed], ref_alleles, study, name, drop_ambiguous, packed)
+        )
+    aligned = pd.concat(parts, axis=1)
+    if how == "inner" and studies:
+        found = np.logical_and.reduce(
+            [aligned[f"{name}_orientation"].to_numpy() != ALIGN_MISSING for name in studies]
+        )
+        aligned = aligned[found].reset_index(drop=True)
+    return aligned
+
+
+def _coordinate_rank(df: pd.DataFrame, bound_chr: Optional[str] = None) -> np.ndarray:
+    """
+    Per-row chromosome order: ranks in natural order, or with ``bound_chr``,
+    -1/0/1 for chromosomes before, equal to or after it.
+    """
+    codes, uniques = pd.factorize(df["chr"].to_numpy(dtype=object), use_na_sentinel=True)
+    keys = [chromosome_sort_key(name) for name in uniques]
+    if bound_chr is None:
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        ranks = np.empty(len(keys) + 1, dtype=np.int64)
+        ranks[order] = np.arange(len(keys))
+        ranks[-1] = len(keys)  # missing chromosome last
+    else:
+        bound = chromosome_sort_key(bound_chr)
+        ranks = np.array([(key > bound) - (key < bound) for key in keys] + [1], dtype=np.int64)
+    return ranks[codes]
+
+
+def _positions(df: pd.DataFrame) -> np.ndarray:
+    return pd.to_numeric(df["pos"], errors="coerce").fillna(-1).to_numpy(dtype="int64")
+
+
+def _check_sorted(df: pd.DataFrame, source: str) -> None:
+    ranks, positions = _coordinate_rank(df), _positions(df)
+    step_rank, step_pos = np.diff(ranks), np.diff(positions)
+    if ((step_rank < 0) | ((step_rank == 0) & (step_pos < 0))).any():
+        raise ValueError(
+            f"{source} is not sorted by chromosome and position; convert it with --sort"
+        )
+
+
+def read_sorted_chunks(filename: str, chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """
+    Read a standardized output in chunks, in file order.
+
+    Reads csv/tsv (plain, gzip/bgzip, zstd, lz4), Parquet files and Arrow
+    IPC/Feather files. Chromosomes and alleles are read as strings.
+    """
+    suffixes = "".join(Path(filename).suffixes).lower()
+    if ".parquet" in suffixes:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(filename).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    if ".arrow" in suffixes or ".feather" in suffixes:
+        import pyarrow as pa
+
+        with pa.memory_map(str(filename)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+        return
+    sep, compression, comment, _ = detect_file_format(filename)
+    text = {column: "string" for column in _KEY_COLUMNS if column not in ("pos", VARIANT_KEY_COLUMN)}
+    if compression in STREAM_COMPRESSIONS:
+        with open_input(filename, compression) as handle:
+            yield from pd.read_csv(handle, sep=sep, comment=comment, dtype=text, chunksize=chunksize)
+    else:
+        yield from pd.read_csv(
+            filename, sep=sep, compression=compression, comment=comment, dtype=text,
+            chunksize=chunksize,
+        )
+
+
+class _SortedStream:
+    """Coordinate-sorted chunks of one study, handed out up to a bound."""
+
+    def __init__(self, filename: str, chunksize: int):
+        self.filename = filename
+        self._chunks = read_sorted_chunks(filename, chunksize)
+        self._buffer = None
+        self._exhausted = False
+
+    def _not_after(self, df: pd.DataFrame, chrom: str, pos: int) -> np.ndarray:
+        rank = _coordinate_rank(df, chrom)
+        return (rank < 0) | ((rank == 0) & (_positions(df) <= pos))
+
+    def take_through(self, chrom: str, pos: int) -> pd.DataFrame:
+        """Remove and return the rows at or before (chrom, pos)."""
+        while not self._exhausted and (
+            self._buffer is None
+            or len(self._buffer) == 0
+            or self._not_after(self._buffer.iloc[-1:], chrom, pos)[0]
+        ):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._exhausted = True
+                break
+            self._buffer = chunk if self._buffer is None else pd.concat(
+                [self._buffer, chunk], ignore_index=True
+            )
+            _check_sorted(self._buffer, self.filename)
+        if self._buffer is None:  # empty input
+            return pd.DataFrame(columns=["chr", "pos", "a1", "a2"])
+        taken = int(self._not_after(self._buffer, chrom, pos).sum())
+        result, self._buffer = self._buffer.iloc[:taken], self._buffer.iloc[taken:]
+        return result.reset_index(drop=True)
+
+
+def _reference_chunks(filename: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Reference chunks that never split the rows of one position, so every
+    position's study rows are joined with all of its reference rows at once.
+    """
+    carry = None
+    for chunk in read_sorted_chunks(filename, chunksize):
+        if carry is not None and len(carry):
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        _check_sorted(chunk, filename)
+        last_chr, last_pos = chunk["chr"].iloc[-1], _positions(chunk.iloc[-1:])[0]
+        tail = (chunk["chr"] == last_chr).to_numpy() & (_positions(chunk) == last_pos)
+        keep = len(chunk) - int(tail.sum())
+        if keep == 0:  # one position so far; read on
+            carry = chunk
+            continue
+        carry = chunk.iloc[keep:]
+        yield chunk.iloc[:keep].reset_index(drop=True)
+    if carry is not None and len(carry):
+        yield carry.reset_index(drop=True)
+
+
+def align_files(
+    reference_file: str,
+    study_files: Dict[str, str],
+    output_file: str,
+    output_format: str = "tsv",
+    compression: Optional[str] = None,
+    how: str = "left",
+    drop_ambiguous: bool = False,
+    chunksize: int = 100000,
+    verbose: bool = True,
+    hooks: HookSpec = None,
+) -> Dict[str, object]:
+    """
+    Stream-join coordinate-sorted studies to a reference study and align alleles.
+
+    A merge join over inputs sorted by chromosome and position (as written
+    with ``--sort``/``sort_by_position``): the reference is read in chunks,
+    and each study is read only up to the last position of the current
+    reference chunk, so memory is bounded by a chunk per input whatever
+    the size of the studies. Within a chunk, variants are matched and
+    aligned as in ``align_frames``.
+
+    Args:
+        reference_file: Standardized, sorted reference (its variants define the rows)
+        study_files: Standardized, sorted studies {name: file}
+        output_file: Output path
+        output_format: 'tsv', 'csv', 'parquet' or 'arrow'/'feather'
+        compression: Output compression (see ``open_table_writer``)
+        how: 'left' or 'inner' (see ``align_frames``)
+        drop_ambiguous: Treat palindromic SNPs as not found
+        chunksize: Reference rows per chunk
+        verbose: Print a summary
+        hooks: Profiling or progress hooks notified around the join and its stages
+
+    Returns:
+        Summary dictionary with the output, reference rows, rows written and
+        per-study counts of each orientation
+    """
+    timer = StageTimer(hooks)
+    studies = {name: _SortedStream(filename, chunksize) for name, filename in study_files.items()}
+    counts = {name: {} for name in studies}
+    rows_in = rows_out = 0
+    with timer.conversion(
+        function="align_files",
+        inputs=[str(reference_file)] + [str(f) for f in study_files.values()],
+        output=str(output_file),
+    ) as outcome:
+        writer = open_table_writer(output_file, output_format=output_format, compression=compression)
+        with writer:
+            for reference in timer.iterate("read", _reference_chunks(reference_file, chunksize)):
+                bound_chr = str(reference["chr"].iloc[-1])
+                bound_pos = int(_positions(reference.iloc[-1:])[0])
+                with timer.stage("read"):
+                    parts = {
+                        name: stream.take_through(bound_chr, bound_pos)
+                        for name, stream in studies.items()
+                    }
+                with timer.stage("map", rows=len(reference)):
+                    aligned = align_frames(reference, parts, how=how, drop_ambiguous=drop_ambiguous)
+                for name in studies:
+                    codes, tally = np.unique(aligned[f"{name}_orientation"], return_counts=True)
+                    for code, n in zip(codes.tolist(), tally.tolist()):
+                        counts[name][code] = counts[name].get(code, 0) + n
+                with timer.stage("write", rows=len(aligned)):
+                    writer.write(aligned)
+                rows_in += len(reference)
+                rows_out += len(aligned)
+                timer.progress(input=str(reference_file), rows=rows_in)
+        outcome["rows"] = rows_out
+
+    labels = {
+        ALIGN_MISSING: "missing",
+        ALIGN_SAME: "same",
+        ALIGN_SWAPPED: "swapped",
+        ALIGN_STRAND: "strand",
+        ALIGN_STRAND_SWAPPED: "strand_swapped",
+    }
+    orientation_counts = {
+        name: {labels[code]: n for code, n in sorted(tally.items())} for name, tally in counts.items()
+    }
+    if verbose:
+        print(f"Aligned {len(studies)} studies to {rows_in:,} reference variants: {output_file}")
+        for name, tally in orientation_counts.items():
+            print(f"  {name}: " + ", ".join(f"{label} {n:,}" for label, n in tally.items()))
+    return {
+        "output": str(output_file),
+        "reference_rows": rows_in,
+        "rows": rows_out,
+        "orientation": orientation_counts,
+        "stages": timer.summary(),
+    }
@@ -0,0 +1,803 @@
+"""
+BGZF Module
+Blocked gzip (BGZF) output and random access through tabix-compatible .tbi/.csi indexes
+"""
+
+import io
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from .genomic_index import normalize_chromosome
+from .stage_timing import StageTimer, TimedSink
+
+# Uncompressed bytes per block, as used by htslib
+BGZF_BLOCK_SIZE = 0xFF00
+
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+_BGZF_HEADER = struct.Struct("<4BI2BH2BHH")
+_BGZF_FOOTER = struct.Struct("<II")
+
+TABIX_MIN_SHIFT = 14
+TABIX_DEPTH = 5
+
+
+def compress_block(data: bytes, level: int = 6) -> bytes:
+    """
+    Compress up to BGZF_BLOCK_SIZE bytes into one BGZF block.
+
+    Args:
+        data: Uncompressed bytes
+        level: zlib compression level (0-9)
+
+    Returns:
+        A complete gzip member carrying the BGZF 'BC' extra field
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    header = _BGZF_HEADER.pack(
+        0x1F, 0x8B, 8, 4, 0, 0, 0xFF, 6, ord("B"), ord("C"), 2, len(deflated) + 25
+    )
+    return header + deflated + _BGZF_FOOTER.pack(zlib.crc32(data) & 0xFFFFFFFF, len(data))
+
+
+class BgzfWriter:
+    """
+    Binary writer producing BGZF output.
+
+    Blocks are cut at fixed uncompressed boundaries (BGZF_BLOCK_SIZE), so any
+    uncompressed offset can be turned into a virtual offset after the fact
+    with ``virtual_offsets``. Blocks are independent, so they are compressed
+    on a thread pool (zlib releases the GIL) and written in order.
+
+    Every BGZF file is also a valid multi-member gzip file.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        level: int = 6,
+        threads: Optional[int] = None,
+        append: bool = False,
+    ):
+        self.filename = str(filename)
+        self.level = level
+        self.threads = threads or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self.threads) if self.threads > 1 else None
+        self._pending = deque()
+        self._handle = open(self.filename, "ab" if append else "wb")
+        self._buffer = bytearray()
+        self.block_offsets: List[int] = []
+        self.uncompressed_offset = 0
+        self._end_offset = None
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        """Write uncompressed bytes."""
+        self._buffer += data
+        self.uncompressed_offset += len(data)
+        if len(self._buffer) >= BGZF_BLOCK_SIZE:
+            n_full = len(self._buffer) // BGZF_BLOCK_SIZE * BGZF_BLOCK_SIZE
+            self._write_blocks(self._buffer[:n_full])
+            del self._buffer[:n_full]
+        return len(data)
+
+    def _write_blocks(self, data) -> None:
+        view = memoryview(data)
+        for start in range(0, len(data), BGZF_BLOCK_SIZE):
+            block = bytes(view[start:start + BGZF_BLOCK_SIZE])
+            if self._executor is None:
+                self._emit(compress_block(block, self.level))
+                continue
+            self._pending.append(self._executor.submit(compress_block, block, self.level))
+            if len(self._pending) >= 4 * self.threads:
+                self._emit(self._pending.popleft().result())
+
+    def _emit(self, block: bytes) -> None:
+        self.block_offsets.append(self._handle.tell())
+        self._handle.write(block)
+
+    def _drain(self) -> None:
+        while self._pending:
+            self._emit(self._pending.popleft().result())
+
+    def flush(self) -> None:
+        """
+        Write all buffered data (ending the current block early) to disk.
+
+        Blocks after a flush no longer start at fixed uncompressed offsets, so
+        ``virtual_offsets`` is invalid; not for indexed output.
+        """
+        if self._buffer:
+            self._write_blocks(self._buffer)
+            self._buffer = bytearray()
+        self._drain()
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def virtual_offsets(self, offsets: np.ndarray) -> np.ndarray:
+        """
+        Convert uncompressed offsets into BGZF virtual offsets.
+
+        Only valid for offsets that lie in blocks already written (always true
+        after ``close``).
+        """
+        offsets = np.asarray(offsets, dtype=np.uint64)
+        end = self._end_offset if self.closed else self._handle.tell()
+        block_starts = np.asarray(self.block_offsets + [end], dtype=np.uint64)
+        block = offsets // np.uint64(BGZF_BLOCK_SIZE)
+        within = offsets % np.uint64(BGZF_BLOCK_SIZE)
+        return (block_starts[block] << np.uint64(16)) | within
+
+    def close(self) -> None:
+        """Flush the last partial block and write the BGZF EOF marker."""
+        if self.closed:
+            return
+        if self._buffer:
+            self._write_blocks(self._buffer)
+            self._buffer = bytearray()
+        self._drain()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._end_offset = self._handle.tell()
+        self._handle.write(BGZF_EOF)
+        self._handle.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _leaf_bin_offset(depth: int) -> int:
+    return ((1 << (3 * depth)) - 1) // 7
+
+
+class TabixIndexBuilder:
+    """
+    Accumulates a tabix (.tbi) or CSI (.csi) index while sorted rows are written.
+
+    Rows are point records (one position each). Offsets are collected in
+    uncompressed space and converted to virtual offsets when saving.
+    """
+
+    def __init__(
+        self,
+        seq_col: int,
+        beg_col: int,
+        skip: int = 1,
+        index_format: str = "tbi",
+        min_shift: int = TABIX_MIN_SHIFT,
+    ):
+        if index_format not in ("tbi", "csi"):
+            raise ValueError(f"Unsupported index format: {index_format}")
+        self.seq_col = seq_col
+        self.beg_col = beg_col
+        self.skip = skip
+        self.index_format = index_format
+        self.min_shift = min_shift if index_format == "csi" else TABIX_MIN_SHIFT
+        self.names: List[str] = []
+        # per reference: list of [window, start offset, end offset]
+        self._runs: Dict[str, List[List[int]]] = {}
+        self._max_window = 0
+
+    def add(
+        self,
+        chroms: np.ndarray,
+        positions: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+    ) -> None:
+        """
+        Add a batch of coordinate-sorted rows.
+
+        Args:
+            chroms: Chromosome name per row
+            positions: 1-based position per row
+            starts: Uncompressed byte offset where each row starts
+            ends: Uncompressed byte offset just past each row
+        """
+        if len(chroms) == 0:
+            return
+        windows = np.maximum(np.asarray(positions, dtype=np.int64) - 1, 0) >> self.min_shift
+        self._max_window = max(self._max_window, int(windows.max()))
+
+        change = np.flatnonzero(chroms[1:] != chroms[:-1]) + 1
+        edges = np.concatenate(([0], change, [len(chroms)]))
+        for first, stop in zip(edges[:-1], edges[1:]):
+            name = str(chroms[first])
+            if name not in self._runs:
+                self.names.append(name)
+                self._runs[name] = []
+            elif name != self.names[-1]:
+                raise ValueError(f"Rows are not sorted: chromosome {name} appears twice")
+
+            ref_windows = windows[first:stop]
+            runs = self._runs[name]
+            if (np.diff(ref_windows) < 0).any() or (runs and ref_windows[0] < runs[-1][0]):
+                raise ValueError(f"Rows are not sorted by position on chromosome {name}")
+
+            run_edges = np.flatnonzero(np.diff(ref_windows)) + 1
+            run_starts = np.concatenate(([0], run_edges)) + first
+            run_stops = np.concatenate((run_edges, [stop - first])) + first - 1
+            for run_first, run_last in zip(run_starts, run_stops):
+                window = int(windows[run_first])
+                if runs and runs[-1][0] == window:
+                    runs[-1][2] = int(ends[run_last])
+                else:
+                    runs.append([window, int(starts[run_first]), int(ends[run_last])])
+
+    def _header_fields(self) -> bytes:
+        names = b"".join(name.encode("utf-8") + b"\0" for name in self.names)
+        # format 0 = generic, 1-based closed coordinates; point records end where they begin
+        fields = struct.pack(
+            "<6i", 0, self.seq_col + 1, self.beg_col + 1, self.beg_col + 1, ord("#"), self.skip
+        )
+        return fields + struct.pack("<i", len(names)) + names
+
+    def build(self, to_virtual: Callable[[np.ndarray], np.ndarray]) -> bytes:
+        """
+        Serialize the index (uncompressed).
+
+        Args:
+            to_virtual: Function converting uncompressed offsets to virtual offsets
+        """
+        if self.index_format == "tbi":
+            depth = TABIX_DEPTH
+            if self._max_window >= (1 << (3 * depth)):
+                raise ValueError("Positions beyond 2^29 need index_format='csi'")
+            parts = [b"TBI\x01", struct.pack("<i", len(self.names)), self._header_fields()]
+        else:
+            depth = 1
+            while (1 << (3 * depth)) <= self._max_window:
+                depth += 1
+            aux = self._header_fields()
+            parts = [
+                b"CSI\x01",
+                struct.pack("<iii", self.min_shift, depth, len(aux)),
+                aux,
+                struct.pack("<i", len(self.names)),
+            ]
+        leaf_offset = _leaf_bin_offset(depth)
+
+        for name in self.names:
+            runs = np.asarray(self._runs[name], dtype=np.uint64).reshape(-1, 3)
+            windows = runs[:, 0].astype(np.int64)
+            vstarts = to_virtual(runs[:, 1])
+            vends = to_virtual(runs[:, 2])
+
+            parts.append(struct.pack("<i", len(runs)))
+            for window, vstart, vend in zip(windows, vstarts, vends):
+                bin_id = leaf_offset + int(window)
+                if self.index_format == "tbi":
+                    parts.append(struct.pack("<IiQQ", bin_id, 1, int(vstart), int(vend)))
+                else:
+                    parts.append(struct.pack("<IQiQQ", bin_id, int(vstart), 1, int(vstart), int(vend)))
+
+            if self.index_format == "tbi":
+                # Linear index: smallest offset per 16 kb window; empty windows
+                # inherit the previous window's offset
+                n_intv = int(windows.max()) + 1 if len(windows) else 0
+                linear = np.zeros(n_intv, dtype=np.uint64)
+                filled = np.zeros(n_intv, dtype=bool)
+                linear[windows] = vstarts
+                filled[windows] = True
+                if n_intv:
+                    linear[: int(windows.min())] = vstarts[0]
+                    filled[: int(windows.min())] = True
+                    idx = np.where(filled, np.arange(n_intv), 0)
+                    np.maximum.accumulate(idx, out=idx)
+                    linear = linear[idx]
+                parts.append(struct.pack("<i", n_intv))
+                parts.append(linear.astype("<u8").tobytes())
+
+        return b"".join(parts)
+
+    def save(self, index_file: str, to_virtual: Callable[[np.ndarray], np.ndarray]) -> None:
+        """Write the BGZF-compressed index file."""
+        with BgzfWriter(index_file) as writer:
+            writer.write(self.build(to_virtual))
+
+
+class BgzfTableWriter:
+    """
+    Writes DataFrames as delimited text in BGZF format.
+
+    When ``index_format`` is given, rows must arrive coordinate-sorted and a
+    tabix-compatible ``.tbi``/``.csi`` index is built in the same pass.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        sep: str = "\t",
+        index_format: Optional[str] = None,
+        chr_col: str = "chr",
+        pos_col: str = "pos",
+        level: int = 6,
+        threads: Optional[int] = None,
+        header: bool = True,
+        append: bool = False,
+        timer: Optional[StageTimer] = None,
+    ):
+        if index_format and sep != "\t":
+            raise ValueError("Tabix indexes require tab-separated output")
+        if index_format and append:
+            raise ValueError("Indexed BGZF output cannot be appended to")
+        self.output_file = str(output_file)
+        self.sep = sep
+        self.index_format = index_format
+        self.chr_col = chr_col
+        self.pos_col = pos_col
+        self._writer = BgzfWriter(self.output_file, level=level, threads=threads, append=append)
+        if timer is not None:
+            self._writer = TimedSink(self._writer, timer)
+        self._index = None
+        self._header_written = not header or append
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append rows (with a header on the first call)."""
+        header = not self._header_written
+        data = df.to_csv(sep=self.sep, index=False, header=header, lineterminator="\n").encode("utf-8")
+
+        if self.index_format and len(df):
+            if self._index is None:
+                columns = df.columns.tolist()
+                if self.chr_col not in columns or self.pos_col not in columns:
+                    raise ValueError(f"Indexing requires columns: {self.chr_col}, {self.pos_col}")
+                self._index = TabixIndexBuilder(
+                    columns.index(self.chr_col),
+                    columns.index(self.pos_col),
+                    skip=1,
+                    index_format=self.index_format,
+                )
+            line_ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10) + 1
+            first_start = 0
+            if header:
+                first_start, line_ends = line_ends[0], line_ends[1:]
+            base = self._writer.uncompressed_offset
+            starts = np.concatenate(([first_start], line_ends[:-1])) + base
+            ends = line_ends + base
+            self._index.add(
+                df[self.chr_col].astype("string").to_numpy(dtype=object),
+                pd.to_numeric(df[self.pos_col], errors="coerce").fillna(0).to_numpy(dtype=np.int64),
+                starts,
+                ends,
+            )
+
+        self._writer.write(data)
+        self._header_written = True
+
+    def flush(self) -> None:
+        """Write everything appended so far to disk (unindexed output only)."""
+        if self.index_format:
+            raise ValueError("Indexed BGZF output cannot be flushed mid-stream")
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Finish the BGZF stream and write the index, if any."""
+        self._writer.close()
+        if self._index is not None:
+            self._index.save(f"{self.output_file}.{self.index_format}", self._writer.virtual_offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def is_bgzf(filename: str) -> bool:
+    """Check whether a file starts with a BGZF block (gzip member with a 'BC' extra field)."""
+    with open(filename, "rb") as handle:
+        header = handle.read(_BGZF_HEADER.size)
+    if len(header) < _BGZF_HEADER.size:
+        return False
+    fields = _BGZF_HEADER.unpack(header)
+    return (
+        fields[:3] == (0x1F, 0x8B, 8)
+        and bool(fields[3] & 4)
+        and fields[8:10] == (ord("B"), ord("C"))
+    )
+
+
+def _read_raw_block(handle: BinaryIO, filename: str) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Read the next BGZF block from the current position without inflating it.
+
+    Returns:
+        Tuple of (raw deflate data, 8-byte gzip footer), or None at end of file
+    """
+    header = handle.read(12)
+    if len(header) < 12:
+        return None
+    if header[:2] != b"\x1f\x8b" or not header[3] & 4:
+        raise ValueError(f"Not a BGZF file: {filename}")
+    xlen = struct.unpack("<H", header[10:12])[0]
+    extra = handle.read(xlen)
+    bsize = None
+    pos = 0
+    while pos + 4 <= xlen:
+        si1, si2, slen = extra[pos], extra[pos + 1], struct.unpack("<H", extra[pos + 2:pos + 4])[0]
+        if si1 == ord("B") and si2 == ord("C"):
+            bsize = struct.unpack("<H", extra[pos + 4:pos + 6])[0]
+        pos += 4 + slen
+    if bsize is None:
+        raise ValueError(f"Missing BGZF block size in {filename}")
+    cdata = handle.read(bsize - xlen - 19)
+    footer = handle.read(8)
+    if len(footer) < 8:
+        raise ValueError(f"Truncated BGZF block in {filename}")
+    return cdata, footer
+
+
+def _inflate_block(cdata: bytes, footer: bytes, check_crc: bool = True) -> bytes:
+    """Inflate one BGZF block, verifying its length (and CRC32) against the footer."""
+    data = zlib.decompress(cdata, -15)
+    crc, size = _BGZF_FOOTER.unpack(footer)
+    if len(data) != size or (check_crc and zlib.crc32(data) & 0xFFFFFFFF != crc):
+        raise ValueError("Corrupt BGZF block (size or CRC mismatch)")
+    return data
+
+
+class ParallelBgzfStream(io.RawIOBase):
+    """
+    Sequential BGZF reader that inflates blocks on a thread pool.
+
+    Compressed blocks are read in order on the calling thread (cheap I/O) and
+    inflated concurrently; zlib releases the GIL, so decompression scales with
+    the number of threads. Up to ``prefetch`` blocks are in flight and data is
+    returned in file order. Wrap in io.BufferedReader (see ``open_bgzf``) for
+    use with pandas or text I/O.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        threads: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        check_crc: bool = True,
+    ):
+        super().__init__()
+        self.filename = str(filename)
+        self.threads = threads or os.cpu_count() or 1
+        self.prefetch = prefetch or 4 * self.threads
+        self.check_crc = check_crc
+        self._handle = open(self.filename, "rb")
+        self._executor = ThreadPoolExecutor(max_workers=self.threads)
+        self._pending = deque()
+        self._current = memoryview(b"")
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _submit(self) -> None:
+        while not self._exhausted and len(self._pending) < self.prefetch:
+            block = _read_raw_block(self._handle, self.filename)
+            if block is None:
+                self._exhausted = True
+                break
+            self._pending.append(
+                self._executor.submit(_inflate_block, block[0], block[1], self.check_crc)
+            )
+
+    def readinto(self, buffer) -> int:
+        while not len(self._current):
+            self._submit()
+            if not self._pending:
+                return 0
+            self._current = memoryview(self._pending.popleft().result())
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+    def compressed_position(self) -> int:
+        """Compressed bytes read from the file so far (including prefetched blocks)."""
+        return self._handle.tell()
+
+    def close(self) -> None:
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+            self._executor.shutdown(wait=True)
+            self._handle.close()
+        super().close()
+
+
+def bgzf_block_offsets(filename: str) -> List[int]:
+    """
+    Compressed offsets of all BGZF blocks, found from the block headers alone.
+
+    Only block headers are read (each block is skipped using its BSIZE), so
+    this is cheap even for very large files.
+    """
+    offsets = []
+    with open(filename, "rb") as handle:
+        offset = 0
+        while True:
+            header = handle.read(12)
+            if len(header) < 12:
+                break
+            if header[:2] != b"\x1f\x8b" or not header[3] & 4:
+                raise ValueError(f"Not a BGZF file: {filename}")
+            xlen = struct.unpack("<H", header[10:12])[0]
+            extra = handle.read(xlen)
+            bsize = None
+            pos = 0
+            while pos + 4 <= xlen:
+                slen = struct.unpack("<H", extra[pos + 2:pos + 4])[0]
+                if extra[pos:pos + 2] == b"BC":
+                    bsize = struct.unpack("<H", extra[pos + 4:pos + 6])[0]
+                pos += 4 + slen
+            if bsize is None:
+                raise ValueError(f"Missing BGZF block size in {filename}")
+            offsets.append(offset)
+            offset += bsize + 1
+            handle.seek(offset)
+    return offsets
+
+
+def open_bgzf(
+    filename: str, threads: Optional[int] = None, buffer_size: int = 1 << 20
+) -> io.BufferedReader:
+    """
+    Open a BGZF file as a buffered binary stream decompressed on ``threads`` threads.
+
+    Args:
+        filename: Path to a BGZF file
+        threads: Worker threads (default: number of CPUs)
+        buffer_size: Read buffer size in bytes
+
+    Returns:
+        io.BufferedReader over the uncompressed data
+    """
+    return io.BufferedReader(ParallelBgzfStream(filename, threads=threads), buffer_size)
+
+
+class BgzfReader:
+    """Random-access reader for BGZF files addressed by virtual offsets."""
+
+    def __init__(self, filename: str):
+        self.filename = str(filename)
+        self._handle = open(self.filename, "rb")
+
+    def read_block(self, coffset: int) -> Tuple[bytes, int]:
+        """
+        Decompress the block starting at a compressed offset.
+
+        Returns:
+            Tuple of (uncompressed data, compressed offset of the next block)
+        """
+        self._handle.seek(coffset)
+        block = _read_raw_block(self._handle, self.filename)
+        if block is None:
+            return b"", coffset
+        return zlib.decompress(block[0], -15), self._handle.tell()
+
+    def read_range(self, vstart: int, vend: int) -> bytes:
+        """Return the uncompressed bytes between two virtual offsets."""
+        coffset, within = vstart >> 16, vstart & 0xFFFF
+        end_coffset, end_within = vend >> 16, vend & 0xFFFF
+        parts = []
+        while coffset <= end_coffset:
+            data, next_coffset = self.read_block(coffset)
+            if not data and next_coffset == coffset:
+                break
+            stop = end_within if coffset == end_coffset else len(data)
+            parts.append(data[within:stop])
+            within = 0
+            coffset = next_coffset
+        return b"".join(parts)
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def reg2bins(beg: int, end: int, min_shift: int, depth: int) -> List[int]:
+    """List the bins overlapping the 0-based half-open interval [beg, end)."""
+    end -= 1
+    bins = []
+    shift = min_shift + 3 * depth
+    offset = 0
+    for level in range(depth + 1):
+        bins.extend(range(offset + (beg >> shift), offset + (end >> shift) + 1))
+        shift -= 3
+        offset += 1 << (3 * level)
+    return bins
+
+
+class TabixIndex:
+    """A parsed .tbi or .csi index."""
+
+    def __init__(self):
+        self.format = 0
+        self.col_seq = 1
+        self.col_beg = 2
+        self.col_end = 0
+        self.meta = "#"
+        self.skip = 0
+        self.names: List[str] = []
+        self.min_shift = TABIX_MIN_SHIFT
+        self.depth = TABIX_DEPTH
+        self.bins: List[Dict[int, List[Tuple[int, int]]]] = []
+        self.linear: List[Optional[List[int]]] = []
+        self.loffsets: List[Dict[int, int]] = []
+
+    @classmethod
+    def load(cls, index_file: str) -> "TabixIndex":
+        """Load a BGZF-compressed .tbi or .csi index."""
+        import gzip
+
+        with gzip.open(index_file, "rb") as f:
+            data = f.read()
+
+        index = cls()
+        magic = data[:4]
+        pos = 4
+        if magic == b"TBI\x01":
+            n_ref = struct.unpack_from("<i", data, pos)[0]
+            pos = index._parse_header_fields(data, pos + 4)
+            is_csi = False
+        elif magic == b"CSI\x01":
+            index.min_shift, index.depth, l_aux = struct.unpack_from("<iii", data, pos)
+            pos += 12
+            if l_aux >= 28:
+                index._parse_header_fields(data, pos)
+            pos += l_aux
+            n_ref = struct.unpack_from("<i", data, pos)[0]
+            pos += 4
+            is_csi = True
+        else:
+            raise ValueError(f"Unrecognized index format: {index_file}")
+
+        for _ in range(n_ref):
+            bins, loffsets = {}, {}
+            n_bin = struct.unpack_from("<i", data, pos)[0]
+            pos += 4
+            for _ in range(n_bin):
+                if is_csi:
+                    bin_id, loffset, n_chunk = struct.unpack_from("<IQi", data, pos)
+                    pos += 16
+                    loffsets[bin_id] = loffset
+                else:
+                    bin_id, n_chunk = struct.unpack_from("<Ii", data, pos)
+                    pos += 8
+                chunks = struct.unpack_from(f"<{2 * n_chunk}Q", data, pos)
+                pos += 16 * n_chunk
+                bins[bin_id] = list(zip(chunks[::2], chunks[1::2]))
+            index.bins.append(bins)
+            index.loffsets.append(loffsets)
+            if is_csi:
+                index.linear.append(None)
+            else:
+                n_intv = struct.unpack_from("<i", data, pos)[0]
+                pos += 4
+                index.linear.append(list(struct.unpack_from(f"<{n_intv}Q", data, pos)))
+                pos += 8 * n_intv
+        return index
+
+    def _parse_header_fields(self, data: bytes, pos: int) -> int:
+        fmt, self.col_seq, self.col_beg, self.col_end, meta, self.skip, l_nm = (
+            struct.unpack_from("<7i", data, pos)
+        )
+        self.format = fmt & 0xFFFF
+        self.meta = chr(meta) if meta > 0 else ""
+        pos += 28
+        names = data[pos:pos + l_nm].split(b"\0")
+        self.names = [name.decode("utf-8") for name in names if name]
+        return pos + l_nm
+
+    def reference_id(self, chrom: str) -> Optional[int]:
+        """Find a reference by name, ignoring a 'chr' prefix mismatch."""
+        if chrom in self.names:
+            return self.names.index(chrom)
+        target = normalize_chromosome(chrom)
+        for i, name in enumerate(self.names):
+            if normalize_chromosome(name) == target:
+                return i
+        return None
+
+    def chunks(self, chrom: str, start: int, end: Optional[int]) -> List[Tuple[int, int]]:
+        """
+        Virtual offset ranges that may hold records in a 1-based inclusive region.
+        """
+        ref = self.reference_id(chrom)
+        if ref is None:
+            return []
+        beg = max(start - 1, 0)
+        limit = 1 << (self.min_shift + 3 * self.depth)
+        stop = min(end, limit) if end is not None else limit
+        min_offset = self._min_offset(ref, beg)
+        bins = self.bins[ref]
+        found = [
+            chunk
+            for bin_id in reg2bins(beg, stop, self.min_shift, self.depth)
+            for chunk in bins.get(bin_id, [])
+            if chunk[1] > min_offset
+        ]
+        return merge_chunks(found)
+
+    def _min_offset(self, ref: int, beg: int) -> int:
+        linear = self.linear[ref]
+        if linear is not None:
+            window = beg >> TABIX_MIN_SHIFT
+            if not linear:
+                return 0
+            return linear[min(window, len(linear) - 1)]
+        # CSI: offset of the finest existing bin containing beg
+        loffsets = self.loffsets[ref]
+        bin_id = _leaf_bin_offset(self.depth) + (beg >> self.min_shift)
+        while bin_id > 0 and bin_id not in loffsets:
+            bin_id = (bin_id - 1) >> 3
+        return loffsets.get(bin_id, 0)
+
+
+def merge_chunks(chunks: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort virtual offset ranges and merge overlapping or adjacent ones."""
+    merged = []
+    for start, end in sorted(chunks):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def find_tabix_index(filename: str) -> Optional[str]:
+    """Return the path of a .tbi or .csi index next to a file, if any."""
+    for suffix in (".tbi", ".csi"):
+        candidate = Path(f"{filename}{suffix}")
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
+def read_tabix_regions(
+    filename: str,
+    regions: List[Tuple[str, int, Optional[int]]],
+    index_file: Optional[str] = None,
+) -> Tuple[TabixIndex, bytes]:
+    """
+    Read the records overlapping a set of regions from an indexed BGZF file.
+
+    Only the BGZF blocks referenced by the index are decompressed. Records
+    in the returned bytes may extend slightly beyond the regions (index bins
+    are coarse); callers filter by position afterwards.
+
+    Args:
+        filename: BGZF-compressed, coordinate-sorted file
+        regions: List of (chromosome, 1-based start, inclusive end or None)
+        index_file: Index path (default: ``<filename>.tbi`` or ``.csi``)
+
+    Returns:
+        Tuple of (parsed index, concatenated record lines)
+    """
+    index_file = index_file or find_tabix_index(filename)
+    if index_file is None:
+        raise FileNotFoundError(f"No .tbi/.csi index found for {filename}")
+    index = TabixIndex.load(index_file)
+
+    chunks = merge_chunks(
+        [chunk for chrom, start, end in regions for chunk in index.chunks(chrom, start, end)]
+    )
+    with BgzfReader(filename) as reader:
+        data = b"".join(reader.read_range(start, end) for start, end in chunks)
+    return index, data
@@ -0,0 +1,227 @@
+"""
+Conversion Cache Module
+Content-addressed cache of standardized outputs, keyed by input contents and options
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .manifest import options_hash
+
+# Bump when the conversion output for the same input and options changes
+CACHE_VERSION = 1
+
+# Files written next to an output that belong to it
+SIDECAR_SUFFIXES = (".tbi", ".csi", ".idx.json")
+
+_OUTPUT_NAME = "output"
+_FRAME_NAME = "frame.arrow"
+_META_NAME = "meta.json"
+
+
+def cache_key(content_hash: str, options: Dict[str, object]) -> str:
+    """
+    Key of a conversion: the input contents plus everything that shapes the output.
+
+    Args:
+        content_hash: ``file_hash``/``data_hash`` of the input
+        options: Column mapping and conversion/output options
+    """
+    return options_hash({"input": content_hash, "options": options, "version": CACHE_VERSION})
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink ``src`` to ``dst``, copying when linking is not possible."""
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _place(src: Path, dst: Path) -> None:
+    """Link or copy a file, or a directory tree file by file."""
+    if src.is_dir():
+        if dst.exists():
+            shutil.rmtree(dst)
+        shutil.copytree(src, dst, copy_function=_link_or_copy)
+    else:
+        _link_or_copy(str(src), str(dst))
+
+
+def _file_sizes(path: Path) -> Dict[str, int]:
+    """Sizes of a file, or of every file under a directory (relative paths)."""
+    if path.is_dir():
+        return {
+            str(child.relative_to(path)): child.stat().st_size
+            for child in sorted(path.rglob("*"))
+            if child.is_file()
+        }
+    return {"": path.stat().st_size}
+
+
+def unlink_shared(output: str) -> None:
+    """
+    Remove an output (and its sidecars) that shares its data with a cache entry.
+
+    Writers truncate existing files in place, which would also overwrite the
+    hardlinked cache copy; call this before writing to a path that may hold
+    a restored output.
+    """
+    for path in [output] + [f"{output}{suffix}" for suffix in SIDECAR_SUFFIXES]:
+        if os.path.isfile(path) and os.stat(path).st_nlink > 1:
+            os.unlink(path)
+
+
+class ConversionCache:
+    """
+    Content-addressed store of conversion results.
+
+    Entries live under ``<cache_dir>/<key[:2]>/<key>/`` and hold either a
+    standardized DataFrame (as an Arrow IPC file, for ``convert_single_file``)
+    or an output file or dataset directory with its index sidecars (for the
+    CLI). Files are hardlinked in and out of the cache where the file system
+    allows, so a hit costs no copy and no extra space. Outputs restored from
+    the cache share their data with it: replace them rather than editing
+    them in place. Entries are checked against their recorded file sizes on
+    lookup, and damaged ones are dropped.
+
+    Several processes may share a cache: entries are built in a temporary
+    directory and renamed into place.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.root = Path(cache_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def lookup(self, key: str) -> Optional[Dict[str, object]]:
+        """
+        Metadata of a valid entry, or None.
+
+        Args:
+            key: ``cache_key`` of the conversion
+
+        Returns:
+            Dictionary with 'files' (name -> sizes) and 'info' (stored with the entry)
+        """
+        entry = self._entry(key)
+        try:
+            with open(entry / _META_NAME, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            for name, sizes in meta["files"].items():
+                if _file_sizes(entry / name) != sizes:
+                    raise ValueError(f"{name} changed")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            warnings.warn(f"Dropping damaged cache entry {key}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        return meta
+
+    def _commit(self, key: str, build_dir: Path, info: Optional[Dict[str, object]]) -> None:
+        meta = {
+            "files": {
+                child.name: _file_sizes(child)
+                for child in build_dir.iterdir()
+            },
+            "info": info or {},
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(build_dir / _META_NAME, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle, default=str)
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(build_dir, entry)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def _build_dir(self) -> Path:
+        return Path(tempfile.mkdtemp(prefix=".build-", dir=self.root))
+
+    def store_output(
+        self,
+        key: str,
+        output: str,
+        info: Optional[Dict[str, object]] = None,
+        since: Optional[float] = None,
+    ) -> None:
+        """
+        Add an output file or directory, with its index sidecars, to the cache.
+
+        Args:
+            key: ``cache_key`` of the conversion
+            output: Output file or dataset directory
+            info: JSON-serialisable details to keep with the entry
+            since: Only include sidecars modified at or after this time
+                (so stale indexes from earlier runs are not picked up)
+        """
+        build_dir = self._build_dir()
+        try:
+            _place(Path(output), build_dir / _OUTPUT_NAME)
+            for suffix in SIDECAR_SUFFIXES:
+                sidecar = Path(f"{output}{suffix}")
+                if sidecar.is_file() and (since is None or sidecar.stat().st_mtime >= since):
+                    _link_or_copy(str(sidecar), str(build_dir / f"{_OUTPUT_NAME}{suffix}"))
+        except OSError:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+        self._commit(key, build_dir, info)
+
+    def restore_output(self, key: str, output: str) -> List[str]:
+        """
+        Link (or copy) a cached output and its sidecars to ``output``.
+
+        Returns:
+            Paths written
+        """
+        entry = self._entry(key)
+        written = []
+        for name in sorted(self.lookup(key)["files"]):
+            destination = f"{output}{name[len(_OUTPUT_NAME):]}"
+            _place(entry / name, Path(destination))
+            written.append(destination)
+        return written
+
+    def store_frame(
+        self, key: str, df: pd.DataFrame, info: Optional[Dict[str, object]] = None
+    ) -> bool:
+        """
+        Add a standardized DataFrame to the cache.
+
+        Returns:
+            False if the DataFrame cannot be stored as Arrow (e.g. mixed-type
+            object columns); the conversion is then simply not cached
+        """
+        build_dir = self._build_dir()
+        try:
+            df.reset_index(drop=True).to_feather(build_dir / _FRAME_NAME)
+        except Exception as e:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            warnings.warn(f"Result not cached: {e}")
+            return False
+        self._commit(key, build_dir, info)
+        return True
+
+    def load_frame(self, key: str) -> Optional[pd.DataFrame]:
+        """Cached DataFrame (with its stored attrs), or None."""
+        meta = self.lookup(key)
+        if meta is None or _FRAME_NAME not in meta["files"]:
+            return None
+        df = pd.read_feather(self._entry(key) / _FRAME_NAME)
+        df.attrs.update(meta["info"].get("attrs", {}))
+        return df
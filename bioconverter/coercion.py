@@ -0,0 +1,282 @@
+"""
+Typed Coercion Module
+Converts mapped standard columns to their expected dtypes after column mapping
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+
+
+# Expected dtype kind for each standard field. "pval" is a float column that
+# additionally keeps a -log10 representation for values that underflow float64.
+STANDARD_DTYPES: Dict[str, str] = {
+    # Genomics
+    "chr": "string",
+    "pos": "int",
+    "a1": "string",
+    "a2": "string",
+    "ref": "string",
+    "alt": "string",
+    "rsid": "string",
+    "pval": "pval",
+    "beta": "float",
+    "se": "float",
+    "or": "float",
+    "z": "float",
+    "frq": "float",
+    "info": "float",
+    "n": "int",
+    "t_stat": "float",
+    "chisq": "float",
+    "f_stat": "float",
+    "variant_key": "int",
+    # Transcriptomics
+    "expression": "float",
+    "fpkm": "float",
+    "tpm": "float",
+    "counts": "float",
+    "log2fc": "float",
+    "padj": "float",
+    # Proteomics
+    "abundance": "float",
+    "intensity": "float",
+    "ratio": "float",
+    # Metabolomics
+    "mz": "float",
+    "rt": "float",
+    "concentration": "float",
+    "peak_area": "float",
+}
+
+# Tokens treated as missing values rather than coercion failures
+MISSING_TOKENS = ["", "NA", "N/A", "na", "NaN", "nan", "NAN", ".", "-", "NULL", "null", "None"]
+
+NEGLOG10_PVAL_COLUMN = "neglog10_pval"
+
+_EXPONENT_PATTERN = r"^([0-9]*\.?[0-9]+)[eE]([-+]?[0-9]+)$"
+
+
+def _empty_stats(kind: str) -> Dict[str, Any]:
+    return {"kind": kind, "dtype": None, "missing": 0, "coerced": 0, "underflow": 0}
+
+
+def _clean_text(series: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Strip a text column and flag missing tokens."""
+    text = series.astype("string").str.strip()
+    missing = (text.isna() | text.isin(MISSING_TOKENS)).to_numpy(dtype=bool)
+    return text.mask(missing), missing
+
+
+def _to_float(text: pd.Series) -> np.ndarray:
+    """Parse a cleaned text column to float64 in a single vectorized pass."""
+    parsed = pd.to_numeric(text, errors="coerce")
+    return np.asarray(parsed.to_numpy(dtype="float64", na_value=np.nan), dtype="float64")
+
+
+def _downcast_float(values: np.ndarray, downcast: bool) -> np.ndarray:
+    if downcast:
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            return narrowed
+    return values
+
+
+def _to_integer(values: np.ndarray, downcast: bool):
+    """Convert float values to the narrowest lossless integer dtype, if any."""
+    finite = values[~np.isnan(values)]
+    if len(finite) and not np.array_equal(finite, np.trunc(finite)):
+        return _downcast_float(values, downcast)
+
+    has_missing = len(finite) != len(values)
+    int32 = np.iinfo(np.int32)
+    fits_int32 = not len(finite) or (finite.min() >= int32.min and finite.max() <= int32.max)
+    if has_missing:
+        return pd.array(values, dtype="Int32" if (downcast and fits_int32) else "Int64")
+    return values.astype(np.int32 if (downcast and fits_int32) else np.int64)
+
+
+def _parse_pvalues(
+    series: pd.Series, stats: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse p-values, keeping -log10(p) for values that underflow float64.
+
+    Handles numeric columns directly and text columns with tokens such as
+    ``1e-400`` (parsed to 0.0 by float()) or ``<1e-300`` (upper bounds).
+
+    Returns:
+        Tuple of (p-values as float64, -log10 p-values as float64)
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        stats["missing"] += int(np.isnan(values).sum())
+        stats["underflow"] += int((values == 0).sum())
+        with np.errstate(divide="ignore"):
+            return values, -np.log10(values)
+
+    text, missing = _clean_text(series)
+    text = text.str.lstrip("<=").str.strip()
+    values = _to_float(text)
+
+    with np.errstate(divide="ignore"):
+        neglog10 = -np.log10(values)
+
+    # Values written as mantissa/exponent that parsed to zero have underflowed;
+    # recover their magnitude from the exponent instead of reporting p = 0.
+    zero = values == 0
+    if zero.any():
+        parts = text[zero].str.extract(_EXPONENT_PATTERN)
+        mantissa = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype="float64")
+        exponent = pd.to_numeric(parts[1], errors="coerce").to_numpy(dtype="float64")
+        with np.errstate(divide="ignore"):
+            recovered = -(np.log10(mantissa) + exponent)
+        ok = np.isfinite(recovered)
+        idx = np.flatnonzero(zero)
+        neglog10[idx[ok]] = recovered[ok]
+        stats["underflow"] += int(ok.sum())
+
+    stats["missing"] += int(missing.sum())
+    stats["coerced"] += int((np.isnan(values) & ~missing).sum())
+    return values, neglog10
+
+
+def text_read_dtypes(
+    column_mapping: Dict[str, str], dtypes: Optional[Dict[str, str]] = None
+) -> Dict[str, type]:
+    """
+    Build a ``dtype`` argument for pd.read_csv that keeps p-value columns as text.
+
+    Parsing p-values as floats at read time turns tokens such as ``1e-400``
+    into 0.0 before coercion can recover their -log10 magnitude.
+
+    Args:
+        column_mapping: Dictionary mapping original to standard column names
+        dtypes: Optional overrides of STANDARD_DTYPES {column: kind}
+
+    Returns:
+        Dictionary {original column: str} for columns mapped to p-values
+    """
+    kinds = dict(STANDARD_DTYPES)
+    if dtypes:
+        kinds.update(dtypes)
+    return {
+        orig: str for orig, std in column_mapping.items() if kinds.get(std) == "pval"
+    }
+
+
+def coerce_column(
+    series: pd.Series, kind: str, downcast: bool = False
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Coerce a single column to the given dtype kind.
+
+    Args:
+        series: Column to coerce
+        kind: One of "string", "int", "float" or "pval"
+        downcast: Downcast to float32/int32 where lossless. Whether this
+            applies depends on the values, so never use it on chunks of a
+            stream, whose dtypes must not change from chunk to chunk
+
+    Returns:
+        Tuple of (coerced values, statistics dictionary)
+    """
+    stats = _empty_stats(kind)
+
+    if kind == "string":
+        if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+            result = series
+        else:
+            result = series.astype("string")
+        stats["missing"] = int(result.isna().sum())
+    elif kind == "pval":
+        result, _ = _parse_pvalues(series, stats)
+    elif kind in ("int", "float"):
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+            stats["missing"] = int(np.isnan(values).sum())
+        else:
+            text, missing = _clean_text(series)
+            values = _to_float(text)
+            stats["missing"] = int(missing.sum())
+            stats["coerced"] = int((np.isnan(values) & ~missing).sum())
+        if kind == "int":
+            result = _to_integer(values, downcast)
+        else:
+            result = _downcast_float(values, downcast)
+    else:
+        raise ValueError(f"Unsupported dtype kind: {kind}")
+
+    stats["dtype"] = str(getattr(result, "dtype", type(result).__name__))
+    return result, stats
+
+
+def coerce_standard_columns(
+    df: pd.DataFrame,
+    dtypes: Optional[Dict[str, str]] = None,
+    downcast: bool = False,
+    keep_neglog10: Optional[bool] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """
+    Coerce standard columns to their expected dtypes, one vectorized pass per column.
+
+    Args:
+        df: DataFrame with standardized column names
+        dtypes: Optional overrides of STANDARD_DTYPES {column: kind}
+        downcast: Downcast to float32/int32 where lossless (off by default:
+            the result depends on the values, see ``coerce_column``)
+        keep_neglog10: Add a ``neglog10_pval`` column. None adds it only when
+            some p-values underflow; pass True for a stable schema across chunks.
+
+    Returns:
+        Tuple of (coerced DataFrame, per-column statistics)
+    """
+    kinds = dict(STANDARD_DTYPES)
+    if dtypes:
+        kinds.update(dtypes)
+
+    result_df = df.copy(deep=False)
+    all_stats = {}
+
+    for col in df.columns:
+        kind = kinds.get(col)
+        if kind is None:
+            continue
+
+        if kind == "pval":
+            stats = _empty_stats(kind)
+            values, neglog10 = _parse_pvalues(df[col], stats)
+            result_df[col] = values
+            stats["dtype"] = str(values.dtype)
+            if keep_neglog10 or (keep_neglog10 is None and stats["underflow"]):
+                result_df[NEGLOG10_PVAL_COLUMN] = neglog10
+        else:
+            result_df[col], stats = coerce_column(df[col], kind, downcast=downcast)
+
+        all_stats[col] = stats
+
+    return result_df, all_stats
+
+
+def merge_coercion_stats(
+    total: Dict[str, Dict[str, Any]], stats: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Accumulate per-chunk coercion statistics into a running total.
+
+    Args:
+        total: Running totals (modified in place)
+        stats: Statistics from one chunk
+
+    Returns:
+        The updated running totals
+    """
+    for col, col_stats in stats.items():
+        if col not in total:
+            total[col] = dict(col_stats)
+            continue
+        for key in ("missing", "coerced", "underflow"):
+            total[col][key] += col_stats[key]
+        if total[col]["dtype"] != col_stats["dtype"]:
+            total[col]["dtype"] = "mixed"
+    return total
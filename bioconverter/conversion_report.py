@@ -28,6 +28,10 @@ class ConversionReport:
         self.file_size_mb = 0
         self.processing_method = "in-memory"
         self.chunk_size = None
+        self.coercion_stats = {}
+        self.derivation_stats = {}
+        self.stage_timings = {}
+        self.elapsed_s = None
         
     def set_input_info(self, filename: str, columns: List[str], rows: int, 
                        file_size_mb: float, omics_type: str = "unknown"):
@@ -54,6 +58,44 @@ class ConversionReport:
         self.chunk_size = chunk_size
         self.conversion_time = datetime.now()
         
+    def set_coercion_info(self, stats: Dict[str, Dict[str, Any]]):
+        """Set per-column type coercion statistics."""
+        self.coercion_stats = stats or {}
+        
+    def set_derivation_info(self, filled: Dict[str, int]):
+        """Set counts of values filled by the derived-statistics stage."""
+        self.derivation_stats = filled or {}
+        
+    def set_stage_timings(self, stages: Dict[str, Dict[str, Any]], elapsed_s: float = None):
+        """Set per-stage timings (``StageTimer.summary()``) and the total elapsed time."""
+        self.stage_timings = stages or {}
+        self.elapsed_s = elapsed_s
+        
+    def _stage_timing_lines(self) -> List[str]:
+        """Table of stage timings for the text report."""
+        def fmt(value, spec, width):
+            return format(value, spec).rjust(width) if value is not None else "-".rjust(width)
+        
+        total = sum(stats["wall_s"] for stats in self.stage_timings.values()) or None
+        lines = [
+            f"  {'Stage':10s} {'Wall (s)':>10s} {'CPU (s)':>10s} {'CPU/Wall':>9s} "
+            f"{'Share':>6s} {'Rows':>13s} {'Rows/s':>12s} {'MB in':>9s} "
+            f"{'MB out':>9s} {'MB/s':>8s} {'Peak RSS':>9s}",
+        ]
+        for stage, stats in self.stage_timings.items():
+            wall = stats["wall_s"]
+            lines.append(
+                f"  {stage:10s} {wall:10.3f} {stats['cpu_s']:10.3f} "
+                f"{fmt(stats['cpu_s'] / wall if wall > 0 else None, '.2f', 9)} "
+                f"{fmt(100 * wall / total if total else None, '.1f', 5)}% "
+                f"{stats['rows']:13,} {fmt(stats['rows_per_s'], ',', 12)} "
+                f"{stats['bytes_in'] / 1e6:9.1f} {stats['bytes_out'] / 1e6:9.1f} "
+                f"{fmt(stats['mb_per_s'], '.1f', 8)} {fmt(stats['peak_rss_mb'], '.1f', 7)}MB"
+            )
+        if self.elapsed_s is not None:
+            lines.append(f"  Elapsed: {self.elapsed_s:.3f} s")
+        return lines
+        
     def generate_text_report(self) -> str:
         """
         Generate a human-readable text report.
@@ -105,6 +147,36 @@ class ConversionReport:
                 report_lines.append(f"  - {col}")
             report_lines.append("")
         
+        if self.coercion_stats:
+            report_lines.extend([
+                "TYPE COERCION",
+                "-"*80,
+            ])
+            for col, stats in self.coercion_stats.items():
+                report_lines.append(
+                    f"  {col:20s} {str(stats['dtype']):10s} "
+                    f"missing={stats['missing']:,} coerced={stats['coerced']:,} "
+                    f"underflow={stats['underflow']:,}"
+                )
+            report_lines.append("")
+        
+        if self.derivation_stats:
+            report_lines.extend([
+                "DERIVED STATISTICS",
+                "-"*80,
+            ])
+            for field, count in self.derivation_stats.items():
+                report_lines.append(f"  {field:20s} {count:,} values derived")
+            report_lines.append("")
+        
+        if self.stage_timings:
+            report_lines.extend([
+                "STAGE TIMINGS",
+                "-"*80,
+            ])
+            report_lines.extend(self._stage_timing_lines())
+            report_lines.append("")
+        
         report_lines.extend([
             "OUTPUT INFORMATION",
             "-"*80,
@@ -153,7 +225,8 @@ class ConversionReport:
             },
             "processing": {
                 "method": self.processing_method,
-                "chunk_size": self.chunk_size
+                "chunk_size": self.chunk_size,
+                "elapsed_s": self.elapsed_s
             },
             "mapping": {
                 "mapped_columns": self.column_mapping,
@@ -161,6 +234,9 @@ class ConversionReport:
                 "mapping_count": len(self.column_mapping),
                 "unmapped_count": len(self.unmapped_columns)
             },
+            "coercion": self.coercion_stats,
+            "derivation": self.derivation_stats,
+            "stages": self.stage_timings,
             "output": {
                 "file": self.output_file,
                 "columns": self.final_columns,
@@ -239,4 +315,130 @@ class ConversionReport:
         print(f"Rows: {self.rows_processed:,}")
         print(f"Columns: {len(self.original_columns)} -> {len(self.final_columns)}")
         print(f"Mapped: {len(self.column_mapping)}, Unmapped: {len(self.unmapped_columns)}")
+        if self.stage_timings:
+            slowest = max(self.stage_timings, key=lambda stage: self.stage_timings[stage]["wall_s"])
+            elapsed = f"{self.elapsed_s:.2f}s" if self.elapsed_s is not None else "n/a"
+            print(
+                f"Time: {elapsed} (slowest stage: {slowest}, "
+                f"{self.stage_timings[slowest]['wall_s']:.2f}s)"
+            )
+        print("="*80)
+
+
+class BatchReport:
+    """
+    Summary of a batch conversion: the status, rows, output and time of each file.
+    """
+
+    def __init__(self):
+        self.files = []
+        self.started = datetime.now()
+        self.elapsed_s = None
+        self.workers = None
+
+    def add_file(self, input_file: str, output_file: Optional[str], status: str,
+                 rows: Optional[int] = None, elapsed_s: Optional[float] = None,
+                 output_size_mb: Optional[float] = None, error: Optional[str] = None):
+        """Record the outcome of one file ('ok' or 'failed')."""
+        self.files.append({
+            "input": input_file,
+            "output": output_file,
+            "status": status,
+            "rows": rows,
+            "elapsed_s": elapsed_s,
+            "output_size_mb": output_size_mb,
+            "error": error,
+        })
+
+    def set_processing_info(self, elapsed_s: float, workers: int):
+        """Set the batch's total elapsed time and number of concurrent conversions."""
+        self.elapsed_s = elapsed_s
+        self.workers = workers
+
+    @property
+    def failed(self) -> List[Dict[str, Any]]:
+        """Files that could not be converted."""
+        return [record for record in self.files if record["status"] != "ok"]
+
+    @property
+    def total_rows(self) -> int:
+        """Rows converted over all files."""
+        return sum(record["rows"] or 0 for record in self.files if record["status"] == "ok")
+
+    def generate_text_report(self) -> str:
+        """
+        Generate a human-readable batch report.
+
+        Returns:
+            Formatted report string
+        """
+        lines = []
+        lines.append("=" * 80)
+        lines.append("BATCH CONVERSION REPORT")
+        lines.append("=" * 80)
+        lines.append(f"Started: {self.started.strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"Files: {len(self.files)} ({len(self.failed)} failed)")
+        lines.append(f"Rows: {self.total_rows:,}")
+        if self.elapsed_s is not None:
+            lines.append(f"Elapsed: {self.elapsed_s:.2f}s ({self.workers} at a time)")
+        lines.append("")
+        lines.append(f"{'Status':8s} {'Rows':>12s} {'Time':>9s}  Input -> Output")
+        lines.append("-" * 80)
+        for record in self.files:
+            rows = f"{record['rows']:,}" if record["rows"] is not None else "-"
+            elapsed = f"{record['elapsed_s']:.2f}s" if record["elapsed_s"] is not None else "-"
+            target = record["output"] if record["status"] == "ok" else record["error"]
+            lines.append(f"{record['status']:8s} {rows:>12s} {elapsed:>9s}  {record['input']} -> {target}")
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+    def generate_json_report(self) -> str:
+        """
+        Generate a machine-readable JSON batch report.
+
+        Returns:
+            JSON string with the batch totals and every file's outcome
+        """
+        return json.dumps({
+            "started": self.started.isoformat(),
+            "elapsed_s": self.elapsed_s,
+            "workers": self.workers,
+            "file_count": len(self.files),
+            "failed_count": len(self.failed),
+            "rows": self.total_rows,
+            "files": self.files,
+        }, indent=2)
+
+    def save_report(self, output_dir: str, base_name: str = "batch_report"):
+        """
+        Save the batch report as text and JSON.
+
+        Args:
+            output_dir: Directory to save reports
+            base_name: Base name for report files
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        text_file = output_path / f"{base_name}.txt"
+        with open(text_file, 'w') as f:
+            f.write(self.generate_text_report())
+        print(f"Text report saved: {text_file}")
+
+        json_file = output_path / f"{base_name}.json"
+        with open(json_file, 'w') as f:
+            f.write(self.generate_json_report())
+        print(f"JSON report saved: {json_file}")
+
+    def print_summary(self):
+        """Print a brief summary of the batch."""
+        print("\n" + "="*80)
+        print("BATCH SUMMARY")
+        print("="*80)
+        print(f"Files: {len(self.files) - len(self.failed)} converted, {len(self.failed)} failed")
+        print(f"Rows: {self.total_rows:,}")
+        if self.elapsed_s is not None:
+            print(f"Time: {self.elapsed_s:.2f}s ({self.workers} at a time)")
+        for record in self.failed:
+            print(f"Failed: {record['input']}: {record['error']}")
         print("="*80)
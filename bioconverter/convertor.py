@@ -2,23 +2,67 @@ import pandas as pd
 import re
 from typing import Dict, List, Optional, Union, Tuple
 from pathlib import Path
-import gzip
-
-
-def read_vcf_file(fn: str, compression: Optional[str] = None) -> pd.DataFrame:
+import io
+import warnings
+
+from .coercion import coerce_standard_columns, text_read_dtypes
+from .derivation import derive_statistics
+from .genomic_index import (
+    index_path_for,
+    parse_region,
+    query_regions,
+    read_bed_regions,
+    region_mask,
+    sort_by_coordinates,
+    write_indexed_table,
+)
+from .bgzf import find_tabix_index, read_tabix_regions
+from .decompression import STREAM_COMPRESSIONS, open_input
+from .mapped_input import MappedInput
+from .writers import (
+    ARROW_COMPRESSIONS,
+    ARROW_FORMATS,
+    COMPRESSION_EXTENSIONS,
+    open_table_writer,
+    parquet_codec,
+)
+from .dataset import DEFAULT_ROW_GROUP_SIZE, write_parquet_dataset
+from .cache import ConversionCache, cache_key
+from .manifest import ConversionManifest, data_hash, file_hash
+from .profiling import HookSpec
+from .stage_timing import StageTimer
+from .variants import add_variant_key
+
+
+def read_vcf_file(
+    fn: str,
+    compression: Optional[str] = None,
+    threads: Optional[int] = None,
+    decompressor: Optional[str] = None,
+) -> pd.DataFrame:
     """
     专门读取VCF文件，处理##注释和#CHROM列名
 
     Args:
         fn: 文件路径
         compression: 压缩格式
+        threads: BGZF并行解压线程数（默认CPU数，1为单线程）
+        decompressor: 普通gzip使用的外部解压程序 ('igzip', 'pigz', 'auto')
 
     Returns:
         DataFrame
     """
     # 确定打开方式
-    if compression == "gzip" or fn.endswith(".gz"):
-        opener = gzip.open
+    if compression in STREAM_COMPRESSIONS or fn.endswith(".gz"):
+
+        def opener(path, mode):
+            return io.TextIOWrapper(
+                open_input(
+                    path, compression or "gzip", threads=threads, external=decompressor
+                ),
+                encoding="utf-8",
+            )
+
         mode = "rt"
     else:
         opener = open
@@ -70,24 +114,202 @@ def read_data(
     compression: Optional[str] = None,
     comment: Optional[str] = None,
     is_vcf: bool = False,
+    dtype: Optional[Dict[str, type]] = None,
+    regions: Optional[List[Tuple[str, int, Optional[int]]]] = None,
+    threads: Optional[int] = None,
+    decompressor: Optional[str] = None,
+    memory_map: bool = False,
 ) -> pd.DataFrame:
     """
     读取遗传学数据文件
 
+    gzip 输入中的 BGZF 文件按数据块在线程池中并行解压；普通 gzip
+    可选用外部解压程序（igzip/pigz）。未压缩文件可通过内存映射读取。
+
     Args:
-        fn: 文件路径
+        fn: 文件路径或二进制文件对象（如内存中的 io.BytesIO）
         sep: 分隔符，默认空白符
         compression: 压缩格式 (None, 'gzip', 'bz2', 'zip', 'xz')
         comment: 注释符号，以此开头的行将被忽略
         is_vcf: 是否是VCF文件
+        dtype: 传给 pd.read_csv 的列类型（VCF 文件忽略）
+        regions: 只读取这些区域 [(染色体, 起点, 终点)]，见 read_regions
+        threads: BGZF并行解压线程数（默认CPU数，1为单线程）
+        decompressor: 普通gzip使用的外部解压程序 ('igzip', 'pigz', 'auto')
+        memory_map: 未压缩文件通过 mmap 读取（MappedInput），解析器直接读取映射页面
 
     Returns:
         DataFrame
     """
+    if regions:
+        return read_regions(
+            fn,
+            regions,
+            sep=sep,
+            compression=compression,
+            comment=comment,
+            is_vcf=is_vcf,
+            dtype=dtype,
+        )
     if is_vcf:
-        return read_vcf_file(fn, compression)
+        return read_vcf_file(fn, compression, threads=threads, decompressor=decompressor)
+    else:
+        return read_delimited(
+            fn,
+            compression=compression,
+            threads=threads,
+            decompressor=decompressor,
+            sep=sep,
+            comment=comment,
+            dtype=dtype,
+            memory_map=memory_map,
+        )
+
+
+def read_delimited(
+    fn: str,
+    compression: Optional[str] = None,
+    threads: Optional[int] = None,
+    decompressor: Optional[str] = None,
+    memory_map: bool = False,
+    **read_kwargs,
+) -> pd.DataFrame:
+    """
+    读取分隔文本；gzip/zstd/lz4 文件流式解压后交给 pd.read_csv
+
+    Args:
+        fn: 文件路径或二进制文件对象
+        compression: 压缩格式
+        threads: BGZF并行解压线程数
+        decompressor: 普通gzip使用的外部解压程序
+        memory_map: 未压缩的文件路径通过 MappedInput 映射后解析，不经过 read 系统调用
+        **read_kwargs: 传给 pd.read_csv 的其他参数
+
+    Returns:
+        DataFrame
+    """
+    if memory_map and compression is None and isinstance(fn, (str, Path)):
+        with MappedInput(fn) as mapped, mapped.open_range() as handle:
+            return pd.read_csv(handle, **read_kwargs)
+    if compression in STREAM_COMPRESSIONS:
+        with open_input(fn, compression, threads=threads, external=decompressor) as handle:
+            return pd.read_csv(handle, **read_kwargs)
+    return pd.read_csv(fn, compression=compression, **read_kwargs)
+
+
+def _vcf_header_columns(fn: str, compression: Optional[str] = None) -> List[str]:
+    """读取VCF的 #CHROM 列名行"""
+    if compression in STREAM_COMPRESSIONS or fn.endswith(".gz"):
+        handle = io.TextIOWrapper(open_input(fn, compression or "gzip"), encoding="utf-8")
+    else:
+        handle = open(fn, "r")
+    with handle as f:
+        for line in f:
+            if line.startswith("#CHROM") or line.startswith("CHROM"):
+                return [col.lstrip("#") for col in line.strip().split("\t")]
+            if not line.startswith("#"):
+                break
+    raise ValueError(f"Could not find header line in VCF file: {fn}")
+
+
+def parse_regions(
+    region: Optional[Union[str, List[str]]] = None, regions_file: Optional[str] = None
+) -> List[Tuple[str, int, Optional[int]]]:
+    """
+    合并区域字符串和BED文件中的区域
+
+    Args:
+        region: 区域字符串或列表，如 "chr6:28M-34M"
+        regions_file: BED文件路径（0-based 半开区间）
+
+    Returns:
+        [(染色体, 1-based 起点, 终点或None)] 列表
+    """
+    regions = []
+    if region:
+        for item in [region] if isinstance(region, str) else region:
+            regions.append(parse_region(item))
+    if regions_file:
+        regions.extend(read_bed_regions(regions_file))
+    return regions
+
+
+def read_regions(
+    fn: str,
+    regions: List[Tuple[str, int, Optional[int]]],
+    sep: str = "\t",
+    compression: Optional[str] = None,
+    comment: Optional[str] = None,
+    is_vcf: bool = False,
+    dtype: Optional[Dict[str, type]] = None,
+) -> pd.DataFrame:
+    """
+    只读取与给定区域重叠的记录
+
+    有 .tbi/.csi 索引的 BGZF 文件只解压与区域重叠的数据块；带有
+    <文件>.idx.json 区块索引的排序输出只读取相关区块；没有索引时
+    退化为全文件读取后过滤。
+
+    Args:
+        fn: 文件路径
+        regions: [(染色体, 1-based 起点, 终点或None)] 列表
+        sep: 分隔符
+        compression: 压缩格式
+        comment: 注释符号
+        is_vcf: 是否是VCF文件
+        dtype: 传给 pd.read_csv 的列类型
+
+    Returns:
+        区域内记录组成的DataFrame
+    """
+    tabix_index = find_tabix_index(fn)
+
+    if tabix_index is not None:
+        columns = (
+            _vcf_header_columns(fn, compression)
+            if is_vcf
+            else read_delimited(
+                fn, compression=compression, sep=sep, comment=comment, nrows=0
+            ).columns.tolist()
+        )
+        index, data = read_tabix_regions(fn, regions, tabix_index)
+        chr_col = columns[index.col_seq - 1]
+        pos_col = columns[index.col_beg - 1]
+
+        if not data:
+            df = pd.DataFrame(columns=columns)
+        elif is_vcf:
+            rows = [
+                line.split("\t")
+                for line in data.decode("utf-8").splitlines()
+                if line and not line.startswith("#")
+            ]
+            df = pd.DataFrame(rows, columns=columns)
+        else:
+            read_dtype = dict(dtype or {})
+            read_dtype.setdefault(chr_col, str)
+            df = pd.read_csv(
+                io.BytesIO(data),
+                sep=sep,
+                header=None,
+                names=columns,
+                comment=comment,
+                dtype=read_dtype,
+            )
+    elif index_path_for(fn).exists():
+        return query_regions(fn, regions)
     else:
-        return pd.read_csv(fn, sep=sep, compression=compression, comment=comment)
+        warnings.warn(f"No index found for {fn}; scanning the whole file for regions")
+        df = read_data(
+            fn, sep=sep, compression=compression, comment=comment, is_vcf=is_vcf, dtype=dtype
+        )
+        matched = {std: col for col, std in match_columns(df.columns.tolist()).items() if std}
+        if "chr" not in matched or "pos" not in matched:
+            raise ValueError(f"Could not find chromosome/position columns in {fn}")
+        chr_col, pos_col = matched["chr"], matched["pos"]
+
+    keep = region_mask(df[chr_col], df[pos_col], regions)
+    return df[keep].reset_index(drop=True)
 
 
 def create_genetic_column_patterns() -> Dict[str, re.Pattern]:
@@ -257,6 +479,10 @@ def detect_file_format(filename: str) -> Tuple[str, Optional[str], Optional[str]
         compression = "zip"
     elif ".xz" in suffixes:
         compression = "xz"
+    elif ".zst" in suffixes:
+        compression = "zstd"
+    elif ".lz4" in suffixes:
+        compression = "lz4"
 
     # 检测分隔符、注释符和是否为VCF
     comment = None
@@ -348,6 +574,15 @@ def convert_single_file(
     metadata: Optional[Dict[str, any]] = None,
     keep_unmatched: bool = True,
     verbose: bool = True,
+    coerce_types: bool = False,
+    downcast: bool = False,
+    derive_stats: bool = False,
+    variant_key: bool = False,
+    region: Optional[Union[str, List[str]]] = None,
+    regions_file: Optional[str] = None,
+    data: Optional[bytes] = None,
+    cache_dir: Optional[str] = None,
+    hooks: HookSpec = None,
 ) -> pd.DataFrame:
     """
     转换单个遗传学数据文件到标准化格式
@@ -362,52 +597,171 @@ def convert_single_file(
         metadata: 要添加的元数据
         keep_unmatched: 是否保留未匹配的列
         verbose: 是否打印详细信息
+        coerce_types: 是否将标准列转换为预期类型（统计信息保存在 df.attrs["coercion_stats"]）
+        downcast: 类型转换时在无损的情况下将数值列缩小为 float32/int32 以节省内存
+            （需 coerce_types；结果类型取决于数据，分块输出不支持）
+        derive_stats: 是否由已有统计量推导缺失的 beta/se/or/z/pval（填充数保存在 df.attrs["derivation_stats"]）
+        variant_key: 是否添加64位压缩变异键列 variant_key（染色体编码 + 位置 + 等位基因哈希），
+            供按整数列连接、去重和查找
+        region: 只读取这些区域，如 "chr6:28M-34M"（有tabix或区块索引时随机读取）
+        regions_file: 包含要读取区域的BED文件
+        data: 已读入内存的文件内容；给定时直接从内存解析，不再打开文件
+            （VCF和区域读取仍按路径读取）
+        cache_dir: 内容寻址缓存目录；输入内容（与路径无关）和所有选项都相同时
+            直接读取缓存结果而不重新转换
+        hooks: 性能分析钩子或回调 f(event, info)，在转换开始/结束及每个阶段
+            （sniff、cache、read、map、coerce、derive、key）前后调用，见 ConversionHook
 
     Returns:
         标准化后的DataFrame
     """
-    if verbose:
-        print(f"\nProcessing file: {filename}")
-
-    # 自动检测文件格式
-    auto_sep, auto_compression, auto_comment, is_vcf = detect_file_format(filename)
-    sep = sep or auto_sep
-    compression = compression or auto_compression
-    comment = comment if comment is not None else auto_comment
-
-    if verbose:
-        print(
-            f"  Detected format: sep={repr(sep)}, compression={compression}, is_vcf={is_vcf}"
-        )
+    timer = StageTimer(hooks)
+    with timer.conversion(function="convert_single_file", input=str(filename)) as outcome:
+        if verbose:
+            print(f"\nProcessing file: {filename}")
+
+        # 缓存键：输入内容哈希 + 映射和选项
+        cache = None
+        if cache_dir is not None:
+            with timer.stage("cache"):
+                cache = ConversionCache(cache_dir)
+                key = cache_key(
+                    data_hash(data) if data is not None else file_hash(filename),
+                    {
+                        "suffixes": "".join(Path(filename).suffixes).lower(),
+                        "sep": sep,
+                        "compression": compression,
+                        "comment": comment,
+                        "column_mapping": column_mapping,
+                        "custom_patterns": {
+                            field: pattern.pattern
+                            for field, pattern in (custom_patterns or {}).items()
+                        },
+                        "metadata": metadata,
+                        "keep_unmatched": keep_unmatched,
+                        "coerce_types": coerce_types,
+                        "downcast": downcast,
+                        "derive_stats": derive_stats,
+                        "variant_key": variant_key,
+                        "region": region,
+                        "regions_file": file_hash(regions_file) if regions_file else None,
+                    },
+                )
+                cached_df = cache.load_frame(key)
+            if cached_df is not None:
+                outcome["rows"] = len(cached_df)
+                if verbose:
+                    print(f"  Loaded from cache: {cached_df.shape}")
+                return cached_df
+
+        # 自动检测文件格式
+        with timer.stage("sniff"):
+            auto_sep, auto_compression, auto_comment, is_vcf = detect_file_format(filename)
+        sep = sep or auto_sep
+        compression = compression or auto_compression
+        comment = comment if comment is not None else auto_comment
+        regions = parse_regions(region, regions_file)
+        from_memory = data is not None and not is_vcf and not regions
+
+        if verbose:
+            print(
+                f"  Detected format: sep={repr(sep)}, compression={compression}, is_vcf={is_vcf}"
+            )
+
+        # 类型转换时以文本读取p值列，避免 1e-400 之类的值在读取时下溢为0
+        read_dtype = None
+        if coerce_types and not is_vcf:
+            with timer.stage("sniff"):
+                header = read_delimited(
+                    io.BytesIO(data) if from_memory else filename,
+                    compression=compression,
+                    sep=sep,
+                    comment=comment,
+                    nrows=0,
+                ).columns.tolist()
+            header_mapping = {
+                col: std
+                for col, std in match_columns(header, custom_patterns).items()
+                if std is not None
+            }
+            header_mapping.update(column_mapping or {})
+            read_dtype = text_read_dtypes(header_mapping) or None
+
+        # 读取数据
+        with timer.stage("read", bytes_in=len(data) if from_memory else 0) as call:
+            df = read_data(
+                io.BytesIO(data) if from_memory else filename,
+                sep=sep,
+                compression=compression,
+                comment=comment,
+                is_vcf=is_vcf,
+                dtype=read_dtype,
+                regions=regions or None,
+            )
+            call["rows"] = len(df)
+        if not from_memory and not regions:
+            timer.record_input(filename)
+
+        if verbose:
+            print(f"  Original shape: {df.shape}")
+            print(f"  Original columns: {df.columns.tolist()}")
+
+        # 标准化列名
+        with timer.stage("map", rows=len(df)):
+            standardized_df = standardize_columns(
+                df,
+                column_mapping=column_mapping,
+                custom_patterns=custom_patterns,
+                keep_unmatched=keep_unmatched,
+            )
+
+        # 类型转换
+        coercion_stats = None
+        if coerce_types:
+            with timer.stage("coerce", rows=len(df)):
+                standardized_df, coercion_stats = coerce_standard_columns(
+                    standardized_df, downcast=downcast
+                )
+            if verbose:
+                coerced = sum(stats["coerced"] for stats in coercion_stats.values())
+                print(f"  Coerced {len(coercion_stats)} columns ({coerced} invalid values set to NA)")
+
+        # 推导缺失的统计量
+        derivation_stats = None
+        if derive_stats:
+            with timer.stage("derive", rows=len(df)):
+                standardized_df, derivation_stats = derive_statistics(standardized_df)
+            if verbose and derivation_stats:
+                print(f"  Derived statistics: {derivation_stats}")
+
+        # 压缩变异键
+        if variant_key:
+            with timer.stage("key", rows=len(df)):
+                standardized_df = add_variant_key(standardized_df)
+
+        # 添加元数据
+        if metadata:
+            standardized_df = add_metadata(standardized_df, metadata)
+            if verbose:
+                print(f"  Added metadata: {list(metadata.keys())}")
 
-    # 读取数据
-    df = read_data(
-        filename, sep=sep, compression=compression, comment=comment, is_vcf=is_vcf
-    )
-
-    if verbose:
-        print(f"  Original shape: {df.shape}")
-        print(f"  Original columns: {df.columns.tolist()}")
-
-    # 标准化列名
-    standardized_df = standardize_columns(
-        df,
-        column_mapping=column_mapping,
-        custom_patterns=custom_patterns,
-        keep_unmatched=keep_unmatched,
-    )
-
-    # 添加元数据
-    if metadata:
-        standardized_df = add_metadata(standardized_df, metadata)
         if verbose:
-            print(f"  Added metadata: {list(metadata.keys())}")
+            print(f"  Standardized shape: {standardized_df.shape}")
+            print(f"  Standardized columns: {standardized_df.columns.tolist()}")
+
+        if coercion_stats is not None:
+            standardized_df.attrs["coercion_stats"] = coercion_stats
+        if derivation_stats is not None:
+            standardized_df.attrs["derivation_stats"] = derivation_stats
 
-    if verbose:
-        print(f"  Standardized shape: {standardized_df.shape}")
-        print(f"  Standardized columns: {standardized_df.columns.tolist()}")
+        if cache is not None:
+            with timer.stage("cache"):
+                cache.store_frame(
+                    key, standardized_df, info={"attrs": dict(standardized_df.attrs)}
+                )
 
-    return standardized_df
+        outcome["rows"] = len(standardized_df)
+        return standardized_df
 
 
 def convert_from_metadata(
@@ -421,10 +775,25 @@ def convert_from_metadata(
     custom_patterns: Optional[Dict[str, re.Pattern]] = None,
     keep_unmatched: bool = True,
     verbose: bool = True,
+    coerce_types: bool = False,
+    downcast: bool = False,
+    derive_stats: bool = False,
+    variant_key: bool = False,
+    region: Optional[Union[str, List[str]]] = None,
+    regions_file: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    manifest: Optional[str] = None,
+    save_options: Optional[Dict[str, object]] = None,
+    cache_dir: Optional[str] = None,
+    hooks: HookSpec = None,
 ) -> Dict[str, pd.DataFrame]:
     """
     根据元数据表批量转换遗传学数据文件
 
+    给定 manifest 时每个文件转换后立即保存到 output_dir，并在清单（JSONL）中
+    记录输入路径、大小、修改时间、内容哈希、映射和输出路径。重新运行时跳过
+    输出仍为最新的文件，只重做新增、已修改或失败的文件。
+
     Args:
         metadata_df: 元数据DataFrame，必须包含文件路径列
         file_column: 文件路径列名
@@ -436,51 +805,117 @@ def convert_from_metadata(
         custom_patterns: 自定义的正则表达式模式
         keep_unmatched: 是否保留未匹配的列
         verbose: 是否打印详细信息
+        coerce_types: 是否将标准列转换为预期类型
+        downcast: 类型转换时无损缩小数值列，见 convert_single_file
+        derive_stats: 是否推导缺失的统计量
+        variant_key: 是否添加64位压缩变异键列
+        region: 只读取这些区域
+        regions_file: 包含要读取区域的BED文件
+        output_dir: 输出目录（使用 manifest 时必需）
+        manifest: 清单文件路径，用于断点续跑
+        save_options: 传给 save_results 的参数，如 {"output_format": "parquet"}
+        cache_dir: 内容寻址缓存目录，见 convert_single_file
+        hooks: 性能分析或进度钩子，对整批及每个文件的转换调用，见 convert_single_file
 
     Returns:
-        字典，键为文件路径，值为标准化后的DataFrame
+        字典，键为文件路径，值为标准化后的DataFrame（使用 manifest 时不含被跳过的文件）
     """
     if file_column not in metadata_df.columns:
         raise ValueError(f"Column '{file_column}' not found in metadata DataFrame")
+    if manifest is not None and output_dir is None:
+        raise ValueError("A manifest requires output_dir")
+    run_manifest = ConversionManifest(manifest) if manifest is not None else None
+    save_options = dict(save_options or {})
+    skipped = 0
 
     # 确定要添加的元数据列
     if metadata_columns is None:
         metadata_columns = [col for col in metadata_df.columns if col != file_column]
 
     result_dict = {}
+    # 整批作为一次转换通知钩子，进度按全部输入文件的总大小计算
+    timer = StageTimer(hooks)
+
+    with timer.conversion(
+        function="convert_from_metadata",
+        inputs=[str(filename) for filename in metadata_df[file_column]],
+    ) as outcome:
+        for idx, row in metadata_df.iterrows():
+            filename = row[file_column]
+
+            # 准备元数据
+            file_metadata = {col: row[col] for col in metadata_columns}
+
+            # 获取文件特定的列名映射
+            file_mapping = column_mapping.get(filename) if column_mapping else None
+
+            # 影响输出内容的选项；任一变化都会重新转换
+            options = {
+                "sep": sep,
+                "compression": compression,
+                "comment": comment,
+                "metadata": file_metadata,
+                "keep_unmatched": keep_unmatched,
+                "coerce_types": coerce_types,
+                "downcast": downcast,
+                "derive_stats": derive_stats,
+                "variant_key": variant_key,
+                "region": region,
+                "regions_file": regions_file,
+                "output_dir": output_dir,
+                "save_options": save_options,
+            }
+            if run_manifest is not None and run_manifest.is_current(filename, options, file_mapping):
+                skipped += 1
+                timer.progress(input=str(filename), skipped=True)
+                continue
 
-    for idx, row in metadata_df.iterrows():
-        filename = row[file_column]
-
-        # 准备元数据
-        file_metadata = {col: row[col] for col in metadata_columns}
-
-        # 获取文件特定的列名映射
-        file_mapping = column_mapping.get(filename) if column_mapping else None
-
-        try:
-            # 转换文件
-            df = convert_single_file(
-                filename=filename,
-                sep=sep,
-                compression=compression,
-                comment=comment,
-                column_mapping=file_mapping,
-                custom_patterns=custom_patterns,
-                metadata=file_metadata,
-                keep_unmatched=keep_unmatched,
-                verbose=verbose,
-            )
-
-            result_dict[filename] = df
+            try:
+                # 转换文件
+                df = convert_single_file(
+                    filename=filename,
+                    sep=sep,
+                    compression=compression,
+                    comment=comment,
+                    column_mapping=file_mapping,
+                    custom_patterns=custom_patterns,
+                    metadata=file_metadata,
+                    keep_unmatched=keep_unmatched,
+                    verbose=verbose,
+                    coerce_types=coerce_types,
+                    downcast=downcast,
+                    derive_stats=derive_stats,
+                    variant_key=variant_key,
+                    region=region,
+                    regions_file=regions_file,
+                    cache_dir=cache_dir,
+                    hooks=hooks,
+                )
+
+                if run_manifest is not None:
+                    saved = save_results({filename: df}, output_dir, **save_options)
+                    run_manifest.record(
+                        filename, "done", output=saved[filename], options=options, mapping=file_mapping
+                    )
+
+                result_dict[filename] = df
+
+            except Exception as e:
+                print(f"  Error processing {filename}: {str(e)}")
+                if run_manifest is not None:
+                    run_manifest.record(
+                        filename, "failed", options=options, mapping=file_mapping, error=str(e)
+                    )
+                if verbose:
+                    import traceback
+
+                    traceback.print_exc()
+                continue
 
-        except Exception as e:
-            print(f"  Error processing {filename}: {str(e)}")
-            if verbose:
-                import traceback
+        outcome["rows"] = sum(len(df) for df in result_dict.values())
 
-                traceback.print_exc()
-            continue
+    if run_manifest is not None and verbose:
+        print(f"Skipped {skipped} up-to-date files (manifest: {manifest})")
 
     return result_dict
 
@@ -495,6 +930,14 @@ def convert_multiple_files(
     metadata: Optional[Dict[str, Dict[str, any]]] = None,
     keep_unmatched: bool = False,
     verbose: bool = True,
+    coerce_types: bool = False,
+    downcast: bool = False,
+    derive_stats: bool = False,
+    variant_key: bool = False,
+    region: Optional[Union[str, List[str]]] = None,
+    regions_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    hooks: HookSpec = None,
 ) -> Dict[str, pd.DataFrame]:
     """
     批量转换多个遗传学数据文件
@@ -509,39 +952,61 @@ def convert_multiple_files(
         metadata: 文件特定的元数据 {文件路径: {列名: 值}}
         keep_unmatched: 是否保留未匹配的列
         verbose: 是否打印详细信息
+        coerce_types: 是否将标准列转换为预期类型
+        downcast: 类型转换时无损缩小数值列，见 convert_single_file
+        derive_stats: 是否推导缺失的统计量
+        variant_key: 是否添加64位压缩变异键列
+        region: 只读取这些区域
+        regions_file: 包含要读取区域的BED文件
+        cache_dir: 内容寻址缓存目录，见 convert_single_file
+        hooks: 性能分析或进度钩子，对整批及每个文件的转换调用，见 convert_single_file
 
     Returns:
         字典，键为文件路径，值为标准化后的DataFrame
     """
     result_dict = {}
+    timer = StageTimer(hooks)
+
+    with timer.conversion(
+        function="convert_multiple_files", inputs=[str(filename) for filename in file_list]
+    ) as outcome:
+        for filename in file_list:
+            # 获取文件特定的映射和元数据
+            file_mapping = column_mapping.get(filename) if column_mapping else None
+            file_metadata = metadata.get(filename) if metadata else None
+
+            try:
+                df = convert_single_file(
+                    filename=filename,
+                    sep=sep,
+                    compression=compression,
+                    comment=comment,
+                    column_mapping=file_mapping,
+                    custom_patterns=custom_patterns,
+                    metadata=file_metadata,
+                    keep_unmatched=keep_unmatched,
+                    verbose=verbose,
+                    coerce_types=coerce_types,
+                    downcast=downcast,
+                    derive_stats=derive_stats,
+                    variant_key=variant_key,
+                    region=region,
+                    regions_file=regions_file,
+                    cache_dir=cache_dir,
+                    hooks=hooks,
+                )
+
+                result_dict[filename] = df
+
+            except Exception as e:
+                print(f"  Error processing {filename}: {str(e)}")
+                if verbose:
+                    import traceback
+
+                    traceback.print_exc()
+                continue
 
-    for filename in file_list:
-        # 获取文件特定的映射和元数据
-        file_mapping = column_mapping.get(filename) if column_mapping else None
-        file_metadata = metadata.get(filename) if metadata else None
-
-        try:
-            df = convert_single_file(
-                filename=filename,
-                sep=sep,
-                compression=compression,
-                comment=comment,
-                column_mapping=file_mapping,
-                custom_patterns=custom_patterns,
-                metadata=file_metadata,
-                keep_unmatched=keep_unmatched,
-                verbose=verbose,
-            )
-
-            result_dict[filename] = df
-
-        except Exception as e:
-            print(f"  Error processing {filename}: {str(e)}")
-            if verbose:
-                import traceback
-
-                traceback.print_exc()
-            continue
+        outcome["rows"] = sum(len(df) for df in result_dict.values())
 
     return result_dict
 
@@ -553,26 +1018,139 @@ def save_results(
     file_suffix: str = "",
     output_format: str = "tsv",
     compression: Optional[str] = "gzip",
-) -> None:
+    sort_by_position: bool = False,
+    write_index: bool = False,
+    index_format: str = "tbi",
+    compression_level: Optional[int] = None,
+    threads: Optional[int] = None,
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: Optional[int] = None,
+) -> Dict[str, Path]:
     """
     保存转换结果到文件
 
+    gzip/bgzip 文本输出按 BGZF 数据块在线程池中并行压缩后顺序写出，
+    结果仍是标准的（多成员）gzip 文件；zstd 输出多线程压缩。
+
     Args:
         result_dict: 转换结果字典 {文件路径: DataFrame}
         output_dir: 输出目录
         file_prefix: 输出文件前缀
         file_suffix: 输出文件后缀
-        output_format: 输出格式 ('tsv', 'csv', 'parquet')
-        compression: 压缩格式
+        output_format: 输出格式 ('tsv', 'csv', 'parquet', 'dataset', 'arrow', 'feather')；
+            'dataset' 将所有结果写入 <输出目录>/<前缀><后缀>/ 下的一个 Hive 分区
+            Parquet 数据集；'arrow'/'feather' 写出可内存映射、零拷贝读取的 Arrow IPC
+            文件（压缩仅支持 lz4/zstd，其他压缩格式按不压缩处理）
+        compression: 压缩格式 (None, 'gzip', 'bgzip', 'zstd', 'lz4' 等)；'bgzip' 写出可随机访问的 BGZF
+        sort_by_position: 是否按染色体和位置排序输出
+        write_index: 是否写入索引，隐含排序；未压缩文本和 parquet 写入区块索引
+            (<输出文件>.idx.json)，bgzip 压缩的 TSV 写入 tabix 索引
+        index_format: bgzip 输出的 tabix 索引格式 ('tbi' 或 'csi')
+        compression_level: 压缩级别，越低越快（gzip/bgzip 1-9，zstd 1-22，lz4 0-16；
+            默认按压缩格式选择）
+        threads: 压缩线程数（默认CPU数，1为单线程）
+        partition_cols: 'dataset' 输出的分区列，如 ["study", "chr"]（可用元数据列）
+        row_group_size: Parquet 每个行组的行数；按位置排序后行组的 min/max
+            统计信息可用于谓词下推
+
+    Returns:
+        字典，键为原始文件路径，值为输出文件路径（'dataset' 输出为数据集目录）
     """
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
+    codec = parquet_codec(compression)
+
+    if output_format == "dataset":
+        dataset_dir = write_parquet_dataset(
+            result_dict,
+            str(output_path / f"{file_prefix}{file_suffix}"),
+            partition_cols=partition_cols,
+            row_group_size=row_group_size or DEFAULT_ROW_GROUP_SIZE,
+            compression=codec,
+            sort_by_position=True,
+        )
+        print(f"Saved dataset: {dataset_dir} ({len(result_dict)} files)")
+        return {original_file: dataset_dir for original_file in result_dict}
+
+    saved = {}
 
     for idx, (original_file, df) in enumerate(result_dict.items()):
         # 生成输出文件名
         base_name = Path(original_file).stem.split(".")[0]  # 去掉所有扩展名
         output_filename = f"{file_prefix}_{base_name}{file_suffix}"
 
+        if sort_by_position or write_index:
+            df = sort_by_coordinates(df)
+
+        # 索引需要可随机访问的输出：未压缩文本或 parquet（Arrow IPC 输出在下面跳过索引）
+        ext = {"tsv": ".tsv", "csv": ".csv", "parquet": ".parquet"}.get(output_format)
+        if write_index and ext is not None and (output_format == "parquet" or compression is None):
+            output_file = output_path / f"{output_filename}{ext}"
+            write_indexed_table(
+                df,
+                str(output_file),
+                output_format,
+                presorted=True,
+                parquet_compression=codec,
+            )
+            print(f"Saved: {output_file} (indexed)")
+            saved[original_file] = output_file
+            continue
+
+        # Arrow IPC/Feather 输出：下游可内存映射直接读取列，无需解析
+        if output_format in ARROW_FORMATS:
+            if write_index:
+                warnings.warn(f"Arrow IPC output is not indexed; skipping index for {original_file}")
+            output_file = output_path / f"{output_filename}.{output_format}"
+            with open_table_writer(
+                str(output_file),
+                output_format=output_format,
+                compression=compression if compression in ARROW_COMPRESSIONS else None,
+            ) as writer:
+                writer.write(df)
+            print(f"Saved: {output_file}")
+            saved[original_file] = output_file
+            continue
+
+        # 压缩文本输出：gzip/bgzip 按 BGZF 块并行压缩，zstd 多线程压缩；
+        # bgzip 排序后的 TSV 在同一遍写入中生成 tabix 索引
+        if compression in COMPRESSION_EXTENSIONS and output_format in ("tsv", "csv"):
+            output_file = (
+                output_path
+                / f"{output_filename}.{output_format}{COMPRESSION_EXTENSIONS[compression]}"
+            )
+            tabix_format = None
+            if compression != "bgzip" and write_index:
+                warnings.warn(
+                    f"Indexing requires uncompressed text, parquet or bgzip output; "
+                    f"skipping index for {original_file}"
+                )
+            elif compression == "bgzip" and (sort_by_position or write_index):
+                if output_format == "tsv":
+                    tabix_format = index_format
+                else:
+                    warnings.warn("Tabix indexes require TSV output; skipping index")
+            with open_table_writer(
+                str(output_file),
+                output_format=output_format,
+                compression=compression,
+                write_index=tabix_format is not None,
+                index_format=tabix_format or index_format,
+                level=compression_level,
+                threads=threads,
+            ) as writer:
+                writer.write(df)
+            suffix = f" (indexed: .{tabix_format})" if tabix_format else ""
+            print(f"Saved: {output_file}{suffix}")
+            saved[original_file] = output_file
+            continue
+
+        if write_index:
+            warnings.warn(
+                f"Indexing requires uncompressed text, parquet or bgzip output; "
+                f"skipping index for {original_file}"
+            )
+
         if output_format == "tsv":
             ext = ".tsv.gz" if compression == "gzip" else ".tsv"
             output_file = output_path / f"{output_filename}{ext}"
@@ -583,8 +1161,16 @@ def save_results(
             df.to_csv(output_file, index=False, compression=compression)
         elif output_format == "parquet":
             output_file = output_path / f"{output_filename}.parquet"
-            df.to_parquet(output_file, compression=compression or "snappy")
+            parquet_kwargs = {}
+            if compression_level is not None:
+                parquet_kwargs["compression_level"] = compression_level
+            if row_group_size:
+                parquet_kwargs["row_group_size"] = row_group_size
+            df.to_parquet(output_file, compression=codec, **parquet_kwargs)
         else:
             raise ValueError(f"Unsupported output format: {output_format}")
 
         print(f"Saved: {output_file}")
+        saved[original_file] = output_file
+
+    return saved
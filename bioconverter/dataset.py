@@ -0,0 +1,297 @@
+"""
+Parquet Dataset Module
+Hive-partitioned Parquet datasets combining many converted files
+"""
+
+import uuid
+import warnings
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .coercion import NEGLOG10_PVAL_COLUMN, STANDARD_DTYPES, coerce_column
+from .genomic_index import sort_by_coordinates
+
+# Rows per row group; small enough for min/max statistics on pos to be selective
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+# Column recording which input file each row came from
+SOURCE_COLUMN = "source_file"
+
+
+def _unified_type(types: List[object]):
+    """Pick one Arrow type for a column that may differ between inputs."""
+    import pyarrow as pa
+
+    distinct = [t for t in dict.fromkeys(types) if not pa.types.is_null(t)]
+    if not distinct:
+        return pa.string()
+    if len(distinct) == 1:
+        return distinct[0]
+    if all(pa.types.is_integer(t) for t in distinct):
+        return pa.int64()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in distinct):
+        return pa.float64()
+    return pa.string()
+
+
+def unify_schemas(frames: Iterable[pd.DataFrame]):
+    """
+    Build one Arrow schema covering the columns of several DataFrames.
+
+    Columns missing from some inputs are kept (filled with nulls when
+    written); conflicting numeric types are widened and other conflicts fall
+    back to strings.
+
+    Args:
+        frames: DataFrames to combine
+
+    Returns:
+        pyarrow.Schema with columns in first-seen order
+    """
+    import pyarrow as pa
+
+    types: Dict[str, List[object]] = {}
+    for df in frames:
+        for field in pa.Schema.from_pandas(df, preserve_index=False):
+            types.setdefault(field.name, []).append(field.type)
+    return pa.schema([(name, _unified_type(col_types)) for name, col_types in types.items()])
+
+
+def pin_standard_types(schema):
+    """
+    Return the schema with numeric standard columns widened to 64 bits.
+
+    A schema taken from the first chunk of a stream must also fit the later
+    chunks: statistics become float64 even if the first chunk held only
+    integers, and integer columns (pos, n) int64, or float64 if the first
+    chunk already held floats (e.g. NaN for missing values). Text columns
+    are plain strings (pandas 3 string columns map to large_string); other
+    columns keep their type.
+    """
+    import pyarrow as pa
+
+    for index, field in enumerate(schema):
+        if pa.types.is_large_string(field.type):
+            schema = schema.set(index, pa.field(field.name, pa.string()))
+            continue
+        kind = "float" if field.name == NEGLOG10_PVAL_COLUMN else STANDARD_DTYPES.get(field.name)
+        numeric = pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+        if kind is None or kind == "string" or not numeric:
+            continue
+        if kind == "int" and pa.types.is_integer(field.type):
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.float64()
+        if field.type != arrow_type:
+            schema = schema.set(index, pa.field(field.name, arrow_type))
+    return schema
+
+
+def with_string_column(schema, column: str):
+    """Return the schema with ``column`` (if present) typed as string."""
+    import pyarrow as pa
+
+    index = schema.get_field_index(column)
+    if index >= 0 and not pa.types.is_string(schema.field(index).type):
+        # Also replaces large_string, so every chunk is cast to one type
+        schema = schema.set(index, pa.field(column, pa.string()))
+    return schema
+
+
+def conform_to_schema(df: pd.DataFrame, schema):
+    """
+    Convert a DataFrame to an Arrow table with exactly the given schema.
+
+    Missing columns become nulls, extra columns are dropped and values are
+    cast to the schema types. The schema usually comes from the first chunk
+    of a stream, so later chunks may disagree with it: numbers in a string
+    column are written as text, and text in a numeric column is parsed as
+    ``coerce_types`` would (p-values such as ``<1e-300`` included); values
+    that are still not numbers are written as nulls, with a warning.
+    Missing-value tokens ('NA', '.', ...) are plain nulls.
+    """
+    import pyarrow as pa
+
+    columns = {}
+    for field in schema:
+        if field.name not in df.columns:
+            columns[field.name] = pa.nulls(len(df), type=field.type)
+            continue
+        values = df[field.name]
+        if _is_text_type(field.type):
+            if not isinstance(values.dtype, pd.StringDtype):
+                values = values.astype("string")
+        elif pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                values = _parse_numbers(values, field.name)
+        columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+    return pa.table(columns, schema=schema)
+
+
+def _is_text_type(arrow_type) -> bool:
+    import pyarrow as pa
+
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+
+def _parse_numbers(values: pd.Series, column: str) -> pd.Series:
+    """Parse a text column written to a numeric field, warning about non-numbers."""
+    kind = "pval" if STANDARD_DTYPES.get(column) == "pval" else "float"
+    numbers, stats = coerce_column(values, kind)
+    if stats["coerced"]:
+        warnings.warn(
+            f"{stats['coerced']} values of '{column}' are not numbers and were written as nulls"
+        )
+    return pd.Series(numbers, index=values.index)
+
+
+class ParquetDatasetWriter:
+    """
+    Appends DataFrames to a Hive-partitioned Parquet dataset.
+
+    Each write is sorted by chromosome and position (when both columns are
+    present) before being split into partitions, so every row group covers a
+    narrow position range and its min/max statistics let readers skip it for
+    region filters. All files share one schema: the one given, or the schema
+    of the first write with standard columns in their 64-bit types (see
+    ``pin_standard_types``). The chromosome column is always stored as a
+    string, so a first chunk of numeric chromosomes does not reject a later ``X``.
+    A ``_common_metadata`` file records the schema on close.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        partition_cols: Optional[List[str]] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        max_rows_per_file: Optional[int] = None,
+        compression: str = "snappy",
+        sort_by_position: bool = True,
+        schema=None,
+        chr_col: str = "chr",
+        pos_col: str = "pos",
+    ):
+        self.output_dir = Path(output_dir)
+        self.partition_cols = list(partition_cols or [])
+        self.row_group_size = row_group_size
+        self.max_rows_per_file = max_rows_per_file
+        self.compression = compression
+        self.sort_by_position = sort_by_position
+        self.schema = schema
+        self.chr_col = chr_col
+        self.pos_col = pos_col
+        self.rows_written = 0
+        self._token = uuid.uuid4().hex[:8]
+        self._writes = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append rows to the dataset."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if len(df) == 0:
+            return
+        missing = [col for col in self.partition_cols if col not in df.columns]
+        if missing:
+            raise ValueError(f"Partition columns not found: {missing}")
+        if self.sort_by_position and {self.chr_col, self.pos_col} <= set(df.columns):
+            df = sort_by_coordinates(df, self.chr_col, self.pos_col)
+        if self.schema is None:
+            self.schema = pin_standard_types(unify_schemas([df]))
+        self.schema = with_string_column(self.schema, self.chr_col)
+        table = conform_to_schema(df, self.schema)
+
+        partitioning = None
+        if self.partition_cols:
+            partitioning = ds.partitioning(
+                pa.schema([self.schema.field(col) for col in self.partition_cols]),
+                flavor="hive",
+            )
+        ds.write_dataset(
+            table,
+            self.output_dir,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template=f"part-{self._token}-{self._writes}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(
+                compression=self.compression
+            ),
+            min_rows_per_group=self.row_group_size,
+            max_rows_per_group=self.row_group_size,
+            max_rows_per_file=self.max_rows_per_file or 0,
+        )
+        self._writes += 1
+        self.rows_written += len(df)
+
+    def close(self) -> None:
+        """Write ``_common_metadata`` with the dataset schema."""
+        import pyarrow.parquet as pq
+
+        if self.schema is None:
+            return
+        file_schema = self.schema
+        for col in self.partition_cols:
+            file_schema = file_schema.remove(file_schema.get_field_index(col))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_metadata(file_schema, self.output_dir / "_common_metadata")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_parquet_dataset(
+    result_dict: Dict[str, pd.DataFrame],
+    output_dir: str,
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    max_rows_per_file: Optional[int] = None,
+    compression: str = "snappy",
+    sort_by_position: bool = True,
+    source_column: Optional[str] = SOURCE_COLUMN,
+) -> Path:
+    """
+    Write many converted files into one Hive-partitioned Parquet dataset.
+
+    Intended for the output of ``convert_multiple_files`` or
+    ``convert_from_metadata``: metadata columns such as ``study`` can be used
+    as partition columns alongside ``chr``, e.g. ``study=X/chr=6/part-*.parquet``.
+    Query it with ``pyarrow.dataset.dataset(output_dir, partitioning="hive")``
+    or ``pd.read_parquet(output_dir, filters=[...])``.
+
+    Args:
+        result_dict: Converted results {input file: DataFrame}
+        output_dir: Dataset root directory
+        partition_cols: Columns to partition by (directory levels, in order)
+        row_group_size: Rows per row group
+        max_rows_per_file: Split partitions into files of at most this many rows
+        compression: Parquet codec ('snappy', 'zstd', 'lz4', 'gzip', ...)
+        sort_by_position: Sort each input by chromosome and position first
+        source_column: Column recording the input file name (None to omit)
+
+    Returns:
+        Path of the dataset root
+    """
+    frames = []
+    for original_file, df in result_dict.items():
+        if source_column:
+            df = df.assign(**{source_column: Path(original_file).name})
+        frames.append(df)
+
+    writer = ParquetDatasetWriter(
+        output_dir,
+        partition_cols=partition_cols,
+        row_group_size=row_group_size,
+        max_rows_per_file=max_rows_per_file,
+        compression=compression,
+        sort_by_position=sort_by_position,
+        schema=unify_schemas(frames) if frames else None,
+    )
+    with writer:
+        for df in frames:
+            writer.write(df)
+    return Path(output_dir)
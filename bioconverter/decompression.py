@@ -0,0 +1,297 @@
+"""
+Decompression Module
+Fast streaming readers for compressed inputs: parallel BGZF inflation, external
+gzip decompressor processes, Zstandard and LZ4
+"""
+
+import gzip
+import io
+import os
+import shutil
+import subprocess
+import warnings
+from typing import BinaryIO, List, Optional
+
+from .bgzf import is_bgzf, open_bgzf
+
+try:
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - optional dependency
+    _zstd = None
+
+try:
+    import lz4.frame as _lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    _lz4_frame = None
+
+# Compressions decompressed by open_input rather than by pandas
+STREAM_COMPRESSIONS = ("gzip", "zstd", "lz4")
+
+# Leading bytes of each compressed format (checked by sniff_compression)
+_MAGIC_BYTES = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"\x04\x22\x4d\x18", "lz4"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"PK\x03\x04", "zip"),
+)
+
+# External tools that decompress plain (non-blocked) gzip faster than zlib,
+# in order of preference for external="auto"
+EXTERNAL_DECOMPRESSORS = {
+    "igzip": ["igzip", "-dc"],
+    "pigz": ["pigz", "-dc"],
+}
+
+
+class _SourceStream(io.RawIOBase):
+    """
+    Raw stream over a decompressing reader that owns the compressed file it
+    reads from, so the compressed position stays available for progress.
+    """
+
+    def __init__(self, reader, source: BinaryIO):
+        super().__init__()
+        self._reader = reader
+        self._source = source
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._reader.readinto(buffer)
+
+    def compressed_position(self) -> int:
+        return self._source.tell()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._reader.close()
+            self._source.close()
+        super().close()
+
+
+class _ProcessStream(io.RawIOBase):
+    """Raw stream over the stdout of a decompressor process (fed ``source`` on stdin)."""
+
+    def __init__(self, command: List[str], source: Optional[BinaryIO] = None):
+        super().__init__()
+        self.command = command
+        self._source = source
+        self._process = subprocess.Popen(
+            command, stdin=source, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self._process.stdout.readinto(buffer)
+        if n == 0:
+            self._check()
+        return n
+
+    def _check(self) -> None:
+        returncode = self._process.wait()
+        if returncode != 0:
+            stderr = self._process.stderr.read().decode(errors="replace").strip()
+            raise OSError(f"{self.command[0]} exited with status {returncode}: {stderr}")
+
+    def close(self) -> None:
+        if not self.closed:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process.stderr.close()
+            if self._source is not None:
+                self._source.close()
+        super().close()
+
+    def compressed_position(self) -> Optional[int]:
+        # The decompressor shares the file description, so its offset is the
+        # position the child has read up to
+        if self._source is None:
+            return None
+        return os.lseek(self._source.fileno(), 0, os.SEEK_CUR)
+
+
+def find_external_decompressor(name: str = "auto") -> Optional[List[str]]:
+    """
+    Locate an external gzip decompressor on PATH.
+
+    Args:
+        name: 'igzip', 'pigz' or 'auto' (first one available)
+
+    Returns:
+        Command line prefix (without the file name), or None if not found
+    """
+    if name == "auto":
+        candidates = list(EXTERNAL_DECOMPRESSORS)
+    elif name in EXTERNAL_DECOMPRESSORS:
+        candidates = [name]
+    else:
+        raise ValueError(f"Unknown external decompressor: {name}")
+    for candidate in candidates:
+        if shutil.which(candidate):
+            return list(EXTERNAL_DECOMPRESSORS[candidate])
+    return None
+
+
+def open_gzip(
+    filename: str,
+    threads: Optional[int] = None,
+    external: Optional[str] = None,
+    buffer_size: int = 1 << 20,
+) -> BinaryIO:
+    """
+    Open a gzip file for reading with the fastest available decompressor.
+
+    BGZF files (a series of independent gzip members with block sizes in the
+    header, as written by bgzip/htslib) are inflated block-parallel on a
+    thread pool. Other gzip files cannot be split without inflating them, so
+    they are decompressed serially, optionally by an external process
+    (igzip/pigz) that runs concurrently with parsing.
+
+    Args:
+        filename: Path to a gzip or BGZF file
+        threads: Decompression threads for BGZF input (default: number of CPUs;
+            1 disables parallel decompression)
+        external: External decompressor for plain gzip ('igzip', 'pigz' or 'auto');
+            None uses Python's gzip module
+        buffer_size: Read buffer size in bytes
+
+    Returns:
+        Binary file object over the uncompressed data
+    """
+    if threads != 1 and is_bgzf(filename):
+        return open_bgzf(filename, threads=threads, buffer_size=buffer_size)
+
+    if external:
+        command = find_external_decompressor(external)
+        if command is None:
+            warnings.warn(
+                f"External decompressor '{external}' not found; using Python gzip"
+            )
+        else:
+            if command[0] == "pigz" and threads:
+                command += ["-p", str(threads)]
+            return io.BufferedReader(_ProcessStream(command, open(filename, "rb")), buffer_size)
+
+    source = open(filename, "rb")
+    reader = gzip.GzipFile(fileobj=source, mode="rb")
+    return io.BufferedReader(_SourceStream(reader, source), buffer_size)
+
+
+def require_codec(compression: str):
+    """
+    Return the module implementing an optional codec, or raise ImportError.
+
+    Args:
+        compression: 'zstd' or 'lz4'
+    """
+    module = {"zstd": _zstd, "lz4": _lz4_frame}[compression]
+    if module is None:
+        raise ImportError(
+            f"{compression} support requires an optional dependency "
+            f"(install with: pip install bioconverter[{compression}])"
+        )
+    return module
+
+
+def sniff_compression(filename: str) -> Optional[str]:
+    """
+    Compression of a file, from its leading magic bytes.
+
+    Returns:
+        'gzip', 'zstd', 'lz4', 'bz2', 'xz', 'zip', or None for uncompressed
+        (or unreadable) files
+    """
+    try:
+        with open(filename, "rb") as handle:
+            head = handle.read(6)
+    except (OSError, TypeError):
+        return None
+    for magic, compression in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_input(
+    filename: str,
+    compression: Optional[str],
+    threads: Optional[int] = None,
+    external: Optional[str] = None,
+    buffer_size: int = 1 << 20,
+) -> BinaryIO:
+    """
+    Open a possibly compressed input as a streaming binary file object.
+
+    Args:
+        filename: Input path, or a binary file object (e.g. ``io.BytesIO`` over
+            contents already read into memory) that is decompressed serially
+        compression: None, 'gzip', 'zstd' or 'lz4'
+        threads: Decompression threads for BGZF input (see ``open_gzip``)
+        external: External decompressor for plain gzip (see ``open_gzip``)
+        buffer_size: Read buffer size in bytes
+
+    Returns:
+        Binary file object over the uncompressed data
+    """
+    if not isinstance(filename, (str, os.PathLike)):
+        return _open_file_object(filename, compression)
+    if compression is None:
+        return open(filename, "rb", buffering=buffer_size)
+    if compression == "gzip":
+        return open_gzip(filename, threads=threads, external=external, buffer_size=buffer_size)
+    if compression == "zstd":
+        zstd = require_codec("zstd")
+        source = open(filename, "rb")
+        reader = zstd.ZstdDecompressor().stream_reader(source, read_across_frames=True, closefd=False)
+        return io.BufferedReader(_SourceStream(reader, source), buffer_size)
+    if compression == "lz4":
+        lz4_frame = require_codec("lz4")
+        source = open(filename, "rb")
+        return io.BufferedReader(_SourceStream(lz4_frame.open(source, "rb"), source), buffer_size)
+    raise ValueError(f"Unsupported input compression for streaming: {compression}")
+
+
+def _open_file_object(handle: BinaryIO, compression: Optional[str]) -> BinaryIO:
+    """Decompressing reader over an already open binary file object."""
+    if compression is None:
+        return handle
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=handle, mode="rb")
+    if compression == "zstd":
+        return io.BufferedReader(
+            require_codec("zstd").ZstdDecompressor().stream_reader(
+                handle, read_across_frames=True
+            )
+        )
+    if compression == "lz4":
+        return require_codec("lz4").open(handle, "rb")
+    raise ValueError(f"Unsupported input compression for streaming: {compression}")
+
+
+def compressed_position(stream: BinaryIO) -> Optional[int]:
+    """
+    Bytes of the file on disk consumed so far by a stream from ``open_input``.
+
+    For compressed input this is the compressed offset, so it can be compared
+    with the file size to estimate progress. Read-ahead buffers are counted
+    as consumed.
+
+    Returns:
+        Offset in bytes, or None when unknown (file objects, pipes)
+    """
+    raw = getattr(stream, "raw", stream)
+    try:
+        if hasattr(raw, "compressed_position"):
+            return raw.compressed_position()
+        if isinstance(raw, io.FileIO):
+            return raw.tell()
+    except (OSError, ValueError):
+        pass
+    return None
@@ -0,0 +1,182 @@
+"""
+Derived Statistics Module
+Fills missing association statistics (beta, se, or, z, pval) from the ones present
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .coercion import NEGLOG10_PVAL_COLUMN
+
+# scipy.special (optional) is imported on first use: it takes longer to import
+# than the rest of the package and only p-value/z conversions need it
+_special = None
+_special_loaded = False
+
+
+def _load_special():
+    """scipy.special, or None if scipy is not installed."""
+    global _special, _special_loaded
+    if not _special_loaded:
+        try:
+            from scipy import special as _special
+        except ImportError:  # pragma: no cover - optional dependency
+            _special = None
+        _special_loaded = True
+    return _special
+
+
+DERIVABLE_FIELDS = ["beta", "or", "z", "se", "pval", NEGLOG10_PVAL_COLUMN]
+
+# Fields that are filled when present but never added as new columns
+_FILL_ONLY = {NEGLOG10_PVAL_COLUMN}
+
+_LN10 = np.log(10.0)
+_LN2 = np.log(2.0)
+
+
+def _abs_z_from_p(df: pd.DataFrame) -> np.ndarray:
+    """|z| from a two-sided p-value, using -log10(p) when available to avoid underflow."""
+    if NEGLOG10_PVAL_COLUMN in df.columns:
+        log_half_p = -df[NEGLOG10_PVAL_COLUMN].to_numpy(dtype="float64") * _LN10 - _LN2
+        return -_special.ndtri_exp(log_half_p)
+    return -_special.ndtri(df["pval"].to_numpy(dtype="float64") / 2)
+
+
+def _p_source(df: pd.DataFrame) -> List[str]:
+    return [NEGLOG10_PVAL_COLUMN] if NEGLOG10_PVAL_COLUMN in df.columns else ["pval"]
+
+
+# Each rule: (target, source columns, vectorized formula, needs scipy)
+_RULES: List[Tuple[str, Callable[[pd.DataFrame], List[str]], Callable, bool]] = [
+    ("beta", lambda df: ["or"], lambda df: np.log(df["or"].to_numpy(dtype="float64")), False),
+    ("or", lambda df: ["beta"], lambda df: np.exp(df["beta"].to_numpy(dtype="float64")), False),
+    (
+        "z",
+        lambda df: ["beta", "se"],
+        lambda df: df["beta"].to_numpy(dtype="float64") / df["se"].to_numpy(dtype="float64"),
+        False,
+    ),
+    (
+        "beta",
+        lambda df: ["z", "se"],
+        lambda df: df["z"].to_numpy(dtype="float64") * df["se"].to_numpy(dtype="float64"),
+        False,
+    ),
+    (
+        "se",
+        lambda df: ["beta", "z"],
+        lambda df: np.abs(df["beta"].to_numpy(dtype="float64") / df["z"].to_numpy(dtype="float64")),
+        False,
+    ),
+    (
+        "z",
+        lambda df: ["beta"] + _p_source(df),
+        lambda df: np.sign(df["beta"].to_numpy(dtype="float64")) * _abs_z_from_p(df),
+        True,
+    ),
+    (
+        "se",
+        lambda df: ["beta"] + _p_source(df),
+        lambda df: np.abs(df["beta"].to_numpy(dtype="float64")) / _abs_z_from_p(df),
+        True,
+    ),
+    (
+        NEGLOG10_PVAL_COLUMN,
+        lambda df: ["z"],
+        lambda df: -(_LN2 + _special.log_ndtr(-np.abs(df["z"].to_numpy(dtype="float64")))) / _LN10,
+        True,
+    ),
+    (
+        "pval",
+        lambda df: ["z"],
+        lambda df: 2 * _special.ndtr(-np.abs(df["z"].to_numpy(dtype="float64"))),
+        True,
+    ),
+]
+
+
+def _as_float(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_float_dtype(series.dtype):
+        return series
+    return pd.to_numeric(series, errors="coerce").astype("float64")
+
+
+def derive_statistics(
+    df: pd.DataFrame,
+    fields: Optional[List[str]] = None,
+    max_passes: int = 3,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Fill missing standard statistics from the ones present.
+
+    Rules are chosen by which columns exist, not by their values, so every
+    chunk of a file gets the same output columns. Derived columns are added
+    when absent, and missing values in existing columns are filled.
+
+    Formulas:
+        beta = ln(or), or = exp(beta), z = beta / se, beta = z * se,
+        se = |beta / z|, |z| = Phi^-1(1 - p / 2), p = 2 * Phi(-|z|)
+
+    Args:
+        df: DataFrame with standardized column names
+        fields: Standard fields allowed to be derived (default: DERIVABLE_FIELDS)
+        max_passes: Maximum number of passes over the rules (chained derivations,
+            e.g. or -> beta -> z -> pval, need more than one)
+
+    Returns:
+        Tuple of (DataFrame with derived statistics, {field: values filled})
+    """
+    allowed = set(fields or DERIVABLE_FIELDS)
+    result_df = df.copy(deep=False)
+    filled = {}
+    warned = False
+
+    for col in set(DERIVABLE_FIELDS) & set(result_df.columns):
+        result_df[col] = _as_float(result_df[col])
+
+    for _ in range(max_passes):
+        changed = False
+        for target, sources, formula, needs_scipy in _RULES:
+            if target not in allowed:
+                continue
+            if target in _FILL_ONLY and target not in result_df.columns:
+                continue
+            source_cols = sources(result_df)
+            if target in source_cols or not all(col in result_df.columns for col in source_cols):
+                continue
+            if target in result_df.columns and not result_df[target].isna().any():
+                continue
+            if needs_scipy and _load_special() is None:
+                if not warned:
+                    warnings.warn(
+                        "scipy is not installed; p-value/z conversions are skipped "
+                        "(install with: pip install bioconverter[stats])"
+                    )
+                    warned = True
+                continue
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = formula(result_df)
+            values[~np.isfinite(values)] = np.nan
+
+            if target not in result_df.columns:
+                result_df[target] = values
+                n_filled = int((~np.isnan(values)).sum())
+                changed = True
+            else:
+                current = result_df[target].to_numpy(dtype="float64")
+                fill = np.isnan(current) & ~np.isnan(values)
+                n_filled = int(fill.sum())
+                if n_filled:
+                    result_df[target] = np.where(fill, values, current)
+                    changed = True
+
+            if n_filled:
+                filled[target] = filled.get(target, 0) + n_filled
+        if not changed:
+            break
+
+    return result_df, filled
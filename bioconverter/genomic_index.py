@@ -0,0 +1,532 @@
+"""
+Genomic Index Module
+Coordinate sorting, block indexes and region queries for standardized outputs
+"""
+
+import io
+import json
+import re
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+DEFAULT_BLOCK_ROWS = 65536
+INDEX_SUFFIX = ".idx.json"
+
+_POS_BITS = 40
+_SPECIAL_CHROMOSOMES = {"X": 23, "Y": 24, "XY": 25, "M": 26, "MT": 26}
+_REGION_PATTERN = re.compile(
+    r"^(?P<chr>[^:]+)(?::(?P<start>[0-9.,]+[kKmM]?)?(?:-(?P<end>[0-9.,]+[kKmM]?))?)?$"
+)
+
+
+def normalize_chromosome(name) -> str:
+    """Strip a leading 'chr' prefix so that 'chr6' and '6' compare equal."""
+    name = str(name)
+    return name[3:] if name.lower().startswith("chr") else name
+
+
+def chromosome_sort_key(name) -> Tuple[int, int, str]:
+    """Sort key of a chromosome name in natural order (see ``chromosome_order``)."""
+    norm = normalize_chromosome(name).upper()
+    if norm.isdigit():
+        return (0, int(norm), "")
+    if norm in _SPECIAL_CHROMOSOMES:
+        return (0, _SPECIAL_CHROMOSOMES[norm], "")
+    return (1, 0, norm)
+
+
+def chromosome_order(chromosomes: Iterable) -> Dict[str, int]:
+    """
+    Build a natural chromosome ordering: 1-22, X, Y, XY, MT, then other contigs.
+
+    Args:
+        chromosomes: Chromosome names as they appear in the data
+
+    Returns:
+        Dictionary mapping each chromosome name to its rank
+    """
+    names = sorted({str(c) for c in chromosomes if not pd.isna(c)}, key=chromosome_sort_key)
+    return {name: rank for rank, name in enumerate(names)}
+
+
+def coordinate_keys(
+    df: pd.DataFrame, rank_map: Dict[str, int], chr_col: str = "chr", pos_col: str = "pos"
+) -> np.ndarray:
+    """
+    Pack (chromosome rank, position) into one sortable int64 key per row.
+
+    Rows with a missing chromosome sort last; missing positions sort first
+    within their chromosome.
+    """
+    ranks = (
+        df[chr_col].astype("string").map(rank_map).fillna(len(rank_map)).to_numpy(dtype="int64")
+    )
+    pos = pd.to_numeric(df[pos_col], errors="coerce").fillna(0).to_numpy(dtype="int64")
+    return (ranks << _POS_BITS) + np.clip(pos, 0, (1 << _POS_BITS) - 1)
+
+
+def sort_by_coordinates(
+    df: pd.DataFrame, chr_col: str = "chr", pos_col: str = "pos"
+) -> pd.DataFrame:
+    """
+    Sort a standardized DataFrame by chromosome (natural order) and position.
+
+    Args:
+        df: DataFrame with chromosome and position columns
+        chr_col: Chromosome column name
+        pos_col: Position column name
+
+    Returns:
+        Sorted DataFrame with a fresh RangeIndex
+    """
+    _require_columns(df, chr_col, pos_col)
+    keys = coordinate_keys(df, chromosome_order(df[chr_col].unique()), chr_col, pos_col)
+    order = np.argsort(keys, kind="stable")
+    return df.iloc[order].reset_index(drop=True)
+
+
+def parse_region(region: str) -> Tuple[str, int, Optional[int]]:
+    """
+    Parse a region string such as ``chr6:28M-34M`` or ``6:28,000,000-34,000,000``.
+
+    Positions are 1-based and inclusive; ``k``/``M`` suffixes are accepted.
+
+    Returns:
+        Tuple of (chromosome, start, end); end is None for open-ended regions
+    """
+    match = _REGION_PATTERN.match(region.strip())
+    if not match:
+        raise ValueError(f"Invalid region: {region}")
+
+    def to_int(value, default):
+        if not value:
+            return default
+        value = value.replace(",", "")
+        scale = {"k": 1_000, "m": 1_000_000}.get(value[-1].lower(), 1)
+        if scale != 1:
+            value = value[:-1]
+        return int(float(value) * scale)
+
+    start = to_int(match.group("start"), 1)
+    end = to_int(match.group("end"), None)
+    if end is not None and end < start:
+        raise ValueError(f"Region end is before start: {region}")
+    return match.group("chr"), start, end
+
+
+def read_bed_regions(bed_file: str) -> List[Tuple[str, int, Optional[int]]]:
+    """
+    Read regions from a BED file (0-based, half-open) as 1-based inclusive tuples.
+
+    Header, track and browser lines are skipped.
+    """
+    regions = []
+    with open(bed_file) as f:
+        for line in f:
+            if not line.strip() or line.startswith(("#", "track", "browser")):
+                continue
+            fields = line.split()
+            regions.append((fields[0], int(fields[1]) + 1, int(fields[2])))
+    return regions
+
+
+def region_mask(
+    chroms: pd.Series,
+    positions: pd.Series,
+    regions: List[Tuple[str, int, Optional[int]]],
+) -> np.ndarray:
+    """
+    Flag rows inside any of the given 1-based inclusive regions.
+
+    Args:
+        chroms: Chromosome per row
+        positions: Position per row
+        regions: List of (chromosome, start, end or None)
+
+    Returns:
+        Boolean array
+    """
+    norm = chroms.astype("string").str.replace(r"^(?i:chr)", "", regex=True).to_numpy(dtype=object)
+    pos = pd.to_numeric(positions, errors="coerce").to_numpy(dtype="float64")
+    mask = np.zeros(len(norm), dtype=bool)
+    for chrom, start, end in regions:
+        inside = (norm == normalize_chromosome(chrom)) & (pos >= start)
+        if end is not None:
+            inside &= pos <= end
+        mask |= inside
+    return mask
+
+
+def index_path_for(output_file: str) -> Path:
+    """Return the index sidecar path for an output file."""
+    return Path(f"{output_file}{INDEX_SUFFIX}")
+
+
+def _require_columns(df: pd.DataFrame, chr_col: str, pos_col: str) -> None:
+    missing = [col for col in (chr_col, pos_col) if col not in df.columns]
+    if missing:
+        raise ValueError(f"Coordinate sort requires columns: {missing}")
+
+
+def _block_bounds(chroms: np.ndarray, block_rows: int) -> List[Tuple[int, int]]:
+    """Split sorted rows into blocks that never span two chromosomes."""
+    change = np.flatnonzero(chroms[1:] != chroms[:-1]) + 1
+    edges = np.concatenate(([0], change, [len(chroms)]))
+    bounds = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        for block_start in range(start, stop, block_rows):
+            bounds.append((int(block_start), int(min(block_start + block_rows, stop))))
+    return bounds
+
+
+class IndexedTableWriter:
+    """
+    Writes coordinate-sorted blocks and records a chromosome -> block index.
+
+    Text outputs record byte offsets; Parquet outputs write one row group per
+    block and record row group numbers. The index is saved next to the output
+    as ``<output>.idx.json``.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        output_format: str = "tsv",
+        sep: Optional[str] = None,
+        chr_col: str = "chr",
+        pos_col: str = "pos",
+        block_rows: int = DEFAULT_BLOCK_ROWS,
+        parquet_compression: str = "snappy",
+    ):
+        if output_format not in ("tsv", "csv", "parquet"):
+            raise ValueError(f"Unsupported output format for indexing: {output_format}")
+        self.output_file = str(output_file)
+        self.output_format = output_format
+        self.sep = sep or ("," if output_format == "csv" else "\t")
+        self.chr_col = chr_col
+        self.pos_col = pos_col
+        self.block_rows = block_rows
+        self.parquet_compression = parquet_compression
+        self.columns = None
+        self.blocks = []
+        self._handle = None
+        self._parquet_writer = None
+        self._schema = None
+        self._row_groups = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append a coordinate-sorted DataFrame."""
+        if len(df) == 0 and self.columns is not None:
+            return
+        _require_columns(df, self.chr_col, self.pos_col)
+        if self.columns is None:
+            self.columns = df.columns.tolist()
+            self._open(df)
+
+        chroms = df[self.chr_col].astype("string").fillna("").to_numpy(dtype=object)
+        positions = pd.to_numeric(df[self.pos_col], errors="coerce").to_numpy(dtype="float64")
+
+        for start, stop in _block_bounds(chroms, self.block_rows):
+            block = df.iloc[start:stop]
+            entry = {
+                "chr": chroms[start],
+                "start": _int_or_none(np.nanmin(positions[start:stop])),
+                "end": _int_or_none(np.nanmax(positions[start:stop])),
+                "rows": stop - start,
+            }
+            entry.update(self._write_block(block))
+            self.blocks.append(entry)
+
+    def _open(self, df: pd.DataFrame) -> None:
+        if self.output_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            self._schema = pa.Schema.from_pandas(df, preserve_index=False)
+            self._parquet_writer = pq.ParquetWriter(
+                self.output_file, self._schema, compression=self.parquet_compression
+            )
+        else:
+            self._handle = open(self.output_file, "wb")
+            header = df.iloc[:0].to_csv(sep=self.sep, index=False)
+            self._handle.write(header.encode("utf-8"))
+
+    def _write_block(self, block: pd.DataFrame) -> Dict[str, int]:
+        if self._parquet_writer is not None:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(block, schema=self._schema, preserve_index=False)
+            self._parquet_writer.write_table(table, row_group_size=len(block))
+            self._row_groups += 1
+            return {"row_group": self._row_groups - 1}
+
+        data = block.to_csv(sep=self.sep, index=False, header=False).encode("utf-8")
+        offset = self._handle.tell()
+        self._handle.write(data)
+        return {"offset": offset, "length": len(data)}
+
+    def close(self) -> Dict[str, object]:
+        """Finish the output file and save the index; returns the index."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._handle is not None:
+            self._handle.close()
+
+        index = {
+            "version": 1,
+            "format": self.output_format,
+            "sep": self.sep if self.output_format != "parquet" else None,
+            "columns": self.columns or [],
+            "chr_col": self.chr_col,
+            "pos_col": self.pos_col,
+            "blocks": self.blocks,
+        }
+        with open(index_path_for(self.output_file), "w") as f:
+            json.dump(index, f)
+        return index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _int_or_none(value) -> Optional[int]:
+    return None if np.isnan(value) else int(value)
+
+
+def write_indexed_table(
+    df: pd.DataFrame,
+    output_file: str,
+    output_format: str = "tsv",
+    chr_col: str = "chr",
+    pos_col: str = "pos",
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    presorted: bool = False,
+    parquet_compression: str = "snappy",
+) -> Dict[str, object]:
+    """
+    Sort a DataFrame by coordinates and write it together with a block index.
+
+    Args:
+        df: Standardized DataFrame
+        output_file: Output path
+        output_format: 'tsv', 'csv' or 'parquet' (text output is uncompressed)
+        chr_col: Chromosome column name
+        pos_col: Position column name
+        block_rows: Maximum rows per indexed block
+        presorted: Skip sorting when the DataFrame is already coordinate-sorted
+        parquet_compression: Parquet codec when output_format is 'parquet'
+
+    Returns:
+        The index dictionary that was written
+    """
+    if not presorted:
+        df = sort_by_coordinates(df, chr_col, pos_col)
+    with IndexedTableWriter(
+        output_file,
+        output_format,
+        chr_col=chr_col,
+        pos_col=pos_col,
+        block_rows=block_rows,
+        parquet_compression=parquet_compression,
+    ) as writer:
+        writer.write(df)
+    return json.loads(index_path_for(output_file).read_text())
+
+
+class ExternalCoordinateSorter:
+    """
+    External merge sort for files larger than memory.
+
+    Each added chunk is sorted in memory and spilled to a temporary Parquet
+    run; ``merged()`` then k-way merges the runs in bounded-size batches.
+    """
+
+    def __init__(
+        self,
+        chr_col: str = "chr",
+        pos_col: str = "pos",
+        temp_dir: Optional[str] = None,
+    ):
+        self.chr_col = chr_col
+        self.pos_col = pos_col
+        self._tmp = tempfile.TemporaryDirectory(prefix="bioconverter_sort_", dir=temp_dir)
+        self.runs = []
+        self.chromosomes = set()
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Sort a chunk and spill it to a temporary run file."""
+        if len(df) == 0:
+            return
+        _require_columns(df, self.chr_col, self.pos_col)
+        self.chromosomes.update(df[self.chr_col].dropna().astype(str).unique())
+        run_path = Path(self._tmp.name) / f"run_{len(self.runs):06d}.parquet"
+        sort_by_coordinates(df, self.chr_col, self.pos_col).to_parquet(run_path, index=False)
+        self.runs.append(run_path)
+
+    @property
+    def temp_path(self) -> Path:
+        """Directory holding the run files."""
+        return Path(self._tmp.name)
+
+    def add_run(self, run_path: str, chromosomes: Iterable[str]) -> None:
+        """Register a run sorted elsewhere (e.g. by a worker process) in ``temp_path``."""
+        self.chromosomes.update(chromosomes)
+        self.runs.append(Path(run_path))
+
+    def merged(self, batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Yield the merged, globally sorted rows in batches.
+
+        Args:
+            batch_rows: Approximate total rows held in memory across all runs
+        """
+        import pyarrow.parquet as pq
+
+        if not self.runs:
+            return
+        rank_map = chromosome_order(self.chromosomes)
+        per_run = max(1024, batch_rows // len(self.runs))
+        iterators = [
+            pq.ParquetFile(path).iter_batches(batch_size=per_run) for path in self.runs
+        ]
+        buffers: List[Optional[Tuple[pd.DataFrame, np.ndarray]]] = [None] * len(iterators)
+
+        def refill(i):
+            for batch in iterators[i]:
+                if batch.num_rows:
+                    df = batch.to_pandas()
+                    buffers[i] = (df, coordinate_keys(df, rank_map, self.chr_col, self.pos_col))
+                    return
+            buffers[i] = None
+
+        for i in range(len(iterators)):
+            refill(i)
+
+        while any(buf is not None for buf in buffers):
+            # Everything up to the smallest buffered maximum is final
+            boundary = min(buf[1][-1] for buf in buffers if buf is not None)
+            parts, part_keys = [], []
+            for i, buf in enumerate(buffers):
+                if buf is None:
+                    continue
+                df, keys = buf
+                n = int(np.searchsorted(keys, boundary, side="right"))
+                if n == 0:
+                    continue
+                parts.append(df.iloc[:n])
+                part_keys.append(keys[:n])
+                if n == len(df):
+                    refill(i)
+                else:
+                    buffers[i] = (df.iloc[n:], keys[n:])
+
+            merged = pd.concat(parts, ignore_index=True)
+            order = np.argsort(np.concatenate(part_keys), kind="stable")
+            yield merged.iloc[order].reset_index(drop=True)
+
+    def cleanup(self) -> None:
+        """Remove temporary run files."""
+        self._tmp.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+def load_index(output_file: str, index_file: Optional[str] = None) -> Dict[str, object]:
+    """Load the block index written next to an output file."""
+    path = Path(index_file) if index_file else index_path_for(output_file)
+    if not path.exists():
+        raise FileNotFoundError(f"Index not found: {path}")
+    return json.loads(path.read_text())
+
+
+def query_region(
+    output_file: str,
+    region: str,
+    index_file: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read only the rows of an indexed output that fall inside a region.
+
+    Only the blocks overlapping the region are read from disk.
+
+    Args:
+        output_file: Coordinate-sorted output written with an index
+        region: Region string such as ``chr6:28M-34M``
+        index_file: Index path (default: ``<output_file>.idx.json``)
+
+    Returns:
+        DataFrame with the rows inside the region
+    """
+    return query_regions(output_file, [parse_region(region)], index_file)
+
+
+def query_regions(
+    output_file: str,
+    regions: List[Tuple[str, int, Optional[int]]],
+    index_file: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read the rows of an indexed output that fall inside any of several regions.
+
+    Each overlapping block is read once, even when several regions share it.
+
+    Args:
+        output_file: Coordinate-sorted output written with an index
+        regions: List of (chromosome, 1-based start, inclusive end or None)
+        index_file: Index path (default: ``<output_file>.idx.json``)
+
+    Returns:
+        DataFrame with the rows inside the regions, in file order
+    """
+    index = load_index(output_file, index_file)
+    chr_col, pos_col = index["chr_col"], index["pos_col"]
+
+    def overlaps(block, chrom, start, end):
+        return (
+            normalize_chromosome(block["chr"]) == normalize_chromosome(chrom)
+            and (block["end"] is None or block["end"] >= start)
+            and (end is None or block["start"] is None or block["start"] <= end)
+        )
+
+    blocks = [
+        block
+        for block in index["blocks"]
+        if any(overlaps(block, *region) for region in regions)
+    ]
+    if not blocks:
+        return pd.DataFrame(columns=index["columns"])
+
+    if index["format"] == "parquet":
+        import pyarrow.parquet as pq
+
+        groups = [block["row_group"] for block in blocks]
+        df = pq.ParquetFile(output_file).read_row_groups(groups).to_pandas()
+    else:
+        frames = []
+        with open(output_file, "rb") as f:
+            for block in blocks:
+                f.seek(block["offset"])
+                frames.append(
+                    pd.read_csv(
+                        io.BytesIO(f.read(block["length"])),
+                        sep=index["sep"],
+                        header=None,
+                        names=index["columns"],
+                        dtype={chr_col: str},
+                    )
+                )
+        df = pd.concat(frames, ignore_index=True)
+
+    keep = region_mask(df[chr_col], df[pos_col], regions)
+    return df[keep].reset_index(drop=True)
@@ -4,10 +4,26 @@ Provides interactive column renaming and handles large files efficiently
 """
 
 import pandas as pd
+import io
+import os
 import re
-from typing import Dict, List, Optional, Tuple, Union
+import time
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 import sys
+import warnings
+
+from .coercion import merge_coercion_stats, text_read_dtypes
+from .decompression import STREAM_COMPRESSIONS, compressed_position, open_input, sniff_compression
+from .genomic_index import ExternalCoordinateSorter
+from .manifest import ChunkCheckpoint
+from .mapped_input import MappedInput
+from .parallel_parser import convert_chunk, process_file_parallel, supports_parallel
+from .patterns import create_omics_column_patterns
+from .profiling import HookSpec
+from .stage_timing import StageTimer
+from .writers import open_table_writer
 
 
 def detect_column_types(df: pd.DataFrame, sample_size: int = 1000) -> Dict[str, str]:
@@ -183,7 +199,7 @@ def preview_mapping(
 
 
 def read_in_chunks(
-    filename: str,
+    filename: Union[str, BinaryIO],
     chunksize: int = 100000,
     **read_kwargs
 ) -> pd.io.parsers.TextFileReader:
@@ -191,7 +207,7 @@ def read_in_chunks(
     Read large files in chunks to handle gigabyte-sized data.
     
     Args:
-        filename: Path to file
+        filename: Path to file or open binary file object
         chunksize: Number of rows per chunk
         **read_kwargs: Additional arguments for pd.read_csv
         
@@ -201,14 +217,88 @@ def read_in_chunks(
     return pd.read_csv(filename, chunksize=chunksize, **read_kwargs)
 
 
+def read_line_chunks(
+    handle: BinaryIO,
+    chunksize: int = 100000,
+    start_offset: Optional[int] = None,
+    **read_kwargs
+) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """
+    Read chunks of whole lines from a binary stream, tracking byte offsets.
+
+    Unlike ``read_in_chunks``, the uncompressed byte offset just past every
+    chunk is known exactly, so a conversion can be checkpointed and resumed.
+
+    Args:
+        handle: Binary stream over the uncompressed input
+        chunksize: Number of rows per chunk
+        start_offset: Resume at this byte offset (start of a data line)
+        **read_kwargs: Additional arguments for pd.read_csv
+
+    Yields:
+        (chunk DataFrame, byte offset just past the chunk)
+    """
+    comment = read_kwargs.get("comment")
+    prefix = comment.encode() if comment else None
+    offset = 0
+    header = b""
+    for line in handle:
+        offset += len(line)
+        if prefix and line.startswith(prefix):
+            continue
+        header = line
+        break
+    columns = pd.read_csv(
+        io.BytesIO(header), sep=read_kwargs.get("sep", ","), nrows=0
+    ).columns.tolist()
+
+    if start_offset is not None and start_offset > offset:
+        if handle.seekable():
+            handle.seek(start_offset)
+        else:
+            remaining = start_offset - offset
+            while remaining:
+                skipped = len(handle.read(min(remaining, 1 << 24)))
+                if not skipped:
+                    break
+                remaining -= skipped
+        offset = start_offset
+
+    while True:
+        block = b"".join(islice(handle, chunksize))
+        if not block:
+            return
+        offset += len(block)
+        yield pd.read_csv(io.BytesIO(block), header=None, names=columns, **read_kwargs), offset
+
+
 def process_large_file(
     filename: str,
     output_file: str,
     column_mapping: Dict[str, str],
     chunksize: int = 100000,
     verbose: bool = True,
+    coerce_types: bool = False,
+    derive_stats: bool = False,
+    sort_output: bool = False,
+    write_index: bool = False,
+    temp_dir: Optional[str] = None,
+    output_format: str = "csv",
+    output_compression: Optional[str] = None,
+    index_format: str = "tbi",
+    threads: Optional[int] = None,
+    decompressor: Optional[str] = None,
+    compression_level: Optional[int] = None,
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+    hooks: HookSpec = None,
+    metadata: Optional[Dict[str, object]] = None,
+    variant_key: bool = False,
     **read_kwargs
-) -> None:
+) -> Dict[str, object]:
     """
     Process large files in chunks and write to output incrementally.
     
@@ -218,42 +308,286 @@ def process_large_file(
         column_mapping: Dictionary mapping original to standard column names
         chunksize: Number of rows per chunk
         verbose: Print progress information
+        coerce_types: Coerce standard columns to their expected dtypes
+        derive_stats: Fill missing beta/se/or/z/pval from the statistics present
+        sort_output: Sort output by chr/pos with an external merge sort
+            (chunks are spilled to temporary sorted runs, then merged)
+        write_index: Write an index next to the output; implies sort_output.
+            Uncompressed output gets a chromosome -> byte offset block index
+            (``<output>.idx.json``), bgzip output a tabix ``.tbi``/``.csi`` index
+        temp_dir: Directory for temporary sort runs (default: system temp dir)
+        output_format: Output format ('csv', 'tsv' or 'dataset' for a
+            Hive-partitioned Parquet dataset rooted at output_file)
+        output_compression: Output compression (None, 'gzip', 'bgzip', 'zstd' or 'lz4');
+            gzip/bgzip output is written as BGZF blocks compressed in parallel,
+            zstd output is compressed on multiple threads
+        index_format: Tabix index format for bgzip output ('tbi' or 'csi')
+        threads: Threads for BGZF input decompression and output compression
+            (default: number of CPUs)
+        decompressor: External decompressor for plain gzip input
+            ('igzip', 'pigz' or 'auto'; default: Python gzip)
+        compression_level: Output compression level, lower is faster
+            (default depends on output_compression)
+        partition_cols: Partition columns for 'dataset' output
+        row_group_size: Rows per Parquet row group for 'dataset' output
+        workers: Parse byte ranges of the input in this many processes
+            (uncompressed or BGZF input only; see ``process_file_parallel``)
+        checkpoint: Checkpoint file recording the input byte offset and output
+            size after every chunk. If it exists and matches the input and
+            options, the conversion resumes where it stopped. Unindexed
+            csv/tsv output, plain or gzip/bgzip, only. Removed on completion.
+        timer: Stage timer to record read/map/coerce/derive/sort/write/compress
+            times in (default: a new one); the results are also returned
+        hooks: Profiling hooks or callbacks ``f(event, info)`` notified around
+            the conversion, every stage and every chunk, and of the bytes of
+            input consumed after every chunk (see ``ConversionHook``, ``ProgressHook``)
+        metadata: Constant columns to add to every row {column: value}, e.g.
+            the study a file belongs to
+        variant_key: Add a packed 64-bit ``variant_key`` column (chromosome
+            code, position and allele hash; see ``add_variant_key``)
         **read_kwargs: Additional arguments for reading file
+        
+    Returns:
+        Summary dictionary with rows/chunks processed, coercion/derivation
+        statistics and stage timings (see ``StageTimer.summary``)
     """
-    if verbose:
-        print(f"\nProcessing large file: {filename}")
-        print(f"Chunk size: {chunksize} rows")
-    
-    chunk_iterator = read_in_chunks(filename, chunksize=chunksize, **read_kwargs)
-    
-    first_chunk = True
-    total_rows = 0
-    chunk_num = 0
+    timer = timer or StageTimer()
+    timer.add_hooks(hooks)
+    with timer.conversion(
+        function="process_large_file", input=str(filename), output=str(output_file)
+    ) as outcome:
+        if coerce_types and "dtype" not in read_kwargs:
+            read_kwargs["dtype"] = text_read_dtypes(column_mapping) or None
+
+        # Without an explicit compression, tell it from the file itself, as pandas'
+        # 'infer' would: plain inputs are opened here, compressed ones never read raw
+        if read_kwargs.get("compression") in (None, "infer"):
+            read_kwargs["compression"] = sniff_compression(filename)
+
+        if checkpoint is not None:
+            if (
+                sort_output
+                or write_index
+                or output_format not in ("csv", "tsv")
+                or output_compression not in (None, "gzip", "bgzip")
+                or read_kwargs.get("compression") not in (None,) + STREAM_COMPRESSIONS
+            ):
+                warnings.warn(
+                    "Checkpoints need unsorted csv/tsv output (plain or gzip/bgzip) and "
+                    "uncompressed, gzip, zstd or lz4 input; converting without a checkpoint"
+                )
+                checkpoint = None
+            elif workers and workers > 1:
+                warnings.warn("Checkpointed conversion is sequential; ignoring workers")
+                workers = None
+
+        if workers and workers > 1:
+            if supports_parallel(filename, read_kwargs.get("compression")):
+                summary = process_file_parallel(
+                    filename,
+                    output_file,
+                    column_mapping,
+                    workers=workers,
+                    chunksize=chunksize,
+                    verbose=verbose,
+                    coerce_types=coerce_types,
+                    derive_stats=derive_stats,
+                    sort_output=sort_output,
+                    write_index=write_index,
+                    temp_dir=temp_dir,
+                    output_format=output_format,
+                    output_compression=output_compression,
+                    index_format=index_format,
+                    compression_level=compression_level,
+                    partition_cols=partition_cols,
+                    row_group_size=row_group_size,
+                    threads=threads,
+                    timer=timer,
+                    metadata=metadata,
+                    variant_key=variant_key,
+                    **read_kwargs,
+                )
+                outcome["rows"] = summary["rows_processed"]
+                return summary
+            warnings.warn(
+                "Parallel parsing needs uncompressed or BGZF input; processing sequentially"
+            )
+
+        if verbose:
+            print(f"\nProcessing large file: {filename}")
+            print(f"Chunk size: {chunksize} rows")
+    
+        total_rows = 0
+        chunk_num = 0
+        coercion_stats = {}
+        derivation_stats = {}
+        resume = None
+        if checkpoint is not None:
+            checkpoint = ChunkCheckpoint(
+                checkpoint,
+                filename,
+                options={
+                    "output_file": str(output_file),
+                    "column_mapping": column_mapping,
+                    "chunksize": chunksize,
+                    "coerce_types": coerce_types,
+                    "derive_stats": derive_stats,
+                    "metadata": metadata,
+                    "variant_key": variant_key,
+                    "output_format": output_format,
+                    "output_compression": output_compression,
+                    "read_kwargs": read_kwargs,
+                },
+            )
+            resume = checkpoint.load()
+            if resume is not None and (
+                not os.path.exists(output_file) or os.path.getsize(output_file) < resume["output_size"]
+            ):
+                resume = None
+            if resume is not None:
+                os.truncate(output_file, resume["output_size"])
+                total_rows = resume["rows_processed"]
+                chunk_num = resume["chunks"]
+                coercion_stats = resume.get("coercion_stats") or {}
+                derivation_stats = resume.get("derivation_stats") or {}
+                if verbose:
+                    print(f"Resuming after {total_rows:,} rows (input byte offset {resume['input_offset']:,})")
+    
+        # gzip/zstd/lz4 input is decompressed here (block-parallel for BGZF) rather than by
+        # pandas, and plain input opened (or memory-mapped) here too, so the bytes consumed
+        # can be reported
+        source = None
+        mapped = None
+        memory_map = read_kwargs.pop("memory_map", False)
+        if memory_map and read_kwargs.get("compression") is None and checkpoint is None:
+            mapped = MappedInput(filename)
+            source = mapped.open_range()
+        elif (
+            read_kwargs.get("compression") in STREAM_COMPRESSIONS
+            or checkpoint is not None
+            or read_kwargs.get("compression") is None
+        ):
+            source = open_input(
+                filename, read_kwargs.get("compression"), threads=threads, external=decompressor
+            )
+            read_kwargs["compression"] = None
+    
+        if checkpoint is not None:
+            chunk_iterator = read_line_chunks(
+                source,
+                chunksize=chunksize,
+                start_offset=resume["input_offset"] if resume is not None else None,
+                **read_kwargs,
+            )
+        else:
+            chunk_iterator = (
+                (chunk_df, None)
+                for chunk_df in read_in_chunks(
+                    source if source is not None else filename, chunksize=chunksize, **read_kwargs
+                )
+            )
+    
+        sorter = ExternalCoordinateSorter(temp_dir=temp_dir) if (sort_output or write_index) else None
+        writer = open_table_writer(
+            output_file,
+            output_format=output_format,
+            compression=output_compression,
+            write_index=write_index,
+            index_format=index_format,
+            level=compression_level,
+            threads=threads,
+            partition_cols=partition_cols,
+            row_group_size=row_group_size,
+            append=resume is not None,
+            timer=timer,
+        )
     
-    for chunk_df in chunk_iterator:
-        chunk_num += 1
+        try:
+            chunk_started = time.perf_counter()
+            for chunk_df, input_offset in timer.iterate("read", chunk_iterator):
+                chunk_num += 1
         
-        # Apply column mapping
-        mapped_chunk = pd.DataFrame()
-        for orig_col, std_col in column_mapping.items():
-            if orig_col in chunk_df.columns:
-                mapped_chunk[std_col] = chunk_df[orig_col]
+                # Map, coerce (always keeping -log10 p so every chunk has the same header) and derive
+                mapped_chunk, chunk_stats, chunk_filled = convert_chunk(
+                    chunk_df, column_mapping, coerce_types, derive_stats, timer=timer,
+                    metadata=metadata, variant_key=variant_key,
+                )
+                merge_coercion_stats(coercion_stats, chunk_stats)
+                for field, count in chunk_filled.items():
+                    derivation_stats[field] = derivation_stats.get(field, 0) + count
         
-        # Write to output
-        if first_chunk:
-            mapped_chunk.to_csv(output_file, index=False, mode='w')
-            first_chunk = False
-        else:
-            mapped_chunk.to_csv(output_file, index=False, mode='a', header=False)
+                # Write to output (or spill a sorted run when sorting)
+                if sorter is not None:
+                    with timer.stage("sort"):
+                        sorter.add(mapped_chunk)
+                else:
+                    with timer.stage("write", rows=len(mapped_chunk)):
+                        writer.write(mapped_chunk)
         
-        total_rows += len(chunk_df)
+                total_rows += len(chunk_df)
         
-        if verbose and chunk_num % 10 == 0:
-            print(f"  Processed {total_rows:,} rows...")
-    
-    if verbose:
-        print(f"  Complete! Total rows processed: {total_rows:,}")
-        print(f"  Output saved to: {output_file}")
+                if checkpoint is not None:
+                    with timer.stage("write"):
+                        writer.flush()
+                    checkpoint.save(
+                        input_offset=input_offset,
+                        output_size=os.path.getsize(output_file),
+                        rows_processed=total_rows,
+                        chunks=chunk_num,
+                        coercion_stats=coercion_stats,
+                        derivation_stats=derivation_stats,
+                    )
+        
+                timer.chunk(
+                    index=chunk_num,
+                    rows=len(chunk_df),
+                    latency_s=time.perf_counter() - chunk_started,
+                    input_offset=input_offset,
+                )
+                chunk_started = time.perf_counter()
+                timer.progress(
+                    input=str(filename),
+                    bytes_done=compressed_position(source) if source is not None else None,
+                    rows=total_rows,
+                )
+        
+                if verbose and chunk_num % 10 == 0:
+                    print(f"  Processed {total_rows:,} rows...")
+        finally:
+            if source is not None:
+                source.close()
+            if mapped is not None:
+                mapped.close()
+    
+        if sorter is not None:
+            if verbose:
+                print(f"  Merging {len(sorter.runs)} sorted runs...")
+            with sorter:
+                for batch in timer.iterate("sort", sorter.merged(batch_rows=chunksize)):
+                    with timer.stage("write", rows=len(batch)):
+                        writer.write(batch)
+        with timer.stage("write"):
+            writer.close()
+        if checkpoint is not None:
+            checkpoint.remove()
+        timer.record_input(filename)
+        timer.record_output(output_file)
+    
+        if verbose:
+            print(f"  Complete! Total rows processed: {total_rows:,}")
+            print(f"  Output saved to: {output_file}")
+    
+        summary = {
+            "rows_processed": total_rows,
+            "chunks": chunk_num,
+            "stage_timings": timer.summary(),
+        }
+        if coerce_types:
+            summary["coercion_stats"] = coercion_stats
+        if derive_stats:
+            summary["derivation_stats"] = derivation_stats
+        outcome["rows"] = total_rows
+        return summary
 
 
 def get_file_size_gb(filename: str) -> float:
@@ -289,66 +623,6 @@ def suggest_chunk_size(filename: str, available_memory_gb: float = 4.0) -> int:
         return 50000
 
 
-def create_omics_column_patterns() -> Dict[str, re.Pattern]:
-    """
-    Create comprehensive regex patterns for various omics data types.
-    
-    Returns:
-        Dictionary of field names to regex patterns
-    """
-    patterns = {
-        # Genomics
-        "chr": re.compile(r"^(chr|chromosome|chrom|#?chr|#?chrom|#?CHROM|seqname)$", re.IGNORECASE),
-        "pos": re.compile(r"^(pos|position|bp|base_pair|base_position|ps|POS|start|end)$", re.IGNORECASE),
-        "ref": re.compile(r"^(ref|reference|ref_allele|reference_allele|REF|a2|allele2)$", re.IGNORECASE),
-        "alt": re.compile(r"^(alt|alternate|alt_allele|alternate_allele|ALT|a1|allele1|effect_allele)$", re.IGNORECASE),
-        "rsid": re.compile(r"^(rsid|snp|snpid|snp_id|variant_id|varid|id|ID|marker|rs)$", re.IGNORECASE),
-        "pval": re.compile(r"^(p|pval|p_value|pvalue|p-value|p\.value|sig|pval_nominal|P)$", re.IGNORECASE),
-        "beta": re.compile(r"^(beta|b|effect|coef|coefficient|effect_size|BETA|slope)$", re.IGNORECASE),
-        "se": re.compile(r"^(se|stderr|standard_error|std_err|std_error|SE)$", re.IGNORECASE),
-        "or": re.compile(r"^(or|odds_ratio|oddsratio|OR)$", re.IGNORECASE),
-        "frq": re.compile(r"^(frq|freq|frequency|maf|af|eaf|allele_freq|AF)$", re.IGNORECASE),
-        "n": re.compile(r"^(n|n_samples|sample_size|nsize|ns|n_total|ntotal|N)$", re.IGNORECASE),
-        "info": re.compile(r"^(info|imputation_quality|impquality|r2|rsq|INFO)$", re.IGNORECASE),
-        
-        # Transcriptomics
-        "gene_id": re.compile(r"^(gene_id|geneid|ensembl_id|ensembl|ensg)$", re.IGNORECASE),
-        "gene_name": re.compile(r"^(gene_name|genename|gene_symbol|symbol|gene)$", re.IGNORECASE),
-        "transcript_id": re.compile(r"^(transcript_id|transcriptid|enst)$", re.IGNORECASE),
-        "expression": re.compile(r"^(expression|expr|value)$", re.IGNORECASE),
-        "fpkm": re.compile(r"^(fpkm|rpkm)$", re.IGNORECASE),
-        "tpm": re.compile(r"^(tpm|transcripts_per_million)$", re.IGNORECASE),
-        "counts": re.compile(r"^(counts|read_count|reads)$", re.IGNORECASE),
-        "log2fc": re.compile(r"^(log2fc|log2_fold_change|log2foldchange|lfc)$", re.IGNORECASE),
-        "padj": re.compile(r"^(padj|adj_pval|adjusted_pvalue|fdr|qval|q_value)$", re.IGNORECASE),
-        
-        # Proteomics
-        "protein_id": re.compile(r"^(protein_id|proteinid|uniprot|uniprot_id)$", re.IGNORECASE),
-        "protein_name": re.compile(r"^(protein_name|proteinname|protein)$", re.IGNORECASE),
-        "peptide": re.compile(r"^(peptide|peptide_sequence|sequence)$", re.IGNORECASE),
-        "abundance": re.compile(r"^(abundance|protein_abundance)$", re.IGNORECASE),
-        "intensity": re.compile(r"^(intensity|signal|signal_intensity)$", re.IGNORECASE),
-        "ratio": re.compile(r"^(ratio|fold_change|fc)$", re.IGNORECASE),
-        
-        # Metabolomics
-        "metabolite_id": re.compile(r"^(metabolite_id|metaboliteid|compound_id|hmdb|hmdb_id)$", re.IGNORECASE),
-        "metabolite_name": re.compile(r"^(metabolite_name|metabolite|compound|compound_name)$", re.IGNORECASE),
-        "mz": re.compile(r"^(mz|m/z|mass|mass_to_charge)$", re.IGNORECASE),
-        "rt": re.compile(r"^(rt|retention_time|retentiontime)$", re.IGNORECASE),
-        "concentration": re.compile(r"^(concentration|conc|amount)$", re.IGNORECASE),
-        "peak_area": re.compile(r"^(peak_area|area|peak_intensity)$", re.IGNORECASE),
-        
-        # Sample information
-        "sample_id": re.compile(r"^(sample_id|sampleid|sample|sample_name)$", re.IGNORECASE),
-        "condition": re.compile(r"^(condition|group|treatment|class)$", re.IGNORECASE),
-        "timepoint": re.compile(r"^(timepoint|time|time_point)$", re.IGNORECASE),
-        "replicate": re.compile(r"^(replicate|rep|biological_replicate)$", re.IGNORECASE),
-        "batch": re.compile(r"^(batch|batch_id)$", re.IGNORECASE),
-    }
-    
-    return patterns
-
-
 def auto_detect_omics_type(df: pd.DataFrame) -> str:
     """
     Automatically detect the type of omics data based on column names.
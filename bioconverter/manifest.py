@@ -0,0 +1,230 @@
+"""
+Manifest Module
+Records of converted inputs so interrupted batch runs and chunked conversions can resume
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import xxhash as _xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    _xxhash = None
+
+
+def _content_digest():
+    """Fastest available content hash: xxh3-128 if xxhash is installed, else BLAKE2b."""
+    if _xxhash is not None:
+        return "xxh3", _xxhash.xxh3_128()
+    return "blake2b", hashlib.blake2b(digest_size=16)
+
+
+def file_hash(filename: str, block_size: int = 1 << 20) -> str:
+    """
+    Hash a file's contents, reading it in blocks.
+
+    Uses xxh3-128 when the optional ``xxhash`` package is installed (several
+    GB/s, so hashing is bound by I/O) and BLAKE2b otherwise. The digest is
+    prefixed with the algorithm name, so digests from either never match.
+
+    Args:
+        filename: File path
+        block_size: Bytes read per block
+
+    Returns:
+        Digest string, e.g. ``"xxh3:1f0c..."``
+    """
+    name, digest = _content_digest()
+    with open(filename, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return f"{name}:{digest.hexdigest()}"
+
+
+def data_hash(data: bytes) -> str:
+    """Hash in-memory contents; equal to ``file_hash`` of a file holding them."""
+    name, digest = _content_digest()
+    digest.update(data)
+    return f"{name}:{digest.hexdigest()}"
+
+
+def options_hash(options: Dict[str, object]) -> str:
+    """Stable hash of conversion options (any JSON-serialisable mapping)."""
+    encoded = json.dumps(options, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def file_fingerprint(filename: str) -> Dict[str, int]:
+    """Size and modification time of a file."""
+    stat = os.stat(filename)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class ConversionManifest:
+    """
+    Append-only JSONL log of converted inputs.
+
+    Each line records one attempt: input path, size, mtime, content hash,
+    column mapping, options hash, output path and status ('done' or
+    'failed'). The last line for an input wins. An input is up to date when
+    its last attempt succeeded with the same options and mapping, its output
+    still exists and its contents are unchanged. Size and mtime are checked
+    first; the file is only re-hashed when they differ, so a touched but
+    unchanged file is not converted again.
+
+    Lines are flushed and fsynced as they are written, so a run that dies
+    part way keeps the record of everything it finished.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.records: Dict[str, Dict[str, object]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A run killed mid-write can leave a truncated last line
+                        continue
+                    self.records[record["input"]] = record
+
+    def is_current(
+        self,
+        filename: str,
+        options: Optional[Dict[str, object]] = None,
+        mapping: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """
+        Whether an input's recorded output is up to date.
+
+        Args:
+            filename: Input path
+            options: Conversion options the output must have been made with
+            mapping: Column mapping the output must have been made with
+        """
+        record = self.records.get(str(filename))
+        if record is None or record.get("status") != "done":
+            return False
+        if record.get("options") != options_hash(options or {}):
+            return False
+        if record.get("mapping") != (mapping or None):
+            return False
+        output = record.get("output")
+        if not output or not Path(output).exists():
+            return False
+        try:
+            fingerprint = file_fingerprint(filename)
+        except OSError:
+            return False
+        if fingerprint["size"] != record.get("size"):
+            return False
+        if fingerprint["mtime_ns"] == record.get("mtime_ns"):
+            return True
+        return file_hash(filename) == record.get("hash")
+
+    def record(
+        self,
+        filename: str,
+        status: str,
+        output: Optional[str] = None,
+        options: Optional[Dict[str, object]] = None,
+        mapping: Optional[Dict[str, str]] = None,
+        error: Optional[str] = None,
+    ) -> Dict[str, object]:
+        """
+        Append the outcome of converting one input.
+
+        Args:
+            filename: Input path
+            status: 'done' or 'failed'
+            output: Output path written
+            options: Conversion options used
+            mapping: Column mapping used
+            error: Error message for failed inputs
+
+        Returns:
+            The record written
+        """
+        record = {"input": str(filename), "status": status}
+        try:
+            record.update(file_fingerprint(filename))
+            record["hash"] = file_hash(filename) if status == "done" else None
+        except OSError:
+            pass
+        record.update({
+            "mapping": mapping or None,
+            "options": options_hash(options or {}),
+            "output": str(output) if output is not None else None,
+            "error": error,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, default=str) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.records[record["input"]] = record
+        return record
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class ChunkCheckpoint:
+    """
+    Progress of a chunked conversion, saved after every chunk.
+
+    Records the input fingerprint, the options hash, the uncompressed input
+    byte offset of the next unread line, the output size at that point, and
+    the running totals. On resume the output is truncated back to the saved
+    size and reading continues at the saved offset. The file is replaced
+    atomically on every save and removed when the conversion completes.
+    """
+
+    def __init__(self, path: str, filename: str, options: Optional[Dict[str, object]] = None):
+        self.path = Path(path)
+        self.filename = str(filename)
+        self.options = options_hash(options or {})
+        self.fingerprint = file_fingerprint(filename)
+
+    def load(self) -> Optional[Dict[str, object]]:
+        """Saved state if it belongs to this input and these options, else None."""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if (
+            state.get("input") != self.filename
+            or state.get("options") != self.options
+            or state.get("size") != self.fingerprint["size"]
+            or state.get("mtime_ns") != self.fingerprint["mtime_ns"]
+        ):
+            return None
+        return state
+
+    def save(self, **state) -> None:
+        """Atomically write the current progress."""
+        state.update({"input": self.filename, "options": self.options, **self.fingerprint})
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle, default=str)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        """Delete the checkpoint after a completed conversion."""
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,142 @@
+"""
+Mapped Input Module
+Memory-mapped access to uncompressed inputs, split into newline-aligned byte ranges
+"""
+
+import io
+import mmap
+import os
+import pandas as pd
+from typing import List, Optional, Tuple
+
+
+class _MappedRangeStream(io.RawIOBase):
+    """Raw stream over a byte range of a memory map (no file reads or seeks)."""
+
+    def __init__(self, buffer: memoryview):
+        super().__init__()
+        self._buffer = buffer
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, out) -> int:
+        n = min(len(out), len(self._buffer) - self._pos)
+        out[:n] = self._buffer[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def compressed_position(self) -> int:
+        """Bytes of the range consumed so far."""
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._buffer.release()
+        super().close()
+
+
+class MappedInput:
+    """
+    Read-only memory map of an uncompressed text input.
+
+    Parsers read directly from the mapped pages, so there are no read
+    syscalls and no private copy of the file beyond the page cache. Several
+    readers (threads, or processes that each open their own MappedInput)
+    share the same cached pages while parsing different byte ranges.
+
+    Ranges are aligned to line boundaries. Quoted fields containing newlines
+    are not supported, which holds for summary statistics tables.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = str(filename)
+        self._handle = open(self.filename, "rb")
+        self.size = os.fstat(self._handle.fileno()).st_size
+        self._map = None
+        if self.size:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def _line_end(self, offset: int) -> int:
+        """Offset just past the newline at or after ``offset`` (or the file size)."""
+        if offset >= self.size:
+            return self.size
+        newline = self._map.find(b"\n", offset)
+        return self.size if newline < 0 else newline + 1
+
+    def data_start(self, comment: Optional[str] = None) -> int:
+        """
+        Offset of the first data line, after leading comment lines and the header.
+
+        Args:
+            comment: Comment prefix of lines before the header
+        """
+        offset = 0
+        prefix = comment.encode() if comment else None
+        while prefix and offset < self.size and self._map[offset:offset + len(prefix)] == prefix:
+            offset = self._line_end(offset)
+        return self._line_end(offset)
+
+    def ranges(self, n_ranges: int, start: int = 0) -> List[Tuple[int, int]]:
+        """
+        Split ``[start, size)`` into up to ``n_ranges`` newline-aligned byte ranges.
+
+        Args:
+            n_ranges: Number of ranges wanted
+            start: First byte (usually ``data_start()``)
+
+        Returns:
+            List of (start, end) offsets; every range holds whole lines
+        """
+        if start >= self.size:
+            return []
+        step = max(1, (self.size - start) // max(1, n_ranges))
+        bounds = [start]
+        while bounds[-1] < self.size:
+            end = self._line_end(bounds[-1] + step - 1) if len(bounds) < n_ranges else self.size
+            bounds.append(max(end, bounds[-1] + 1))
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def open_range(self, start: int = 0, end: Optional[int] = None) -> io.BufferedReader:
+        """Open a byte range of the mapping as a binary file object."""
+        end = self.size if end is None else end
+        view = memoryview(self._map)[start:end] if self._map is not None else memoryview(b"")
+        return io.BufferedReader(_MappedRangeStream(view))
+
+    def read_header(self, sep: str = "\t", comment: Optional[str] = None) -> List[str]:
+        """Column names from the header line."""
+        with self.open_range(0, self.data_start(comment)) as handle:
+            return pd.read_csv(handle, sep=sep, comment=comment, nrows=0).columns.tolist()
+
+    def read_range(
+        self, start: int, end: int, columns: List[str], **read_kwargs
+    ) -> pd.DataFrame:
+        """
+        Parse the lines in a byte range.
+
+        Args:
+            start: First byte of the range (start of a line)
+            end: End of the range (just past a newline)
+            columns: Column names (ranges do not include the header)
+            **read_kwargs: Additional arguments for pd.read_csv
+
+        Returns:
+            DataFrame with the rows in the range
+        """
+        with self.open_range(start, end) as handle:
+            return pd.read_csv(handle, header=None, names=columns, **read_kwargs)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
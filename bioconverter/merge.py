@@ -0,0 +1,382 @@
+"""
+Merge Module
+Streams many converted inputs into one harmonised table with a unified schema
+"""
+
+import re
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .coercion import MISSING_TOKENS, NEGLOG10_PVAL_COLUMN, STANDARD_DTYPES, text_read_dtypes
+from .convertor import detect_file_format, match_columns, read_data, read_delimited
+from .dataset import SOURCE_COLUMN, unify_schemas
+from .decompression import STREAM_COMPRESSIONS, compressed_position, open_input
+from .interactive_converter import read_in_chunks
+from .parallel_parser import convert_chunk
+from .profiling import HookSpec
+from .stage_timing import StageTimer
+from .writers import ARROW_COMPRESSIONS, ARROW_FORMATS, open_table_writer
+
+# Output formats a merge can stream into
+MERGE_FORMATS = ("tsv", "csv", "parquet", "dataset", "arrow", "feather")
+
+# Rows read per file to plan the merged schema
+PLAN_SAMPLE_ROWS = 1000
+
+
+def standard_arrow_type(column: str):
+    """Arrow type of a standard column in merged output (None for other columns)."""
+    import pyarrow as pa
+
+    if column == NEGLOG10_PVAL_COLUMN:
+        return pa.float64()
+    kind = STANDARD_DTYPES.get(column)
+    if kind is None:
+        return None
+    return {"string": pa.string(), "int": pa.int64()}.get(kind, pa.float64())
+
+
+def resolve_column_mapping(
+    columns: List[str],
+    column_mapping: Optional[Dict[str, str]] = None,
+    custom_patterns: Optional[Dict[str, re.Pattern]] = None,
+    keep_unmatched: bool = True,
+) -> Dict[str, str]:
+    """
+    Output name of every input column kept, as ``standardize_columns`` names them.
+
+    Manual mappings come first; other columns are matched to standard names,
+    keeping their own name when the standard name is already taken, and
+    unmatched columns are kept under their own name if ``keep_unmatched``.
+
+    Returns:
+        Dictionary of input column -> output column, in output order
+    """
+    resolved = {}
+    for original_col, std_col in (column_mapping or {}).items():
+        if original_col in columns:
+            resolved[original_col] = std_col
+    remaining = [col for col in columns if col not in (column_mapping or {})]
+    if remaining:
+        for original_col, std_col in match_columns(remaining, custom_patterns).items():
+            if std_col is not None:
+                taken = std_col in resolved.values()
+                resolved[original_col] = original_col if taken else std_col
+            elif keep_unmatched:
+                resolved[original_col] = original_col
+    return resolved
+
+
+def conform_frame(df: pd.DataFrame, schema, source: str = "") -> pd.DataFrame:
+    """
+    Reshape converted rows to the merged schema.
+
+    Columns are put in schema order, missing columns become typed nulls and
+    extra columns are dropped. Numeric columns read as text are parsed;
+    missing-value tokens ('NA', '.', ...) become nulls. Text that is not a
+    number becomes a null in standard columns, with a warning, and is an
+    error in other columns, whose type was only inferred from a sample.
+    Integer columns use the nullable ``Int64`` dtype, so missing values do
+    not turn them into floats.
+
+    Args:
+        df: Converted rows of one input
+        schema: pyarrow.Schema of the merged output
+        source: Input file, for error messages
+
+    Raises:
+        ValueError: If a non-standard numeric column has text values, or an
+            integer column has fractional values
+    """
+    import pyarrow as pa
+
+    columns = {}
+    for field in schema:
+        if pa.types.is_integer(field.type):
+            dtype = "Int64"
+        elif pa.types.is_floating(field.type):
+            dtype = "float64"
+        elif pa.types.is_string(field.type):
+            dtype = "string"
+        else:
+            dtype = None
+        if field.name not in df.columns:
+            columns[field.name] = pd.Series(None, index=df.index, dtype=dtype or object)
+            continue
+        values = df[field.name]
+        if dtype in ("Int64", "float64") and not pd.api.types.is_numeric_dtype(values.dtype):
+            text = values.astype("string").str.strip()
+            missing = text.isna() | text.isin(MISSING_TOKENS)
+            values = pd.to_numeric(text.mask(missing), errors="coerce")
+            invalid = values.isna() & ~missing
+            if invalid.any():
+                example = text[invalid].iloc[0]
+                if standard_arrow_type(field.name) is None:
+                    raise ValueError(
+                        f"{source}: column '{field.name}' has non-numeric values (e.g. "
+                        f"{example!r}) but was planned as {field.type} from the first rows "
+                        "of the inputs; raise sample_rows to plan it from more rows"
+                    )
+                warnings.warn(
+                    f"{source}: {int(invalid.sum())} non-numeric values of '{field.name}' "
+                    f"(e.g. {example!r}) written as nulls"
+                )
+        if dtype == "Int64" and pd.api.types.is_float_dtype(values.dtype):
+            numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+            finite = numbers[~np.isnan(numbers)]
+            if not np.array_equal(finite, np.trunc(finite)):
+                raise ValueError(
+                    f"{source}: column '{field.name}' has fractional values but is an "
+                    "integer column in the merged schema"
+                )
+        columns[field.name] = values.astype(dtype) if dtype else values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def plan_merge(
+    file_list: List[str],
+    column_mapping: Optional[Dict[str, str]] = None,
+    custom_patterns: Optional[Dict[str, re.Pattern]] = None,
+    keep_unmatched: bool = True,
+    coerce_types: bool = False,
+    derive_stats: bool = False,
+    metadata: Optional[Dict[str, Dict[str, object]]] = None,
+    source_column: Optional[str] = SOURCE_COLUMN,
+    variant_key: bool = False,
+    sample_rows: int = PLAN_SAMPLE_ROWS,
+):
+    """
+    Work out how each input is read and converted, and the merged schema.
+
+    The first ``sample_rows`` rows of every input are converted to find its
+    output columns. The merged schema is their union, in first-seen order:
+    standard columns get their standard type (chr and alleles as strings,
+    pos and n as integers, statistics as floats), whatever each input's
+    text looked like; other columns (unmatched, metadata) get the type
+    their samples agree on, widened or made strings where they differ.
+
+    Args:
+        file_list: Input files
+        metadata: Constant columns per input {file: {column: value}}
+        source_column: Column recording each row's input file name (None to omit)
+        Other arguments: as for ``merge_files``
+
+    Returns:
+        Tuple of (list of per-input plans, pyarrow.Schema)
+    """
+    import pyarrow as pa
+
+    plans = []
+    samples = []
+    for filename in file_list:
+        sep, compression, comment, is_vcf = detect_file_format(filename)
+        if is_vcf:
+            raw = read_data(filename, compression=compression, is_vcf=True).head(sample_rows)
+        else:
+            raw = read_delimited(
+                filename, compression=compression, sep=sep, comment=comment, nrows=sample_rows
+            )
+        mapping = resolve_column_mapping(
+            raw.columns.tolist(), column_mapping, custom_patterns, keep_unmatched
+        )
+        constants = dict((metadata or {}).get(filename) or {})
+        if source_column:
+            constants[source_column] = Path(filename).name
+        sample, _, _ = convert_chunk(
+            raw, mapping, coerce_types, derive_stats, metadata=constants, variant_key=variant_key
+        )
+        plans.append({
+            "file": filename,
+            "sep": sep,
+            "compression": compression,
+            "comment": comment,
+            "is_vcf": is_vcf,
+            "column_mapping": mapping,
+            "metadata": constants,
+        })
+        samples.append(sample)
+
+    inferred = unify_schemas(samples) if samples else pa.schema([])
+    fields = []
+    for field in inferred:
+        arrow_type = standard_arrow_type(field.name)
+        if arrow_type is None:
+            arrow_type = field.type
+            if pa.types.is_null(arrow_type) or pa.types.is_large_string(arrow_type):
+                arrow_type = pa.string()
+        fields.append(pa.field(field.name, arrow_type))
+    return plans, pa.schema(fields)
+
+
+def _iter_chunks(plan: Dict[str, object], chunksize: int, coerce_types: bool, threads: Optional[int]):
+    """Yield (raw chunk, input stream or None) for one input."""
+    if plan["is_vcf"]:
+        # VCF records are parsed whole
+        yield read_data(plan["file"], compression=plan["compression"], is_vcf=True), None
+        return
+    read_kwargs = {"sep": plan["sep"], "compression": plan["compression"]}
+    if plan["comment"]:
+        read_kwargs["comment"] = plan["comment"]
+    if coerce_types:
+        read_kwargs["dtype"] = text_read_dtypes(plan["column_mapping"]) or None
+    source = None
+    if plan["compression"] in STREAM_COMPRESSIONS or plan["compression"] is None:
+        source = open_input(plan["file"], plan["compression"], threads=threads)
+        read_kwargs["compression"] = None
+    try:
+        for chunk_df in read_in_chunks(source if source is not None else plan["file"], chunksize, **read_kwargs):
+            yield chunk_df, source
+    finally:
+        if source is not None:
+            source.close()
+
+
+def merge_files(
+    file_list: List[str],
+    output_file: str,
+    output_format: str = "parquet",
+    compression: Optional[str] = None,
+    column_mapping: Optional[Dict[str, str]] = None,
+    custom_patterns: Optional[Dict[str, re.Pattern]] = None,
+    keep_unmatched: bool = True,
+    coerce_types: bool = False,
+    derive_stats: bool = False,
+    metadata: Optional[Dict[str, Dict[str, object]]] = None,
+    source_column: Optional[str] = SOURCE_COLUMN,
+    variant_key: bool = False,
+    sample_rows: int = PLAN_SAMPLE_ROWS,
+    chunksize: int = 100000,
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: Optional[int] = None,
+    compression_level: Optional[int] = None,
+    threads: Optional[int] = None,
+    verbose: bool = True,
+    hooks: HookSpec = None,
+) -> Dict[str, object]:
+    """
+    Convert many inputs into one harmonised table, streaming chunk by chunk.
+
+    Unlike ``pd.concat`` over the results of ``convert_multiple_files``, no
+    input is held in memory whole: every input is read, converted and
+    appended in chunks of ``chunksize`` rows (VCF inputs one file at a
+    time), so memory is bounded by one chunk rather than by the sum of the
+    inputs. The schema is planned up front from a sample of every input
+    (see ``plan_merge``): the union of all output columns, with columns an
+    input lacks written as typed nulls.
+
+    Args:
+        file_list: Input files, merged in this order
+        output_file: Output file (dataset root directory for 'dataset')
+        output_format: 'parquet', 'dataset', 'arrow'/'feather', 'tsv' or 'csv'
+        compression: Text: None, 'gzip', 'bgzip', 'zstd' or 'lz4'; Parquet and
+            datasets: a Parquet codec (default snappy); Arrow: None, 'lz4' or 'zstd'
+        column_mapping: Manual mapping {original column: standard column},
+            applied to every input before pattern matching
+        custom_patterns: Custom regex patterns for standard fields
+        keep_unmatched: Keep columns that match no standard field
+        coerce_types: Coerce standard columns to their expected types
+        derive_stats: Fill missing beta/se/or/z/pval from the statistics present
+        metadata: Constant columns per input {file: {column: value}}, e.g.
+            the columns of a ``convert_from_metadata`` table
+        source_column: Column recording each row's input file name (None to omit)
+        variant_key: Add a packed 64-bit ``variant_key`` column (see
+            ``add_variant_key``), comparable across all merged inputs
+        sample_rows: Rows per input the schema is planned from
+        chunksize: Rows per chunk
+        partition_cols: Partition columns for 'dataset' output
+        row_group_size: Rows per Parquet row group
+        compression_level: Text output compression level
+        threads: Threads for input decompression and output compression
+        verbose: Print progress per input
+        hooks: Profiling or progress hooks, notified around the merge, every
+            stage and chunk, and of the bytes of each input consumed
+
+    Returns:
+        Summary dictionary with the output, total rows, rows per input, the
+        merged columns and stage timings
+    """
+    if output_format not in MERGE_FORMATS:
+        raise ValueError(f"Unsupported merge output format: {output_format}")
+    if output_format in ARROW_FORMATS and compression not in (None,) + ARROW_COMPRESSIONS:
+        compression = None
+
+    timer = StageTimer(hooks)
+    with timer.conversion(
+        function="merge_files", inputs=[str(f) for f in file_list], output=str(output_file)
+    ) as outcome:
+        with timer.stage("sniff"):
+            plans, schema = plan_merge(
+                file_list,
+                column_mapping=column_mapping,
+                custom_patterns=custom_patterns,
+                keep_unmatched=keep_unmatched,
+                coerce_types=coerce_types,
+                derive_stats=derive_stats,
+                metadata=metadata,
+                source_column=source_column,
+                variant_key=variant_key,
+                sample_rows=sample_rows,
+            )
+        if verbose:
+            print(f"Merging {len(plans)} files into {output_file} ({len(schema)} columns)")
+
+        writer = open_table_writer(
+            output_file,
+            output_format=output_format,
+            compression=compression,
+            level=compression_level,
+            threads=threads,
+            partition_cols=partition_cols,
+            row_group_size=row_group_size,
+            timer=timer,
+            schema=schema,
+        )
+        rows_per_file = {}
+        total_rows = 0
+        with writer:
+            for plan in plans:
+                rows = 0
+                for chunk_df, source in timer.iterate(
+                    "read", _iter_chunks(plan, chunksize, coerce_types, threads)
+                ):
+                    converted, _, _ = convert_chunk(
+                        chunk_df,
+                        plan["column_mapping"],
+                        coerce_types,
+                        derive_stats,
+                        timer=timer,
+                        metadata=plan["metadata"],
+                        variant_key=variant_key,
+                    )
+                    with timer.stage("map", rows=len(converted)):
+                        converted = conform_frame(converted, schema, source=plan["file"])
+                    with timer.stage("write", rows=len(converted)):
+                        writer.write(converted)
+                    rows += len(converted)
+                    timer.progress(
+                        input=plan["file"],
+                        bytes_done=compressed_position(source) if source is not None else None,
+                        rows=rows,
+                    )
+                timer.record_input(plan["file"])
+                timer.progress(input=plan["file"], rows=rows, done=True)
+                rows_per_file[plan["file"]] = rows
+                total_rows += rows
+                if verbose:
+                    print(f"  {plan['file']}: {rows:,} rows")
+        timer.record_output(output_file)
+        outcome["rows"] = total_rows
+
+    if verbose:
+        print(f"Merged {total_rows:,} rows into {output_file}")
+    return {
+        "output": str(output_file),
+        "rows": total_rows,
+        "files": rows_per_file,
+        "columns": schema.names,
+        "stages": timer.summary(),
+    }
@@ -0,0 +1,586 @@
+"""
+Parallel Parsing Module
+Byte-range parallel conversion of a single large uncompressed or BGZF input
+"""
+
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .bgzf import BGZF_EOF, BgzfReader, bgzf_block_offsets, is_bgzf, open_bgzf
+from .coercion import coerce_standard_columns, merge_coercion_stats
+from .decompression import compressed_position
+from .derivation import derive_statistics
+from .genomic_index import ExternalCoordinateSorter, sort_by_coordinates
+from .mapped_input import MappedInput
+from .stage_timing import StageTimer, peak_rss_mb
+from .variants import add_variant_key
+from .writers import ARROW_FORMATS, open_table_writer
+
+# Output formats whose parts can be joined by concatenating bytes
+_CONCATENABLE_FORMATS = ("csv", "tsv")
+
+# Seconds between progress reports while workers run
+PROGRESS_INTERVAL = 0.25
+
+# Shared (bytes consumed, rows converted) per range, set in each worker process
+_range_progress = None
+
+
+def _init_worker(progress) -> None:
+    global _range_progress
+    _range_progress = progress
+
+
+def convert_chunk(
+    chunk_df: pd.DataFrame,
+    column_mapping: Dict[str, str],
+    coerce_types: bool = False,
+    derive_stats: bool = False,
+    timer: Optional[StageTimer] = None,
+    metadata: Optional[Dict[str, object]] = None,
+    variant_key: bool = False,
+) -> Tuple[pd.DataFrame, Dict[str, Dict], Dict[str, int]]:
+    """
+    Map, coerce and derive one chunk of raw rows.
+
+    Args:
+        chunk_df: Raw rows with the input's column names
+        column_mapping: Dictionary mapping original to standard column names
+        coerce_types: Coerce standard columns (always keeping -log10 p so every
+            chunk has the same columns)
+        derive_stats: Fill missing beta/se/or/z/pval from the statistics present
+        timer: Record the map/coerce/derive/key stages here
+        metadata: Constant columns to add to every row {column: value}
+        variant_key: Add a packed 64-bit variant key column (see add_variant_key)
+
+    Returns:
+        Tuple of (converted chunk, coercion statistics, derived value counts)
+    """
+    timer = timer or StageTimer()
+    rows = len(chunk_df)
+    with timer.stage("map", rows=rows):
+        mapped_chunk = pd.DataFrame()
+        for orig_col, std_col in column_mapping.items():
+            if orig_col in chunk_df.columns:
+                mapped_chunk[std_col] = chunk_df[orig_col]
+
+    coercion_stats = {}
+    if coerce_types:
+        with timer.stage("coerce", rows=rows):
+            mapped_chunk, coercion_stats = coerce_standard_columns(mapped_chunk, keep_neglog10=True)
+
+    filled = {}
+    if derive_stats:
+        with timer.stage("derive", rows=rows):
+            mapped_chunk, filled = derive_statistics(mapped_chunk)
+
+    if variant_key:
+        with timer.stage("key", rows=rows):
+            mapped_chunk = add_variant_key(mapped_chunk)
+
+    for column, value in (metadata or {}).items():
+        mapped_chunk[column] = value
+
+    return mapped_chunk, coercion_stats, filled
+
+
+def supports_parallel(filename: str, compression: Optional[str]) -> bool:
+    """Whether an input can be split into byte ranges (uncompressed or BGZF)."""
+    if compression is None:
+        return True
+    return compression == "gzip" and is_bgzf(filename)
+
+
+class _IteratorStream(io.RawIOBase):
+    """Raw stream over an iterator of byte strings."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        super().__init__()
+        self._chunks = chunks
+        self._current = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not len(self._current):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._current = memoryview(chunk)
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+
+def _bgzf_range_lines(
+    filename: str,
+    block_offsets: List[int],
+    first: int,
+    last: int,
+    skip_bytes: int = 0,
+    consumed: Optional[List[int]] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the lines that start in blocks ``[first, last)`` of a BGZF file.
+
+    A line belongs to the range its first byte falls in: a partial line at the
+    start is left to the previous range and the last line is completed from
+    the following blocks. ``consumed[0]``, if given, is kept at the
+    compressed bytes of the range read so far.
+    """
+    with BgzfReader(filename) as reader:
+        in_partial_line = False
+        if first > 0:
+            previous, _ = reader.read_block(block_offsets[first - 1])
+            in_partial_line = bool(previous) and not previous.endswith(b"\n")
+
+        ends_with_newline = True
+        for i in range(first, last):
+            data, end = reader.read_block(block_offsets[i])
+            if consumed is not None:
+                consumed[0] = end - block_offsets[first]
+            if skip_bytes:
+                dropped = min(skip_bytes, len(data))
+                data, skip_bytes = data[dropped:], skip_bytes - dropped
+            if in_partial_line:
+                newline = data.find(b"\n")
+                if newline < 0:
+                    continue
+                data, in_partial_line = data[newline + 1:], False
+            if data:
+                ends_with_newline = data.endswith(b"\n")
+                yield data
+
+        for i in range(last, len(block_offsets)):
+            if ends_with_newline or in_partial_line:
+                break
+            data, _ = reader.read_block(block_offsets[i])
+            newline = data.find(b"\n")
+            if newline >= 0:
+                yield data[:newline + 1]
+                break
+            if data:
+                yield data
+
+
+def _convert_range(task: Dict[str, object]) -> Dict[str, object]:
+    """Worker: parse, convert and write the rows of one byte range."""
+    summary = {
+        "rows": 0,
+        "chunks": 0,
+        "coercion_stats": {},
+        "derivation_stats": {},
+        "columns": None,
+        "runs": [],
+        "chromosomes": set(),
+        "stage_timings": {},
+        "chunk_events": [],
+    }
+    timer = StageTimer()
+
+    mapped_input = None
+    consumed = [0]
+    if task["kind"] == "mmap":
+        mapped_input = MappedInput(task["filename"])
+        stream = mapped_input.open_range(task["start"], task["end"])
+    else:
+        stream = io.BufferedReader(
+            _IteratorStream(
+                _bgzf_range_lines(
+                    task["filename"],
+                    task["block_offsets"],
+                    task["start"],
+                    task["end"],
+                    task["skip_bytes"],
+                    consumed,
+                )
+            ),
+            1 << 20,
+        )
+
+    writer = None
+    try:
+        try:
+            chunks = pd.read_csv(
+                stream,
+                header=None,
+                names=task["columns"],
+                chunksize=task["chunksize"],
+                **task["read_kwargs"],
+            )
+        except pd.errors.EmptyDataError:
+            return summary
+
+        chunk_started = time.perf_counter()
+        for chunk_df in timer.iterate("read", chunks):
+            mapped_chunk, chunk_stats, chunk_filled = convert_chunk(
+                chunk_df,
+                task["column_mapping"],
+                task["coerce_types"],
+                task["derive_stats"],
+                timer=timer,
+                metadata=task["metadata"],
+                variant_key=task["variant_key"],
+            )
+            merge_coercion_stats(summary["coercion_stats"], chunk_stats)
+            for field, count in chunk_filled.items():
+                summary["derivation_stats"][field] = summary["derivation_stats"].get(field, 0) + count
+            if summary["columns"] is None:
+                summary["columns"] = mapped_chunk.columns.tolist()
+
+            if task["run_dir"]:
+                run_path = Path(task["run_dir"]) / (
+                    f"run_{task['index']:05d}_{summary['chunks']:06d}.parquet"
+                )
+                # Rows are counted once, when the runs are merged
+                with timer.stage("sort"):
+                    sort_by_coordinates(mapped_chunk).to_parquet(run_path, index=False)
+                summary["runs"].append(str(run_path))
+                summary["chromosomes"].update(mapped_chunk["chr"].dropna().astype(str).unique())
+            else:
+                if writer is None:
+                    writer = open_table_writer(
+                        task["part_file"], threads=1, timer=timer, **task["writer_kwargs"]
+                    )
+                with timer.stage("write", rows=len(mapped_chunk)):
+                    writer.write(mapped_chunk)
+
+            summary["rows"] += len(chunk_df)
+            summary["chunks"] += 1
+            summary["chunk_events"].append({
+                "index": summary["chunks"],
+                "rows": len(chunk_df),
+                "latency_s": time.perf_counter() - chunk_started,
+                "peak_rss_mb": peak_rss_mb(),
+                "range": task["index"],
+            })
+            chunk_started = time.perf_counter()
+            if _range_progress is not None:
+                position = compressed_position(stream) if mapped_input is not None else consumed[0]
+                _range_progress[2 * task["index"]] = position or 0
+                _range_progress[2 * task["index"] + 1] = summary["rows"]
+    finally:
+        if writer is not None:
+            with timer.stage("write"):
+                writer.close()
+        stream.close()
+        if mapped_input is not None:
+            mapped_input.close()
+        summary["stage_timings"] = timer.stages
+    return summary
+
+
+def _part_path(output_file: str, index: int) -> Path:
+    """``out.tsv.gz`` -> ``out.part-00003.tsv.gz``."""
+    path = Path(output_file)
+    stem, _, suffixes = path.name.partition(".")
+    name = f"{stem}.part-{index:05d}" + (f".{suffixes}" if suffixes else "")
+    return path.with_name(name)
+
+
+def _bgzf_header_offset(filename: str, comment: Optional[str]) -> Tuple[int, bytes]:
+    """Uncompressed offset of the first data line and the header line of a BGZF file."""
+    prefix = comment.encode() if comment else None
+    offset = 0
+    with open_bgzf(filename, threads=1) as handle:
+        for line in handle:
+            offset += len(line)
+            if prefix and line.startswith(prefix):
+                continue
+            return offset, line
+    return offset, b""
+
+
+def _concatenate(parts: List[Path], output_file: str, strip_bgzf_eof: bool) -> None:
+    """Join part files byte-wise; BGZF EOF markers are kept only at the end."""
+    with open(output_file, "wb") as out:
+        for i, part in enumerate(parts):
+            size = part.stat().st_size
+            if strip_bgzf_eof and i < len(parts) - 1 and size >= len(BGZF_EOF):
+                with open(part, "rb") as handle:
+                    handle.seek(size - len(BGZF_EOF))
+                    if handle.read() == BGZF_EOF:
+                        size -= len(BGZF_EOF)
+            with open(part, "rb") as handle:
+                remaining = size
+                while remaining:
+                    data = handle.read(min(remaining, 1 << 24))
+                    if not data:
+                        break
+                    out.write(data)
+                    remaining -= len(data)
+
+
+def process_file_parallel(
+    filename: str,
+    output_file: str,
+    column_mapping: Dict[str, str],
+    workers: Optional[int] = None,
+    chunksize: int = 100000,
+    verbose: bool = True,
+    coerce_types: bool = False,
+    derive_stats: bool = False,
+    sort_output: bool = False,
+    write_index: bool = False,
+    temp_dir: Optional[str] = None,
+    output_format: str = "csv",
+    output_compression: Optional[str] = None,
+    index_format: str = "tbi",
+    compression_level: Optional[int] = None,
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: Optional[int] = None,
+    merge_parts: bool = True,
+    threads: Optional[int] = None,
+    timer: Optional[StageTimer] = None,
+    metadata: Optional[Dict[str, object]] = None,
+    variant_key: bool = False,
+    **read_kwargs,
+) -> Dict[str, object]:
+    """
+    Convert one large file by parsing newline-aligned byte ranges in parallel processes.
+
+    Uncompressed inputs are split on the memory-mapped file; BGZF inputs are
+    split on block boundaries and each worker inflates only its own blocks.
+    Every worker parses, maps, coerces and formats its range in chunks:
+
+    - text output: each worker writes an ordered part, and the parts are
+      concatenated (or kept as ``<output>.part-NNNNN.<ext>`` with
+      ``merge_parts=False``)
+    - dataset output: workers write directly into the dataset
+    - Arrow and Parquet output: parts are streamed into one file in order
+    - sorted/indexed output: workers spill sorted runs that are merged here
+
+    Args:
+        filename: Input file (uncompressed or BGZF)
+        output_file: Output file path (dataset root for 'dataset')
+        column_mapping: Dictionary mapping original to standard column names
+        workers: Worker processes (default: number of CPUs)
+        chunksize: Rows per chunk within each worker
+        merge_parts: Join the parts into ``output_file``; False keeps the parts
+        threads: Compression threads for output written here (merged
+            Arrow/sorted output); workers compress single-threaded
+        timer: Stage timer to add to; worker stage times are summed, so
+            they are worker-seconds rather than elapsed time. Its hooks get
+            the workers' combined progress every ``PROGRESS_INTERVAL`` seconds
+        metadata: Constant columns to add to every row {column: value}
+        Other arguments: as for ``process_large_file``
+
+    Returns:
+        Summary dictionary with rows/chunks processed, worker count,
+        coercion/derivation statistics and stage timings
+    """
+    timer = timer or StageTimer()
+    workers = workers or os.cpu_count() or 1
+    compression = read_kwargs.pop("compression", None)
+    read_kwargs.pop("memory_map", None)
+    sep = read_kwargs.get("sep", ",")
+    comment = read_kwargs.get("comment")
+    sorting = sort_output or write_index
+
+    tasks = []
+    if compression is None:
+        with MappedInput(filename) as mapped_input:
+            columns = mapped_input.read_header(sep=sep, comment=comment)
+            ranges = mapped_input.ranges(workers, mapped_input.data_start(comment))
+        for start, end in ranges:
+            tasks.append({"kind": "mmap", "start": start, "end": end})
+    elif supports_parallel(filename, compression):
+        block_offsets = bgzf_block_offsets(filename)
+        skip_bytes, header_line = _bgzf_header_offset(filename, comment)
+        columns = pd.read_csv(io.BytesIO(header_line), sep=sep, nrows=0).columns.tolist()
+        step = max(1, -(-len(block_offsets) // workers))
+        for first in range(0, len(block_offsets), step):
+            tasks.append({
+                "kind": "bgzf",
+                "block_offsets": block_offsets,
+                "start": first,
+                "end": min(first + step, len(block_offsets)),
+                "skip_bytes": skip_bytes if first == 0 else 0,
+            })
+    else:
+        raise ValueError("Parallel parsing requires uncompressed or BGZF input")
+
+    if verbose:
+        print(f"\nProcessing large file in parallel: {filename}")
+        print(f"  {len(tasks)} byte ranges on {workers} worker processes")
+
+    concatenate = output_format in _CONCATENABLE_FORMATS and merge_parts and not sorting
+    sorter = ExternalCoordinateSorter(temp_dir=temp_dir) if sorting else None
+    part_tmp = (
+        tempfile.TemporaryDirectory(prefix="bioconverter_parts_", dir=temp_dir)
+        if merge_parts and not sorting and output_format != "dataset"
+        else None
+    )
+    writer_kwargs = {
+        "output_format": output_format,
+        "compression": output_compression,
+        "level": compression_level,
+        "partition_cols": partition_cols,
+        "row_group_size": row_group_size,
+        "header": not concatenate,
+    }
+
+    for i, task in enumerate(tasks):
+        if output_format == "dataset":
+            part_file = output_file
+        elif part_tmp is not None:
+            part_file = Path(part_tmp.name) / _part_path(output_file, i).name
+        else:
+            part_file = _part_path(output_file, i)
+        task.update({
+            "index": i,
+            "filename": str(filename),
+            "columns": columns,
+            "read_kwargs": read_kwargs,
+            "chunksize": chunksize,
+            "column_mapping": column_mapping,
+            "coerce_types": coerce_types,
+            "derive_stats": derive_stats,
+            "metadata": metadata,
+            "variant_key": variant_key,
+            "run_dir": str(sorter.temp_path) if sorter is not None else None,
+            "part_file": str(part_file),
+            "writer_kwargs": writer_kwargs,
+        })
+
+    # Bytes before the first range (the header) count as consumed from the start
+    progress_base = tasks[0]["start"] if tasks and tasks[0]["kind"] == "mmap" else 0
+    progress = multiprocessing.Array("q", 2 * len(tasks), lock=False)
+    with ProcessPoolExecutor(
+        max_workers=min(workers, max(1, len(tasks))),
+        initializer=_init_worker,
+        initargs=(progress,),
+    ) as executor:
+        futures = [executor.submit(_convert_range, task) for task in tasks]
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=PROGRESS_INTERVAL if timer.hooks else None)
+            timer.progress(
+                input=str(filename),
+                bytes_done=progress_base + sum(progress[0::2]),
+                rows=sum(progress[1::2]),
+            )
+        results = [future.result() for future in futures]
+
+    coercion_stats = {}
+    derivation_stats = {}
+    for result in results:
+        timer.merge(result["stage_timings"])
+        # Hooks only run here, so workers' chunk events are replayed once they finish
+        for event in result["chunk_events"]:
+            timer.chunk(**event)
+        merge_coercion_stats(coercion_stats, result["coercion_stats"])
+        for field, count in result["derivation_stats"].items():
+            derivation_stats[field] = derivation_stats.get(field, 0) + count
+    parts = [Path(task["part_file"]) for task, result in zip(tasks, results) if result["chunks"]]
+    columns_out = next((r["columns"] for r in results if r["columns"] is not None), [])
+
+    try:
+        if sorter is not None:
+            for result in results:
+                for run_path in result["runs"]:
+                    sorter.add_run(run_path, result["chromosomes"])
+            if verbose:
+                print(f"  Merging {len(sorter.runs)} sorted runs...")
+            writer = open_table_writer(
+                output_file,
+                output_format=output_format,
+                compression=output_compression,
+                write_index=write_index,
+                index_format=index_format,
+                level=compression_level,
+                threads=threads,
+                partition_cols=partition_cols,
+                row_group_size=row_group_size,
+                timer=timer,
+            )
+            with sorter:
+                for batch in timer.iterate("sort", sorter.merged(batch_rows=chunksize)):
+                    with timer.stage("write", rows=len(batch)):
+                        writer.write(batch)
+            with timer.stage("write"):
+                writer.close()
+        elif concatenate:
+            header_file = Path(part_tmp.name) / _part_path(output_file, len(tasks)).name
+            header_writer = open_table_writer(
+                str(header_file),
+                output_format=output_format,
+                compression=output_compression,
+                level=compression_level,
+                threads=1,
+            )
+            header_writer.write(pd.DataFrame(columns=columns_out))
+            header_writer.close()
+            with timer.stage("write"):
+                _concatenate(
+                    [header_file] + parts,
+                    output_file,
+                    strip_bgzf_eof=output_compression in ("gzip", "bgzip"),
+                )
+        elif merge_parts and output_format in ARROW_FORMATS:
+            import pyarrow as pa
+
+            writer = open_table_writer(
+                output_file, output_format=output_format, compression=output_compression
+            )
+            with timer.stage("write"):
+                for part in parts:
+                    with pa.memory_map(str(part)) as source:
+                        part_reader = pa.ipc.open_file(source)
+                        for i in range(part_reader.num_record_batches):
+                            writer.write(part_reader.get_batch(i).to_pandas())
+                writer.close()
+        elif merge_parts and output_format == "parquet":
+            import pyarrow.parquet as pq
+
+            writer = open_table_writer(
+                output_file,
+                output_format=output_format,
+                compression=output_compression,
+                row_group_size=row_group_size,
+            )
+            with timer.stage("write"):
+                for part in parts:
+                    for batch in pq.ParquetFile(str(part)).iter_batches(batch_size=chunksize):
+                        writer.write(batch.to_pandas())
+                writer.close()
+        elif merge_parts and output_format != "dataset":
+            raise ValueError(f"Cannot merge parts of {output_format} output")
+    finally:
+        if part_tmp is not None:
+            part_tmp.cleanup()
+
+    timer.record_input(filename)
+    if not merge_parts and output_format != "dataset" and not sorting:
+        for part in parts:
+            timer.record_output(str(part))
+    else:
+        timer.record_output(output_file)
+
+    summary = {
+        "rows_processed": sum(result["rows"] for result in results),
+        "chunks": sum(result["chunks"] for result in results),
+        "workers": workers,
+        "stage_timings": timer.summary(),
+    }
+    if not merge_parts and output_format != "dataset" and not sorting:
+        summary["parts"] = [str(part) for part in parts]
+    if coerce_types:
+        summary["coercion_stats"] = coercion_stats
+    if derive_stats:
+        summary["derivation_stats"] = derivation_stats
+
+    if verbose:
+        print(f"  Complete! Total rows processed: {summary['rows_processed']:,}")
+        print(f"  Output saved to: {output_file}")
+    return summary
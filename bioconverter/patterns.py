@@ -0,0 +1,67 @@
+"""
+Column Patterns Module
+Regex patterns for recognising omics column names (no heavy dependencies)
+"""
+
+import re
+from typing import Dict
+
+
+def create_omics_column_patterns() -> Dict[str, re.Pattern]:
+    """
+    Create comprehensive regex patterns for various omics data types.
+    
+    Returns:
+        Dictionary of field names to regex patterns
+    """
+    patterns = {
+        # Genomics
+        "chr": re.compile(r"^(chr|chromosome|chrom|#?chr|#?chrom|#?CHROM|seqname)$", re.IGNORECASE),
+        "pos": re.compile(r"^(pos|position|bp|base_pair|base_position|ps|POS|start|end)$", re.IGNORECASE),
+        "ref": re.compile(r"^(ref|reference|ref_allele|reference_allele|REF|a2|allele2)$", re.IGNORECASE),
+        "alt": re.compile(r"^(alt|alternate|alt_allele|alternate_allele|ALT|a1|allele1|effect_allele)$", re.IGNORECASE),
+        "rsid": re.compile(r"^(rsid|snp|snpid|snp_id|variant_id|varid|id|ID|marker|rs)$", re.IGNORECASE),
+        "pval": re.compile(r"^(p|pval|p_value|pvalue|p-value|p\.value|sig|pval_nominal|P)$", re.IGNORECASE),
+        "beta": re.compile(r"^(beta|b|effect|coef|coefficient|effect_size|BETA|slope)$", re.IGNORECASE),
+        "se": re.compile(r"^(se|stderr|standard_error|std_err|std_error|SE)$", re.IGNORECASE),
+        "or": re.compile(r"^(or|odds_ratio|oddsratio|OR)$", re.IGNORECASE),
+        "frq": re.compile(r"^(frq|freq|frequency|maf|af|eaf|allele_freq|AF)$", re.IGNORECASE),
+        "n": re.compile(r"^(n|n_samples|sample_size|nsize|ns|n_total|ntotal|N)$", re.IGNORECASE),
+        "info": re.compile(r"^(info|imputation_quality|impquality|r2|rsq|INFO)$", re.IGNORECASE),
+        
+        # Transcriptomics
+        "gene_id": re.compile(r"^(gene_id|geneid|ensembl_id|ensembl|ensg)$", re.IGNORECASE),
+        "gene_name": re.compile(r"^(gene_name|genename|gene_symbol|symbol|gene)$", re.IGNORECASE),
+        "transcript_id": re.compile(r"^(transcript_id|transcriptid|enst)$", re.IGNORECASE),
+        "expression": re.compile(r"^(expression|expr|value)$", re.IGNORECASE),
+        "fpkm": re.compile(r"^(fpkm|rpkm)$", re.IGNORECASE),
+        "tpm": re.compile(r"^(tpm|transcripts_per_million)$", re.IGNORECASE),
+        "counts": re.compile(r"^(counts|read_count|reads)$", re.IGNORECASE),
+        "log2fc": re.compile(r"^(log2fc|log2_fold_change|log2foldchange|lfc)$", re.IGNORECASE),
+        "padj": re.compile(r"^(padj|adj_pval|adjusted_pvalue|fdr|qval|q_value)$", re.IGNORECASE),
+        
+        # Proteomics
+        "protein_id": re.compile(r"^(protein_id|proteinid|uniprot|uniprot_id)$", re.IGNORECASE),
+        "protein_name": re.compile(r"^(protein_name|proteinname|protein)$", re.IGNORECASE),
+        "peptide": re.compile(r"^(peptide|peptide_sequence|sequence)$", re.IGNORECASE),
+        "abundance": re.compile(r"^(abundance|protein_abundance)$", re.IGNORECASE),
+        "intensity": re.compile(r"^(intensity|signal|signal_intensity)$", re.IGNORECASE),
+        "ratio": re.compile(r"^(ratio|fold_change|fc)$", re.IGNORECASE),
+        
+        # Metabolomics
+        "metabolite_id": re.compile(r"^(metabolite_id|metaboliteid|compound_id|hmdb|hmdb_id)$", re.IGNORECASE),
+        "metabolite_name": re.compile(r"^(metabolite_name|metabolite|compound|compound_name)$", re.IGNORECASE),
+        "mz": re.compile(r"^(mz|m/z|mass|mass_to_charge)$", re.IGNORECASE),
+        "rt": re.compile(r"^(rt|retention_time|retentiontime)$", re.IGNORECASE),
+        "concentration": re.compile(r"^(concentration|conc|amount)$", re.IGNORECASE),
+        "peak_area": re.compile(r"^(peak_area|area|peak_intensity)$", re.IGNORECASE),
+        
+        # Sample information
+        "sample_id": re.compile(r"^(sample_id|sampleid|sample|sample_name)$", re.IGNORECASE),
+        "condition": re.compile(r"^(condition|group|treatment|class)$", re.IGNORECASE),
+        "timepoint": re.compile(r"^(timepoint|time|time_point)$", re.IGNORECASE),
+        "replicate": re.compile(r"^(replicate|rep|biological_replicate)$", re.IGNORECASE),
+        "batch": re.compile(r"^(batch|batch_id)$", re.IGNORECASE),
+    }
+    
+    return patterns
@@ -0,0 +1,413 @@
+"""
+Profiling Hooks Module
+Callbacks fired around conversions, their stages and chunks, with profiler and trace adapters
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+
+class ConversionHook:
+    """
+    Receives events from a conversion; override the methods you need.
+
+    Events, in order:
+
+    - ``conversion_start(info)``: a conversion begins; ``info`` has the
+      'function' running it and its 'input' (and 'output', if any); a batch
+      gives the list of its 'inputs' instead.
+      Conversions nest: a batch, or the CLI, starts one per file inside its own.
+    - ``stage_start(stage, info)`` / ``stage_end(stage, info)``: around every
+      call of a stage (sniff, read, map, coerce, derive, key, sort, write,
+      compress, cache). ``stage_end`` info has wall_s, cpu_s (including
+      nested stages), rows, bytes_in, bytes_out and peak_rss_mb.
+    - ``chunk(info)``: a chunk has been converted and written; info has
+      index, rows, latency_s (read to written), peak_rss_mb and, where known,
+      input_offset or the parallel byte range it came from ('range').
+    - ``progress(info)``: how much of an input has been consumed: 'input',
+      'bytes_done' (bytes of the file on disk, compressed bytes for
+      compressed input; None if unknown) and 'rows' converted so far. Sent
+      after every chunk, and periodically while parallel workers run. A
+      batch sends 'skipped': True for an input it will not convert after all,
+      and 'done': True for an input finished elsewhere (e.g. in another process).
+    - ``conversion_end(info)``: the conversion finished; info repeats the
+      start info and adds 'rows', 'error' (None on success) and 'stages'
+      (``StageTimer.summary()``).
+
+    Hooks are context managers: leaving the block calls ``close()``, which
+    writes out anything buffered. Hooks used with ``convert_many`` are called
+    from several threads at once; the built-in hooks are thread-safe. Hooks
+    are not called from worker processes (``process_file_parallel`` replays
+    its workers' chunk events once they finish and reports their progress
+    as it goes).
+    """
+
+    def conversion_start(self, info: Dict[str, object]) -> None:
+        pass
+
+    def stage_start(self, stage: str, info: Dict[str, object]) -> None:
+        pass
+
+    def stage_end(self, stage: str, info: Dict[str, object]) -> None:
+        pass
+
+    def chunk(self, info: Dict[str, object]) -> None:
+        pass
+
+    def progress(self, info: Dict[str, object]) -> None:
+        pass
+
+    def conversion_end(self, info: Dict[str, object]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CallbackHook(ConversionHook):
+    """
+    Adapts a function ``callback(event, info)`` to a hook.
+
+    ``event`` is the hook method name ('stage_end', 'chunk', ...); for stage
+    events ``info`` also carries the stage name under 'stage'.
+    """
+
+    def __init__(self, callback: Callable[[str, Dict[str, object]], None]):
+        self.callback = callback
+
+    def conversion_start(self, info):
+        self.callback("conversion_start", info)
+
+    def stage_start(self, stage, info):
+        self.callback("stage_start", {"stage": stage, **info})
+
+    def stage_end(self, stage, info):
+        self.callback("stage_end", {"stage": stage, **info})
+
+    def chunk(self, info):
+        self.callback("chunk", info)
+
+    def progress(self, info):
+        self.callback("progress", info)
+
+    def conversion_end(self, info):
+        self.callback("conversion_end", info)
+
+
+HookSpec = Union[None, ConversionHook, Callable, Iterable]
+
+
+def as_hooks(hooks: HookSpec) -> List[ConversionHook]:
+    """Normalise a hook, a callback ``f(event, info)``, or a list of them, to a list of hooks."""
+    if hooks is None:
+        return []
+    if isinstance(hooks, ConversionHook):
+        return [hooks]
+    if callable(hooks):
+        return [CallbackHook(hooks)]
+    return [hook for item in hooks for hook in as_hooks(item)]
+
+
+class CProfileHook(ConversionHook):
+    """
+    Deterministic profile (cProfile) of conversions, or of selected stages.
+
+    The profile covers the thread that started the outermost conversion;
+    conversions running on other threads at the same time are not included.
+    Statistics are written to ``output`` (pstats format, readable with
+    ``python -m pstats`` or snakeviz) on ``close()``.
+
+    cProfile slows pure-Python code down noticeably; use
+    ``SamplingProfilerHook`` to profile production runs.
+
+    Args:
+        output: File to write the statistics to on close (optional)
+        stages: Only profile these stages (default: whole conversions)
+    """
+
+    def __init__(self, output: Optional[str] = None, stages: Optional[Iterable[str]] = None):
+        self.output = output
+        self.stages = set(stages) if stages else None
+        self.profile = cProfile.Profile()
+        self._thread = None
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    def _enable(self) -> None:
+        with self._lock:
+            ident = threading.get_ident()
+            if self._thread is None:
+                self._thread = ident
+                self.profile.enable()
+            elif self._thread != ident:
+                return
+            self._depth += 1
+
+    def _disable(self) -> None:
+        with self._lock:
+            if self._thread != threading.get_ident():
+                return
+            self._depth -= 1
+            if self._depth == 0:
+                self.profile.disable()
+                self._thread = None
+
+    def conversion_start(self, info):
+        if self.stages is None:
+            self._enable()
+
+    def conversion_end(self, info):
+        if self.stages is None:
+            self._disable()
+
+    def stage_start(self, stage, info):
+        if self.stages is not None and stage in self.stages:
+            self._enable()
+
+    def stage_end(self, stage, info):
+        if self.stages is not None and stage in self.stages:
+            self._disable()
+
+    def stats(self, sort: str = "cumulative") -> pstats.Stats:
+        """Statistics collected so far, sorted by ``sort``."""
+        return pstats.Stats(self.profile).sort_stats(sort)
+
+    def close(self) -> None:
+        """Stop profiling and write the statistics to ``output``."""
+        with self._lock:
+            if self._thread is not None:
+                self.profile.disable()
+                self._thread = None
+                self._depth = 0
+        if self.output is not None:
+            self.profile.dump_stats(self.output)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfilerHook(ConversionHook):
+    """
+    Statistical profiler for the threads running conversions.
+
+    A background thread samples the stacks of every thread inside a
+    conversion each ``interval`` seconds. Its cost depends on the sampling
+    rate rather than on the number of function calls, so it can stay
+    attached to production runs. The current stages are added as the
+    outermost frames (``stage:read;...``), so time splits by stage first.
+
+    On ``close()`` the samples are written to ``output`` as folded stacks
+    (``frame;frame;frame count`` per line), which flamegraph.pl, inferno and
+    speedscope read directly.
+
+    Args:
+        output: Folded-stacks file to write on close
+        interval: Seconds between samples
+    """
+
+    def __init__(self, output: str, interval: float = 0.005):
+        self.output = output
+        self.interval = interval
+        self.samples = Counter()
+        self._threads: Dict[int, List[object]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def conversion_start(self, info):
+        with self._lock:
+            depth_and_stages = self._threads.setdefault(threading.get_ident(), [0, []])
+            depth_and_stages[0] += 1
+            if self._sampler is None:
+                self._stop.clear()
+                self._sampler = threading.Thread(
+                    target=self._run, name="bioconverter-sampler", daemon=True
+                )
+                self._sampler.start()
+
+    def conversion_end(self, info):
+        with self._lock:
+            ident = threading.get_ident()
+            state = self._threads.get(ident)
+            if state is None:
+                return
+            state[0] -= 1
+            if state[0] == 0:
+                del self._threads[ident]
+
+    def stage_start(self, stage, info):
+        state = self._threads.get(threading.get_ident())
+        if state is not None:
+            state[1].append(stage)
+
+    def stage_end(self, stage, info):
+        state = self._threads.get(threading.get_ident())
+        if state is not None and state[1]:
+            state[1].pop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = [(ident, list(state[1])) for ident, state in self._threads.items()]
+            for ident, stages in threads:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                key = ";".join([f"stage:{stage}" for stage in stages] + stack)
+                with self._lock:
+                    self.samples[key] += 1
+
+    def close(self) -> None:
+        """Stop sampling and write the folded stacks."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        with self._lock:
+            lines = [f"{stack} {count}\n" for stack, count in sorted(self.samples.items())]
+        with open(self.output, "w", encoding="utf-8") as handle:
+            handle.writelines(lines)
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+def _attributes(info: Dict[str, object]) -> Dict[str, object]:
+    """Span attributes: scalar values, prefixed with 'bioconverter.'."""
+    return {
+        f"bioconverter.{key}": value
+        for key, value in info.items()
+        if value is None or isinstance(value, (str, int, float, bool))
+    }
+
+
+class TraceFileHook(ConversionHook):
+    """
+    Writes OpenTelemetry-style spans to a local JSON-lines file.
+
+    Every conversion is a span (the outermost one starts a new trace), with
+    a child span per stage call (nested stages are children of their
+    enclosing stage) and, optionally, per chunk. Each line is one finished
+    span with the OTLP/JSON field names: traceId, spanId, parentSpanId,
+    name, kind, startTimeUnixNano, endTimeUnixNano, attributes and status,
+    so spans can be loaded into a trace viewer or forwarded by a collector
+    without an OpenTelemetry dependency here.
+
+    Spans are buffered and appended to the file whenever an outermost
+    conversion ends, and on ``close()``.
+
+    Args:
+        path: File to append spans to
+        chunk_spans: Write a span per chunk
+    """
+
+    def __init__(self, path: str, chunk_spans: bool = True):
+        self.path = path
+        self.chunk_spans = chunk_spans
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+
+    def _stack(self) -> List[Dict[str, object]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _open_span(self, name: str, info: Dict[str, object]) -> None:
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append({
+            "traceId": parent["traceId"] if parent else _new_id(16),
+            "spanId": _new_id(8),
+            "parentSpanId": parent["spanId"] if parent else "",
+            "name": name,
+            "start": time.time_ns(),
+            "attributes": _attributes(info),
+        })
+
+    def _emit(self, span: Dict[str, object], end: int, info: Dict[str, object], error=None) -> None:
+        record = {
+            "traceId": span["traceId"],
+            "spanId": span["spanId"],
+            "parentSpanId": span["parentSpanId"],
+            "name": span["name"],
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(span["start"]),
+            "endTimeUnixNano": str(end),
+            "attributes": {**span["attributes"], **_attributes(info)},
+            "status": (
+                {"code": "STATUS_CODE_ERROR", "message": error}
+                if error
+                else {"code": "STATUS_CODE_OK"}
+            ),
+        }
+        with self._lock:
+            self._buffer.append(json.dumps(record, default=str) + "\n")
+
+    def _close_span(self, info: Dict[str, object], error=None) -> None:
+        stack = self._stack()
+        if stack:
+            self._emit(stack.pop(), time.time_ns(), info, error)
+
+    def conversion_start(self, info):
+        self._open_span(f"conversion {info.get('function', '')}".strip(), info)
+
+    def conversion_end(self, info):
+        self._close_span(
+            {key: value for key, value in info.items() if key != "stages"}, info.get("error")
+        )
+        if not self._stack():
+            self.flush()
+
+    def stage_start(self, stage, info):
+        self._open_span(stage, info)
+
+    def stage_end(self, stage, info):
+        self._close_span(info)
+
+    def chunk(self, info):
+        stack = self._stack()
+        if not self.chunk_spans or not stack:
+            return
+        end = time.time_ns()
+        span = {
+            "traceId": stack[0]["traceId"],
+            "spanId": _new_id(8),
+            "parentSpanId": stack[-1]["spanId"],
+            "name": "chunk",
+            "start": end - int(info.get("latency_s", 0) * 1e9),
+            "attributes": {},
+        }
+        self._emit(span, end, info)
+
+    def flush(self) -> None:
+        """Append buffered spans to the file."""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            if lines:
+                with open(self.path, "a", encoding="utf-8") as handle:
+                    handle.writelines(lines)
+
+    def close(self) -> None:
+        self.flush()
@@ -0,0 +1,205 @@
+"""
+Progress Module
+Live progress, throughput and ETA of conversions, measured in bytes of input consumed
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, TextIO
+
+from .profiling import ConversionHook
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """``h:mm:ss`` (or ``m:ss``) for a number of seconds; '--:--' if unknown."""
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class ProgressHook(ConversionHook):
+    """
+    Throttled progress, throughput and ETA of a conversion or a batch.
+
+    Progress is the number of bytes of each input file consumed, as stored
+    on disk, against the inputs' total size: for compressed input that is
+    the compressed offset, so the fraction done and the ETA do not depend
+    on the compression ratio or on knowing the number of rows. Chunked
+    conversions report after every chunk, parallel conversions combine
+    their workers' ranges while they run, and inputs converted in memory
+    count as done when they finish. Batches register all their inputs when
+    they start, so the total (and the ETA) covers the whole batch.
+
+    The callback gets at most one update per ``interval`` seconds, plus a
+    final one when the outermost conversion ends, so reporting costs
+    nothing measurable. Each update is a dictionary with:
+
+    - bytes_done, bytes_total, fraction (0-1; None if the total is unknown)
+    - rows: rows converted so far
+    - elapsed_s, rows_per_s, mb_per_s (of input consumed)
+    - eta_s: seconds left at the average rate so far (None until known)
+    - files_done, files_total
+    - final: True for the last update
+
+    Args:
+        callback: Function called with each update (default: ``ProgressBar()``)
+        interval: Minimum seconds between updates
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[Dict[str, object]], None]] = None,
+        interval: float = 0.5,
+    ):
+        self.callback = callback or ProgressBar()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._sizes: Dict[str, int] = {}
+        self._consumed: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self._finished = set()
+        self._depth = 0
+        self._started = None
+        self._next_update = 0.0
+
+    def _register(self, filename: str) -> None:
+        if filename not in self._sizes:
+            try:
+                self._sizes[filename] = os.path.getsize(filename)
+            except (OSError, TypeError, ValueError):
+                self._sizes[filename] = 0
+            self._consumed[filename] = 0
+            self._rows[filename] = 0
+
+    def conversion_start(self, info):
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+            self._depth += 1
+            for filename in info.get("inputs") or []:
+                self._register(str(filename))
+            if info.get("input") is not None:
+                self._register(str(info["input"]))
+
+    def progress(self, info):
+        with self._lock:
+            if self._started is None:
+                return
+            filename = str(info["input"])
+            if info.get("skipped"):
+                # A batch input that will not be converted after all
+                for counts in (self._sizes, self._consumed, self._rows):
+                    counts.pop(filename, None)
+                return
+            self._register(filename)
+            if info.get("bytes_done") is not None:
+                self._consumed[filename] = min(info["bytes_done"], self._sizes[filename])
+            if info.get("rows") is not None:
+                self._rows[filename] = info["rows"]
+            if info.get("done"):
+                # Converted in another process, which reports only its outcome
+                self._consumed[filename] = self._sizes[filename]
+                self._finished.add(filename)
+            self._send(final=False)
+
+    def conversion_end(self, info):
+        with self._lock:
+            if self._started is None:
+                return
+            if info.get("input") is not None:
+                filename = str(info["input"])
+                self._register(filename)
+                self._consumed[filename] = self._sizes[filename]
+                if info.get("rows") is not None:
+                    self._rows[filename] = info["rows"]
+                self._finished.add(filename)
+            self._depth -= 1
+            final = self._depth == 0
+            self._send(final=final)
+            if final:
+                self._reset()
+
+    def _send(self, final: bool) -> None:
+        """
+        Call back with an update unless one was sent less than ``interval`` ago.
+        Called with the lock held, so updates arrive in order, the final one last.
+        """
+        now = time.monotonic()
+        if not final and now < self._next_update:
+            return
+        self._next_update = now + self.interval
+        elapsed = now - self._started
+        bytes_done = sum(self._consumed.values())
+        bytes_total = sum(self._sizes.values())
+        rows = sum(self._rows.values())
+        rate = bytes_done / elapsed if elapsed > 0 else 0.0
+        self.callback({
+            "bytes_done": bytes_done,
+            "bytes_total": bytes_total,
+            "fraction": min(1.0, bytes_done / bytes_total) if bytes_total else None,
+            "rows": rows,
+            "elapsed_s": elapsed,
+            "rows_per_s": rows / elapsed if elapsed > 0 else None,
+            "mb_per_s": rate / 1e6 if elapsed > 0 else None,
+            "eta_s": (
+                0.0 if final else (bytes_total - bytes_done) / rate if rate > 0 else None
+            ),
+            "files_done": len(self._finished),
+            "files_total": len(self._sizes),
+            "final": final,
+        })
+
+
+class ProgressBar:
+    """
+    Progress callback drawing one status line on a stream (stderr by default).
+
+    On a terminal the line is redrawn in place; otherwise (logs, pipes) each
+    update is written as a line of its own.
+
+    Args:
+        stream: Text stream to write to
+        width: Width of the bar in characters
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, width: int = 30):
+        self.stream = stream
+        self.width = width
+        self._line_length = 0
+
+    def __call__(self, update: Dict[str, object]) -> None:
+        stream = self.stream or sys.stderr
+        fraction = update["fraction"]
+        if fraction is None:
+            bar, percent = " " * self.width, "   ?%"
+        else:
+            filled = int(fraction * self.width)
+            bar = "#" * filled + "-" * (self.width - filled)
+            percent = f"{100 * fraction:5.1f}%"
+        rows_per_s = update["rows_per_s"]
+        mb_per_s = update["mb_per_s"]
+        line = (
+            f"[{bar}] {percent} {update['bytes_done'] / 1e6:,.1f}/"
+            f"{update['bytes_total'] / 1e6:,.1f} MB  {update['rows']:,} rows  "
+            f"{rows_per_s or 0:,.0f} rows/s  {mb_per_s or 0:.1f} MB/s  "
+            f"{'elapsed' if update['final'] else 'ETA'} "
+            f"{format_duration(update['elapsed_s'] if update['final'] else update['eta_s'])}"
+        )
+        if update["files_total"] > 1:
+            line += f"  files {update['files_done']}/{update['files_total']}"
+        if stream.isatty():
+            stream.write("\r" + line.ljust(self._line_length))
+            self._line_length = len(line)
+            if update["final"]:
+                stream.write("\n")
+                self._line_length = 0
+        else:
+            stream.write(line + "\n")
+        stream.flush()
@@ -0,0 +1,289 @@
+"""
+Stage Timing Module
+Wall time, CPU time, rows, bytes and peak memory per conversion stage
+"""
+
+import os
+import sys
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from .profiling import HookSpec, as_hooks
+
+# Report order; stages not listed here follow in the order first seen
+STAGES = ("sniff", "cache", "read", "map", "coerce", "derive", "key", "sort", "write", "compress")
+
+_COUNTERS = ("wall_s", "cpu_s", "calls", "rows", "bytes_in", "bytes_out")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def path_size(path: str) -> int:
+    """Size of a file, or of every file under a directory."""
+    path = Path(path)
+    if path.is_dir():
+        return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+    return path.stat().st_size if path.exists() else 0
+
+
+class StageTimer:
+    """
+    Accumulates the cost of each stage of a conversion.
+
+    Stages nest, and time spent in an inner stage (e.g. 'compress' inside
+    'write') is not counted again for the outer one, so stage times add up
+    to the time instrumented. CPU time is process CPU time: it includes
+    helper threads (parallel BGZF decompression and compression) that ran
+    during the stage. CPU time close to wall time means the stage is
+    compute-bound, CPU time well below wall time means it waited on I/O.
+
+    Peak RSS is the process high-water mark when the stage last finished,
+    so the first stage whose peak jumps is the one that allocated.
+
+    Registered hooks (see ``ConversionHook``) are called around every
+    stage, conversion and chunk. A hook that raises is reported with a
+    warning and dropped; it does not stop the conversion.
+
+    Args:
+        hooks: Hooks or callbacks ``f(event, info)`` to notify
+    """
+
+    def __init__(self, hooks: HookSpec = None):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.hooks = as_hooks(hooks)
+        self._stack = []
+
+    def add_hooks(self, hooks: HookSpec) -> None:
+        """Register more hooks."""
+        self.hooks.extend(as_hooks(hooks))
+
+    def _notify(self, event: str, *args) -> None:
+        for hook in list(self.hooks):
+            try:
+                getattr(hook, event)(*args)
+            except Exception as e:
+                warnings.warn(f"{type(hook).__name__}.{event} failed, hook removed: {e}")
+                self.hooks.remove(hook)
+
+    def _record(self, name: str) -> Dict[str, float]:
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = dict.fromkeys(_COUNTERS, 0)
+            record["peak_rss_mb"] = None
+        return record
+
+    def add(
+        self,
+        name: str,
+        wall_s: float = 0.0,
+        cpu_s: float = 0.0,
+        rows: int = 0,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        calls: int = 0,
+    ) -> None:
+        """Add time and counts to a stage."""
+        record = self._record(name)
+        record["wall_s"] += wall_s
+        record["cpu_s"] += cpu_s
+        record["calls"] += calls
+        record["rows"] += rows
+        record["bytes_in"] += bytes_in
+        record["bytes_out"] += bytes_out
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0, bytes_in: int = 0, bytes_out: int = 0):
+        """
+        Time the enclosed block as one call of a stage.
+
+        Args:
+            name: Stage name (see STAGES)
+            rows: Rows handled by the block, if known up front
+            bytes_in: Bytes consumed by the block
+            bytes_out: Bytes produced by the block
+
+        Yields:
+            Dictionary of the call's rows/bytes_in/bytes_out, which the block
+            may update once they are known
+        """
+        call = {"rows": rows, "bytes_in": bytes_in, "bytes_out": bytes_out}
+        if self.hooks:
+            self._notify("stage_start", name, dict(call))
+        children = [0.0, 0.0]
+        self._stack.append(children)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield call
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += wall
+                self._stack[-1][1] += cpu
+            self.add(name, wall - children[0], cpu - children[1], calls=1, **call)
+            peak = self._record(name)["peak_rss_mb"] = peak_rss_mb()
+            if self.hooks:
+                self._notify(
+                    "stage_end", name, {"wall_s": wall, "cpu_s": cpu, **call, "peak_rss_mb": peak}
+                )
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """
+        Yield from an iterable, timing each ``next`` as a call of a stage.
+
+        Items with a length (DataFrames) are counted as rows; ``(DataFrame, ...)``
+        tuples are counted by their first element.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name) as call:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                first = item[0] if isinstance(item, tuple) else item
+                if hasattr(first, "__len__"):
+                    call["rows"] = len(first)
+            yield item
+
+    @contextmanager
+    def conversion(self, **info):
+        """
+        Notify hooks that the enclosed block is a conversion.
+
+        Args:
+            **info: Details passed to ``conversion_start`` and ``conversion_end``
+                ('function', 'input', 'output', ...)
+
+        Yields:
+            Dictionary the block may add results to (e.g. 'rows') for
+            ``conversion_end``
+        """
+        self.start_conversion(**info)
+        outcome = {"rows": None, "error": None}
+        try:
+            yield outcome
+        except BaseException as e:
+            outcome["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.end_conversion(**info, **outcome)
+
+    def start_conversion(self, **info) -> None:
+        """Notify hooks that a conversion begins (prefer ``conversion``)."""
+        self._notify("conversion_start", dict(info))
+
+    def end_conversion(self, rows: Optional[int] = None, error: Optional[str] = None, **info) -> None:
+        """Notify hooks that a conversion finished; pass the info given to ``start_conversion``."""
+        self._notify("conversion_end", {**info, "rows": rows, "error": error, "stages": self.summary()})
+
+    def chunk(self, **info) -> None:
+        """Notify hooks that a chunk was converted (index, rows, latency_s, ...)."""
+        if self.hooks:
+            info.setdefault("peak_rss_mb", peak_rss_mb())
+            self._notify("chunk", info)
+
+    def progress(self, **info) -> None:
+        """Notify hooks of the input consumed so far (input, bytes_done, rows)."""
+        if self.hooks:
+            self._notify("progress", info)
+
+    def record_input(self, filename: str) -> None:
+        """Count an input file's size on disk as bytes read."""
+        try:
+            self.add("read", bytes_in=os.path.getsize(filename))
+        except OSError:
+            pass
+
+    def record_output(self, output: str) -> None:
+        """
+        Count an output's size on disk as bytes written, by 'compress' when
+        a compressed sink was timed and by 'write' otherwise.
+        """
+        name = "compress" if "compress" in self.stages else "write"
+        self.add(name, bytes_out=path_size(output))
+
+    def merge(self, stages: Dict[str, Dict[str, float]]) -> None:
+        """
+        Add the stages recorded by another timer (e.g. in a worker process).
+
+        Times are summed, so for parallel workers they are worker-seconds
+        rather than elapsed time; peak RSS is the largest of any process.
+        """
+        for name, other in stages.items():
+            self.add(name, **{key: other.get(key, 0) for key in _COUNTERS})
+            record = self._record(name)
+            peaks = [p for p in (record["peak_rss_mb"], other.get("peak_rss_mb")) if p is not None]
+            record["peak_rss_mb"] = max(peaks) if peaks else None
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        """
+        Per-stage results in report order.
+
+        Returns:
+            Dictionary of stage name -> wall_s, cpu_s, calls, rows, bytes_in,
+            bytes_out, rows_per_s, mb_per_s (of bytes_in, or bytes_out when
+            nothing was consumed) and peak_rss_mb
+        """
+        names = [name for name in STAGES if name in self.stages]
+        names += [name for name in self.stages if name not in STAGES]
+        result = {}
+        for name in names:
+            record = self.stages[name]
+            wall = record["wall_s"]
+            moved = record["bytes_in"] or record["bytes_out"]
+            result[name] = {
+                "wall_s": round(wall, 6),
+                "cpu_s": round(record["cpu_s"], 6),
+                "calls": record["calls"],
+                "rows": record["rows"],
+                "bytes_in": record["bytes_in"],
+                "bytes_out": record["bytes_out"],
+                "rows_per_s": round(record["rows"] / wall) if record["rows"] and wall > 0 else None,
+                "mb_per_s": round(moved / wall / 1e6, 2) if moved and wall > 0 else None,
+                "peak_rss_mb": (
+                    round(record["peak_rss_mb"], 1) if record["peak_rss_mb"] is not None else None
+                ),
+            }
+        return result
+
+
+class TimedSink:
+    """
+    Binary sink wrapper that times writes (and the final flush) as a stage.
+
+    Wraps the compressed stream under a table writer so that formatting rows
+    as text ('write') and compressing them ('compress') are timed apart.
+    """
+
+    def __init__(self, sink, timer: StageTimer, name: str = "compress"):
+        self._sink = sink
+        self._timer = timer
+        self._name = name
+
+    def write(self, data) -> int:
+        with self._timer.stage(self._name, bytes_in=len(data)):
+            return self._sink.write(data)
+
+    def flush(self) -> None:
+        with self._timer.stage(self._name):
+            self._sink.flush()
+
+    def close(self) -> None:
+        with self._timer.stage(self._name):
+            self._sink.close()
+
+    def __getattr__(self, name):
+        return getattr(self._sink, name)
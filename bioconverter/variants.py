@@ -0,0 +1,221 @@
+"""
+Variant Keys Module
+Vectorized allele normalization and hashed variant keys for joining studies
+"""
+
+import warnings
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .genomic_index import chromosome_sort_key, normalize_chromosome
+
+# Base complements for strand flips (single-base alleles only)
+COMPLEMENT = {"A": "T", "T": "A", "C": "G", "G": "C"}
+
+# Allele column pairs (effect allele, other allele), in order of preference
+ALLELE_COLUMNS = (("a1", "a2"), ("alt", "ref"))
+
+# Packed variant key column added by the standardization stage
+VARIANT_KEY_COLUMN = "variant_key"
+
+# Packed key layout (high to low bits): 5-bit chromosome code, 28-bit position,
+# 30-bit allele hash; the sign bit stays 0 so the key fits a signed int64
+_CHR_BITS, _POS_BITS, _ALLELE_BITS = 5, 28, 30
+# Chromosome code of contigs other than 1-22, X, Y, XY and MT, whose name
+# is then mixed into the allele hash
+_OTHER_CONTIG = (1 << _CHR_BITS) - 1
+
+
+def allele_columns(df: pd.DataFrame) -> Tuple[str, str]:
+    """
+    Effect and other allele columns of a standardized table: a1/a2, else alt/ref.
+
+    Raises:
+        ValueError: If the table has neither pair
+    """
+    for effect, other in ALLELE_COLUMNS:
+        if effect in df.columns and other in df.columns:
+            return effect, other
+    raise ValueError("No allele columns found (expected a1/a2 or alt/ref)")
+
+
+def encode_alleles(*columns) -> Tuple[List[Tuple[np.ndarray, np.ndarray]], List[str]]:
+    """
+    Integer codes of upper-cased alleles and of their strand complements.
+
+    Alleles repeat heavily (mostly A/C/G/T), so each distinct value is
+    normalized once and rows are compared as integers afterwards. All
+    columns share one vocabulary, sorted so that codes compare like the
+    allele strings. Only single-base alleles are complemented; others are
+    their own complement. Missing alleles are coded -1.
+
+    Args:
+        *columns: Allele columns (Series or arrays)
+
+    Returns:
+        Tuple of ([(codes, complement codes) per column], vocabulary)
+    """
+    arrays = [np.asarray(column, dtype=object) for column in columns]
+    codes, uniques = pd.factorize(np.concatenate(arrays), use_na_sentinel=True)
+    normalized = [str(value).strip().upper() for value in uniques]
+    complemented = [COMPLEMENT.get(value, value) for value in normalized]
+    vocabulary = sorted(set(normalized) | set(complemented))
+    index = {allele: i for i, allele in enumerate(vocabulary)}
+    # The sentinel -1 picks the trailing -1
+    lookup = np.array([index[allele] for allele in normalized] + [-1], dtype=np.int64)
+    complement_lookup = np.array([index[allele] for allele in complemented] + [-1], dtype=np.int64)
+    result, start = [], 0
+    for array in arrays:
+        part = codes[start:start + len(array)]
+        result.append((lookup[part], complement_lookup[part]))
+        start += len(array)
+    return result, vocabulary
+
+
+def canonical_alleles(effect, other) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Order- and strand-independent allele pair per row, as 64-bit allele hashes.
+
+    The pair is sorted, and for single-base SNPs replaced by its complement
+    when that sorts first, so A/G, G/A, T/C and C/T give the same pair.
+    Palindromic SNPs (A/T, C/G) are their own complement and stay as they
+    are. Each allele is represented by the hash of its string, so the values
+    compare across tables; a missing allele hashes as the empty string.
+
+    Returns:
+        Tuple of (lower allele hashes, higher allele hashes) as uint64 arrays
+    """
+    ((a, a_comp), (b, b_comp)), vocabulary = encode_alleles(effect, other)
+    low, high = np.minimum(a, b), np.maximum(a, b)
+    comp_low, comp_high = np.minimum(a_comp, b_comp), np.maximum(a_comp, b_comp)
+    use_comp = (comp_low < low) | ((comp_low == low) & (comp_high < high))
+    hashes = pd.util.hash_array(np.array(vocabulary + [""], dtype=object))
+    # Missing alleles (-1) pick the trailing empty string
+    return hashes[np.where(use_comp, comp_low, low)], hashes[np.where(use_comp, comp_high, high)]
+
+
+def variant_hash_keys(
+    df: pd.DataFrame,
+    chr_col: str = "chr",
+    pos_col: str = "pos",
+    alleles: Optional[Tuple[str, str]] = None,
+) -> np.ndarray:
+    """
+    64-bit hash of (chromosome, position, canonical allele pair) per row.
+
+    The key is the same for a variant whatever the allele order, strand or
+    chromosome naming ('chr6' or '6'), so it joins studies before their
+    alleles are aligned (see ``canonical_alleles``). It is built once per
+    table with vectorized hashing, not per row in Python.
+
+    Args:
+        df: Standardized table
+        chr_col: Chromosome column
+        pos_col: Position column
+        alleles: (effect, other) allele columns (default: ``allele_columns``)
+
+    Returns:
+        uint64 array of keys
+    """
+    effect, other = alleles or allele_columns(df)
+    codes, uniques = pd.factorize(df[chr_col].to_numpy(dtype=object), use_na_sentinel=True)
+    chromosomes = pd.util.hash_array(
+        np.array([normalize_chromosome(name).upper() for name in uniques] + [""], dtype=object)
+    )[codes]
+    positions = pd.to_numeric(df[pos_col], errors="coerce").fillna(-1).to_numpy(dtype="int64")
+    low, high = canonical_alleles(df[effect], df[other])
+    return pd.util.hash_pandas_object(
+        pd.DataFrame({"chr": chromosomes, "pos": positions, "low": low, "high": high}),
+        index=False,
+    ).to_numpy()
+
+
+def packed_variant_keys(
+    df: pd.DataFrame,
+    chr_col: str = "chr",
+    pos_col: str = "pos",
+    alleles: Optional[Tuple[str, str]] = None,
+) -> pd.Series:
+    """
+    Compact 64-bit variant key per row: chromosome code, position, allele hash.
+
+    The key packs the chromosome code (1-22, X=23, Y=24, XY=25, MT=26, any
+    other contig 31) into the top bits, the position below it and a 30-bit
+    hash of the canonical allele pair (``canonical_alleles``) into the low
+    bits. Like ``variant_hash_keys`` it does not depend on allele order,
+    strand or 'chr' prefixes, and because the coordinates come first, sorting
+    the keys sorts variants in natural chromosome order. For other contigs
+    the contig name is hashed together with the alleles. Without allele
+    columns (``alleles=()``) the allele bits are 0 and the key identifies the
+    position only.
+
+    Args:
+        df: Standardized table
+        chr_col: Chromosome column
+        pos_col: Position column
+        alleles: (effect, other) allele columns (default: ``allele_columns``)
+
+    Returns:
+        Int64 Series of keys, NA where the chromosome or position is missing
+        or the position does not fit in 28 bits (above 268,435,455)
+    """
+    codes, uniques = pd.factorize(df[chr_col].to_numpy(dtype=object), use_na_sentinel=True)
+    sort_keys = [chromosome_sort_key(name) for name in uniques]
+    chromosomes = np.array(
+        [_OTHER_CONTIG if key[0] else min(key[1], _OTHER_CONTIG) for key in sort_keys] + [0],
+        dtype=np.int64,
+    )[codes]
+    contig_hashes = pd.util.hash_array(
+        np.array([key[2] for key in sort_keys] + [""], dtype=object)
+    )[codes]
+    positions = pd.to_numeric(df[pos_col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    valid = (codes >= 0) & (positions >= 0) & (positions < (1 << _POS_BITS))
+    positions = np.where(valid, positions, 0).astype(np.int64)
+
+    if alleles is None:
+        alleles = allele_columns(df)
+    if alleles:
+        low, high = canonical_alleles(df[alleles[0]], df[alleles[1]])
+        allele_hashes = pd.util.hash_pandas_object(
+            pd.DataFrame({"contig": contig_hashes, "low": low, "high": high}), index=False
+        ).to_numpy()
+    else:
+        allele_hashes = np.where(chromosomes == _OTHER_CONTIG, contig_hashes, 0).astype(np.uint64)
+    allele_bits = (allele_hashes & np.uint64((1 << _ALLELE_BITS) - 1)).astype(np.int64)
+
+    keys = (
+        (chromosomes << (_POS_BITS + _ALLELE_BITS))
+        | (positions << _ALLELE_BITS)
+        | allele_bits
+    )
+    return pd.Series(pd.arrays.IntegerArray(keys, ~valid), index=df.index, name=VARIANT_KEY_COLUMN)
+
+
+def add_variant_key(df: pd.DataFrame, column: str = VARIANT_KEY_COLUMN) -> pd.DataFrame:
+    """
+    Add a packed 64-bit variant key column (``packed_variant_keys``).
+
+    Joins, deduplication and lookups can then run on one integer column
+    instead of ``chr:pos:a2:a1`` strings. Tables without allele columns get
+    position-only keys; tables without chr/pos are returned unchanged with
+    a warning.
+
+    Args:
+        df: Standardized table
+        column: Name of the key column
+
+    Returns:
+        The table with the key column added
+    """
+    if "chr" not in df.columns or "pos" not in df.columns:
+        warnings.warn("No chr/pos columns; variant key not added")
+        return df
+    try:
+        alleles = allele_columns(df)
+    except ValueError:
+        alleles = ()
+    df = df.copy()
+    df[column] = packed_variant_keys(df, alleles=alleles)
+    return df
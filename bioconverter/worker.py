@@ -0,0 +1,427 @@
+"""
+Conversion Worker Module
+Long-lived worker that runs CLI conversion jobs on a pool of warm processes
+
+Starting a Python process, importing pandas/pyarrow and building the column
+pattern tables costs far more than converting a small file. A worker pays
+that once: jobs (CLI argument lists) arrive as JSON lines on stdin or on a
+Unix socket and run on processes that have everything imported already.
+
+Protocol: one JSON object per line in each direction.
+
+- Job: ``{"id": ..., "args": ["-i", "in.tsv", "-o", "out.tsv", ...], "cwd": "/path"}``;
+  'args' are ``bioconverter`` CLI arguments, relative paths are resolved
+  against 'cwd' (default: the worker's directory), 'id' is echoed back.
+- Result: ``{"id": ..., "status": "ok" | "error", "exit_code": 0, "elapsed_s": 0.12,
+  "stdout": "...", "stderr": "..."}`` with the job's captured output.
+  Results are sent as jobs finish, which may differ from the order sent.
+- Commands: ``{"command": "ping"}`` (answered with the worker's pid and
+  pool size) and ``{"command": "shutdown"}`` (socket mode; finishes running
+  jobs and stops).
+
+Usage:
+    bioconverter-worker serve --socket /tmp/bioconverter.sock --processes 8 &
+    bioconverter-worker submit --socket /tmp/bioconverter.sock -- -i in.tsv -o out.tsv
+    bioconverter-worker serve < jobs.jsonl > results.jsonl
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, TextIO
+
+
+def _warm_up() -> None:
+    """Pool initializer: import the conversion stack and build the pattern tables."""
+    from . import cli, convertor, interactive_converter, writers  # noqa: F401
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:  # pragma: no cover - optional at import time
+        pass
+    convertor.create_genetic_column_patterns()
+    interactive_converter.create_omics_column_patterns()
+
+
+def _run_job(args: List[str], cwd: Optional[str]) -> Dict[str, object]:
+    """Run one CLI invocation in this (pool) process, capturing its output."""
+    from .cli import main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    started = time.perf_counter()
+    previous_dir = os.getcwd()
+    stdin, sys.stdin = sys.stdin, io.StringIO()  # interactive prompts fail instead of blocking
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                exit_code = main([str(arg) for arg in args])
+            except SystemExit as e:  # argparse errors and --help
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:
+                print(f"Error during conversion: {type(e).__name__}: {e}", file=sys.stderr)
+                exit_code = 1
+    finally:
+        sys.stdin = stdin
+        os.chdir(previous_dir)
+    return {
+        "status": "ok" if not exit_code else "error",
+        "exit_code": exit_code or 0,
+        "elapsed_s": round(time.perf_counter() - started, 6),
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+class ConversionWorker:
+    """
+    Pool of warm processes running CLI conversion jobs.
+
+    Each process runs one job at a time, so jobs do not share working
+    directory, stdout or stdin. A job that kills its process (e.g. out of
+    memory) fails with an error result and the pool is restarted.
+
+    Args:
+        processes: Pool size (default: number of CPUs)
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Forking a process that runs socket server threads is unsafe; a fork
+        # server starts processes from a clean single-threaded one
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=context, initializer=_warm_up
+        )
+        # Start (and warm up) every process now rather than on the first jobs
+        for _ in range(self.processes):
+            pool.submit(int)
+        return pool
+
+    def submit(self, job: Dict[str, object]) -> "Future[Dict[str, object]]":
+        """
+        Start a job.
+
+        Args:
+            job: Dictionary with 'args' (CLI arguments) and optionally 'cwd' and 'id'
+
+        Returns:
+            Future resolving to the result dictionary (see module docstring)
+        """
+        result: Future = Future()
+        args = job.get("args")
+        if not isinstance(args, list):
+            result.set_result(_error(job, "job needs 'args': a list of CLI arguments"))
+            return result
+        with self._lock:
+            pool = self._pool
+            try:
+                future = pool.submit(_run_job, args, job.get("cwd"))
+            except BrokenProcessPool:
+                self._pool = pool = self._new_pool()
+                future = pool.submit(_run_job, args, job.get("cwd"))
+
+        def finish(done: Future) -> None:
+            try:
+                outcome = done.result()
+            except BrokenProcessPool as e:
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = self._new_pool()
+                outcome = _error(job, f"worker process died: {e}")
+            except Exception as e:
+                outcome = _error(job, f"{type(e).__name__}: {e}")
+            if "id" in job:
+                outcome = {"id": job["id"], **outcome}
+            result.set_result(outcome)
+
+        future.add_done_callback(finish)
+        return result
+
+    def run(self, job: Dict[str, object]) -> Dict[str, object]:
+        """Run a job and wait for its result."""
+        return self.submit(job).result()
+
+    def info(self) -> Dict[str, object]:
+        return {"status": "ok", "pid": os.getpid(), "processes": self.processes}
+
+    def close(self) -> None:
+        """Wait for running jobs and stop the pool."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _error(job: Dict[str, object], message: str) -> Dict[str, object]:
+    result = {"status": "error", "exit_code": 1, "elapsed_s": 0.0, "stdout": "", "stderr": message}
+    if "id" in job:
+        result = {"id": job["id"], **result}
+    return result
+
+
+def _serve_lines(worker: ConversionWorker, lines: Iterable[str], write) -> bool:
+    """
+    Submit the jobs in ``lines`` and ``write`` each result line as it finishes.
+
+    Returns:
+        True if a shutdown command was received
+    """
+    write_lock = threading.Lock()
+    pending = []
+
+    def send(result: Dict[str, object]) -> None:
+        with write_lock:
+            try:
+                write(json.dumps(result) + "\n")
+            except OSError:  # the client went away; its jobs still run to completion
+                pass
+
+    def send_when_done(future: Future) -> Future:
+        """Future that resolves once the job's result has been written."""
+        sent = Future()
+
+        def callback(done: Future) -> None:
+            try:
+                send(done.result())
+            finally:
+                sent.set_result(None)
+
+        future.add_done_callback(callback)
+        return sent
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("a job must be a JSON object")
+        except ValueError as e:
+            send(_error({}, f"invalid job: {e}"))
+            continue
+        command = job.get("command")
+        if command == "ping":
+            send(worker.info())
+        elif command == "shutdown":
+            for future in pending:
+                future.result()
+            send({"status": "ok", "command": "shutdown"})
+            return True
+        elif command is not None:
+            send(_error(job, f"unknown command: {command}"))
+        else:
+            pending.append(send_when_done(worker.submit(job)))
+    for future in pending:
+        future.result()
+    return False
+
+
+def serve_stdio(
+    worker: ConversionWorker, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None
+) -> None:
+    """Read jobs from stdin until end of input, writing results to stdout."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+
+    def write(text: str) -> None:
+        stdout.write(text)
+        stdout.flush()
+
+    _serve_lines(worker, stdin, write)
+
+
+def serve_socket(worker: ConversionWorker, path: str) -> None:
+    """
+    Accept jobs on a Unix socket until a shutdown command arrives.
+
+    Each connection can send any number of jobs; a stale socket file left by
+    a worker that is no longer running is replaced.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not available on this platform; use stdin mode")
+    if os.path.exists(path):
+        if ping(path) is not None:
+            raise OSError(f"A worker is already listening on {path}")
+        os.unlink(path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lines = (line.decode("utf-8") for line in self.rfile)
+
+            def write(text: str) -> None:
+                self.wfile.write(text.encode("utf-8"))
+                self.wfile.flush()
+
+            if _serve_lines(worker, lines, write):
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    with Server(path, Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def _connect(path: str, timeout: Optional[float] = None) -> socket.socket:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    client.connect(path)
+    return client
+
+
+def request(path: str, messages: List[Dict[str, object]], timeout: Optional[float] = None):
+    """
+    Send jobs or commands to a worker socket and yield one result per message.
+
+    Results are yielded as the worker finishes them (use 'id' to match them).
+    """
+    with _connect(path, timeout) as client, client.makefile("rwb") as stream:
+        for message in messages:
+            stream.write((json.dumps(message) + "\n").encode("utf-8"))
+        stream.flush()
+        client.shutdown(socket.SHUT_WR)
+        for _ in messages:
+            line = stream.readline()
+            if not line:
+                raise ConnectionError("Worker closed the connection before answering")
+            yield json.loads(line)
+
+
+def submit_job(
+    path: str, args: List[str], cwd: Optional[str] = None, timeout: Optional[float] = None
+) -> Dict[str, object]:
+    """
+    Run one CLI conversion on the worker listening on ``path`` and wait for it.
+
+    Args:
+        path: Worker socket
+        args: ``bioconverter`` CLI arguments
+        cwd: Directory relative paths are resolved against (default: current directory)
+        timeout: Seconds to wait for the result
+
+    Returns:
+        Result dictionary (status, exit_code, elapsed_s, stdout, stderr)
+    """
+    job = {"args": list(args), "cwd": cwd or os.getcwd()}
+    return next(request(path, [job], timeout))
+
+
+def ping(path: str, timeout: float = 2.0) -> Optional[Dict[str, object]]:
+    """The worker's pid and pool size, or None if no worker answers on ``path``."""
+    try:
+        return next(request(path, [{"command": "ping"}], timeout))
+    except (OSError, ValueError, StopIteration):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run bioconverter conversions on a long-lived pool of warm worker processes",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Start a worker")
+    serve.add_argument(
+        "--socket",
+        help="Unix socket to listen on (default: read jobs from stdin, write results to stdout)",
+    )
+    serve.add_argument(
+        "--processes", type=int, help="Worker processes (default: number of CPUs)"
+    )
+
+    submit = commands.add_parser(
+        "submit",
+        help="Send a conversion to a worker and wait for it",
+        description="Send a conversion to a worker and wait for it; arguments after "
+        "'--' are bioconverter CLI arguments. Exits with the conversion's exit code.",
+    )
+    submit.add_argument("--socket", required=True, help="Worker socket")
+    submit.add_argument(
+        "--jobs",
+        metavar="FILE",
+        help="Send the JSON-lines jobs in FILE ('-' for stdin) instead, printing "
+        "one result line per job",
+    )
+    submit.add_argument("--timeout", type=float, help="Seconds to wait for the result")
+    submit.add_argument("args", nargs=argparse.REMAINDER, help="bioconverter CLI arguments")
+
+    for name, help_text in (("ping", "Check that a worker is running"), ("shutdown", "Stop a worker")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--socket", required=True, help="Worker socket")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        with ConversionWorker(args.processes) as worker:
+            if args.socket:
+                print(f"Worker {os.getpid()} listening on {args.socket}", file=sys.stderr)
+                serve_socket(worker, args.socket)
+            else:
+                serve_stdio(worker)
+        return 0
+
+    if args.command == "ping":
+        info = ping(args.socket)
+        if info is None:
+            print(f"No worker is listening on {args.socket}", file=sys.stderr)
+            return 1
+        print(f"Worker {info['pid']} is running with {info['processes']} processes")
+        return 0
+
+    if args.command == "shutdown":
+        next(request(args.socket, [{"command": "shutdown"}]))
+        return 0
+
+    if args.jobs:
+        handle = sys.stdin if args.jobs == "-" else open(args.jobs, encoding="utf-8")
+        jobs = []
+        failed = 0
+        with handle:
+            for number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    jobs.append({"cwd": os.getcwd(), **json.loads(line)})
+                except (ValueError, TypeError) as e:
+                    print(f"{args.jobs}:{number}: invalid job: {e}", file=sys.stderr)
+                    failed += 1
+        for result in request(args.socket, jobs, args.timeout):
+            failed += result.get("status") != "ok"
+            print(json.dumps(result), flush=True)
+        return 1 if failed else 0
+
+    cli_args = args.args[1:] if args.args[:1] == ["--"] else args.args
+    if not cli_args:
+        parser.error("submit needs bioconverter CLI arguments after '--' (or --jobs)")
+    result = submit_job(args.socket, cli_args, timeout=args.timeout)
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
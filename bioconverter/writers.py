@@ -0,0 +1,372 @@
+"""
+Table Writers Module
+Incremental writers used when output is produced chunk by chunk
+"""
+
+import pandas as pd
+from typing import BinaryIO, List, Optional
+
+from .bgzf import BgzfTableWriter
+from .dataset import (
+    DEFAULT_ROW_GROUP_SIZE,
+    ParquetDatasetWriter,
+    conform_to_schema,
+    pin_standard_types,
+    unify_schemas,
+    with_string_column,
+)
+from .decompression import require_codec
+from .genomic_index import IndexedTableWriter
+from .stage_timing import StageTimer, TimedSink
+
+
+OUTPUT_SEPARATORS = {"tsv": "\t", "csv": ","}
+
+# Arrow IPC file output; Feather v2 is the same format
+ARROW_FORMATS = ("arrow", "feather")
+
+# Buffer compressions supported by the Arrow IPC format
+ARROW_COMPRESSIONS = ("lz4", "zstd")
+
+# Codecs of Parquet output
+PARQUET_CODECS = ("snappy", "gzip", "brotli", "lz4", "zstd")
+
+# Compression level used when none is given, per codec
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 6, "bgzip": 6, "zstd": 3, "lz4": 0}
+
+# File extension appended to compressed text output
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "bgzip": ".gz", "zstd": ".zst", "lz4": ".lz4"}
+
+
+def open_output(
+    output_file: str,
+    compression: str,
+    level: Optional[int] = None,
+    threads: Optional[int] = None,
+) -> BinaryIO:
+    """
+    Open a streaming compressed binary output.
+
+    Args:
+        output_file: Output path
+        compression: 'zstd' (multithreaded) or 'lz4'
+        level: Compression level (default: DEFAULT_COMPRESSION_LEVELS)
+        threads: zstd compression threads (default: number of CPUs)
+
+    Returns:
+        Writable binary file object; closing it finishes the compressed stream
+    """
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVELS[compression]
+    if compression == "zstd":
+        compressor = require_codec("zstd").ZstdCompressor(level=level, threads=threads or -1)
+        return compressor.stream_writer(open(output_file, "wb"), closefd=True)
+    if compression == "lz4":
+        return require_codec("lz4").open(output_file, "wb", compression_level=level)
+    raise ValueError(f"Unsupported output compression: {compression}")
+
+
+class StreamTableWriter:
+    """Appends DataFrames as delimited text to a zstd or lz4 stream."""
+
+    def __init__(
+        self,
+        output_file: str,
+        sep: str = ",",
+        compression: str = "zstd",
+        level: Optional[int] = None,
+        threads: Optional[int] = None,
+        header: bool = True,
+        timer: Optional[StageTimer] = None,
+    ):
+        self.output_file = str(output_file)
+        self.sep = sep
+        self._handle = open_output(self.output_file, compression, level=level, threads=threads)
+        if timer is not None:
+            self._handle = TimedSink(self._handle, timer)
+        self._first = header
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append rows (with a header on the first call)."""
+        data = df.to_csv(sep=self.sep, index=False, header=self._first, lineterminator="\n")
+        self._handle.write(data.encode("utf-8"))
+        self._first = False
+
+    def close(self) -> None:
+        """Finish the compressed stream."""
+        if not self._handle.closed:
+            self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class DelimitedTableWriter:
+    """Appends DataFrames to a plain delimited text file."""
+
+    def __init__(
+        self, output_file: str, sep: str = ",", header: bool = True, append: bool = False
+    ):
+        self.output_file = str(output_file)
+        self.sep = sep
+        self.header = header
+        self._first = not append
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append rows (with a header on the first call)."""
+        df.to_csv(
+            self.output_file,
+            sep=self.sep,
+            index=False,
+            mode="w" if self._first else "a",
+            header=self._first and self.header,
+        )
+        self._first = False
+
+    def flush(self) -> None:
+        """Nothing is buffered: every write appends to the file and closes it."""
+
+    def close(self) -> None:
+        """Create an empty file if nothing was written."""
+        if self._first:
+            open(self.output_file, "w").close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ArrowTableWriter:
+    """
+    Appends DataFrames to an Arrow IPC (Feather v2) file as record batches.
+
+    Uncompressed files can be memory-mapped by readers and their columns used
+    without copying or parsing, e.g. ``pyarrow.ipc.open_file(pa.memory_map(path))``
+    or ``pd.read_feather(path)``. lz4/zstd buffer compression trades that
+    zero-copy access for smaller files. The schema is the one given, or that
+    of the first write with standard columns in their 64-bit types (see
+    ``pin_standard_types``); the chromosome column is always stored as a string.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        compression: Optional[str] = None,
+        chr_col: str = "chr",
+        schema=None,
+    ):
+        if compression is not None and compression not in ARROW_COMPRESSIONS:
+            raise ValueError(f"Arrow IPC supports only lz4/zstd compression, not {compression}")
+        self.output_file = str(output_file)
+        self.compression = compression
+        self.chr_col = chr_col
+        self.schema = schema
+        self._sink = None
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append rows as record batches."""
+        import pyarrow as pa
+
+        if self._writer is None:
+            self.schema = with_string_column(
+                self.schema or pin_standard_types(unify_schemas([df])), self.chr_col
+            )
+            self._sink = pa.OSFile(self.output_file, "wb")
+            self._writer = pa.ipc.new_file(
+                self._sink,
+                self.schema,
+                options=pa.ipc.IpcWriteOptions(compression=self.compression),
+            )
+        self._writer.write_table(conform_to_schema(df, self.schema))
+
+    def close(self) -> None:
+        """Write the IPC file footer (an empty table if nothing was written)."""
+        if self._writer is None:
+            self.write(pd.DataFrame())
+        if self._sink is not None and not self._sink.closed:
+            self._writer.close()
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetTableWriter:
+    """
+    Appends DataFrames to a single Parquet file, as row groups of at most
+    ``row_group_size`` rows. The schema is the one given, or that of the
+    first write with standard columns in their 64-bit types (see
+    ``pin_standard_types``); the chromosome column is always stored as a string.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        compression: str = "snappy",
+        row_group_size: Optional[int] = None,
+        chr_col: str = "chr",
+        schema=None,
+    ):
+        self.output_file = str(output_file)
+        self.compression = compression
+        self.row_group_size = row_group_size or DEFAULT_ROW_GROUP_SIZE
+        self.chr_col = chr_col
+        self.schema = schema
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append rows as one or more row groups."""
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self.schema = with_string_column(
+                self.schema or pin_standard_types(unify_schemas([df])), self.chr_col
+            )
+            self._writer = pq.ParquetWriter(
+                self.output_file, self.schema, compression=self.compression
+            )
+        if len(df):
+            self._writer.write_table(
+                conform_to_schema(df, self.schema), row_group_size=self.row_group_size
+            )
+
+    def close(self) -> None:
+        """Write the Parquet footer (an empty file if nothing was written)."""
+        if self._writer is None:
+            self.write(pd.DataFrame())
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def parquet_codec(compression: Optional[str]) -> str:
+    """Parquet codec for an output compression: 'bgzip' is written as gzip,
+    None and codecs Parquet lacks (e.g. 'bz2') as the default snappy."""
+    codec = {"bgzip": "gzip"}.get(compression, compression)
+    return codec if codec in PARQUET_CODECS else "snappy"
+
+
+def open_table_writer(
+    output_file: str,
+    output_format: str = "csv",
+    compression: Optional[str] = None,
+    write_index: bool = False,
+    index_format: str = "tbi",
+    level: Optional[int] = None,
+    threads: Optional[int] = None,
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: Optional[int] = None,
+    header: bool = True,
+    append: bool = False,
+    timer: Optional[StageTimer] = None,
+    schema=None,
+):
+    """
+    Open an incremental writer for chunked output.
+
+    Args:
+        output_file: Output path (dataset root directory for 'dataset')
+        output_format: 'csv', 'tsv', 'parquet', 'dataset' (Hive-partitioned
+            Parquet) or 'arrow'/'feather' (Arrow IPC file)
+        compression: None, 'gzip', 'bgzip', 'zstd' or 'lz4'. gzip and bgzip
+            write BGZF blocks compressed in parallel; only 'bgzip' can be
+            indexed. zstd compresses on multiple threads. Arrow output
+            accepts only None, 'lz4' or 'zstd'; Parquet output takes a
+            Parquet codec ('snappy', 'zstd', ...; None and 'bgzip' as for datasets).
+        write_index: Rows arrive coordinate-sorted; write an index alongside.
+            Uncompressed output gets a block index (``<output>.idx.json``),
+            bgzip TSV output gets a tabix index (``<output>.tbi``/``.csi``).
+        index_format: Tabix index format for bgzip output ('tbi' or 'csi')
+        level: Compression level (default: DEFAULT_COMPRESSION_LEVELS; gzip
+            1-9, zstd 1-22, lz4 0-16; lower is faster)
+        threads: Compression threads (default: number of CPUs)
+        partition_cols: Partition columns for 'dataset' output
+        row_group_size: Rows per Parquet row group for 'parquet'/'dataset' output
+        header: Write a header line (text output); False for parts that are
+            concatenated after a header
+        append: Append to an existing file without a header (unindexed csv/tsv,
+            plain or gzip/bgzip), e.g. when resuming from a checkpoint
+        timer: Time compression of gzip/bgzip/zstd/lz4 text output as the
+            'compress' stage, apart from formatting rows
+        schema: pyarrow.Schema of 'parquet', 'dataset' and Arrow output
+            (default: that of the first write)
+
+    Returns:
+        Writer object with ``write(df)`` and ``close()`` methods
+    """
+    if output_format == "dataset":
+        if write_index:
+            raise ValueError("Datasets are not indexed; use partition_cols and row group statistics")
+        return ParquetDatasetWriter(
+            output_file,
+            partition_cols=partition_cols,
+            row_group_size=row_group_size or DEFAULT_ROW_GROUP_SIZE,
+            compression=parquet_codec(compression),
+            schema=schema,
+        )
+    if output_format == "parquet":
+        if write_index:
+            raise ValueError("Streamed Parquet output is not indexed; use write_indexed_table")
+        return ParquetTableWriter(
+            output_file,
+            compression=parquet_codec(compression),
+            row_group_size=row_group_size,
+            schema=schema,
+        )
+    if output_format in ARROW_FORMATS:
+        if write_index:
+            raise ValueError("Arrow IPC output is not indexed")
+        return ArrowTableWriter(output_file, compression=compression, schema=schema)
+    if output_format not in OUTPUT_SEPARATORS:
+        raise ValueError(f"Unsupported output format for chunked output: {output_format}")
+    sep = OUTPUT_SEPARATORS[output_format]
+    if append and (write_index or compression not in (None, "gzip", "bgzip")):
+        raise ValueError("Only unindexed plain or gzip/bgzip text output can be appended to")
+    if level is None and compression is not None:
+        level = DEFAULT_COMPRESSION_LEVELS.get(compression)
+
+    if compression in ("gzip", "bgzip"):
+        if write_index and compression == "gzip":
+            raise ValueError("Indexes require bgzip or uncompressed output")
+        if write_index and output_format != "tsv":
+            raise ValueError("Tabix indexes require TSV output")
+        return BgzfTableWriter(
+            output_file,
+            sep=sep,
+            index_format=index_format if write_index else None,
+            level=level,
+            threads=threads,
+            header=header,
+            append=append,
+            timer=timer,
+        )
+    if compression in ("zstd", "lz4"):
+        if write_index:
+            raise ValueError("Indexes require bgzip or uncompressed output")
+        return StreamTableWriter(
+            output_file,
+            sep=sep,
+            compression=compression,
+            level=level,
+            threads=threads,
+            header=header,
+            timer=timer,
+        )
+    if compression is not None:
+        raise ValueError(f"Unsupported compression for chunked output: {compression}")
+    if write_index:
+        return IndexedTableWriter(output_file, output_format)
+    return DelimitedTableWriter(output_file, sep=sep, header=header, append=append)
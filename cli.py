@@ -4,29 +4,49 @@ Command-line interface for the Bioinformatics Data Converter
 """
 
 import argparse
+import contextlib
+import glob
+import io
 import sys
+import time
 from pathlib import Path
-import pandas as pd
-from bioconverter.convertor import (
-    convert_single_file,
-    detect_file_format,
-    standardize_columns,
-    read_data,
-)
-from bioconverter.interactive_converter import (
-    interactive_column_mapping,
-    preview_mapping,
-    process_large_file,
-    get_file_size_gb,
-    suggest_chunk_size,
-    auto_suggest_mapping,
-    auto_detect_omics_type,
-    create_omics_column_patterns,
+from typing import Dict, List, Optional
+
+from bioconverter.patterns import create_omics_column_patterns
+
+# Arguments that do not change the converted output (left out of cache keys)
+CACHE_NEUTRAL_ARGS = (
+    "input",
+    "output",
+    "verbose",
+    "cache_dir",
+    "generate_report",
+    "report_dir",
+    "info_only",
+    "preview",
+    "show_patterns",
+    "interactive",
+    "batch_interactive",
+    "auto_suggest",
+    "map",
+    "memory",
+    "threads",
+    "workers",
+    "resume",
+    "memory_map",
+    "decompressor",
+    "temp_dir",
+    "profile",
+    "sample_profile",
+    "trace",
+    "progress",
+    "metadata",
+    "file_column",
+    "output_dir",
 )
-from bioconverter.conversion_report import ConversionReport
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Bioinformatics Data Converter - Convert various omics data formats to unified format",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -47,6 +67,12 @@ Examples:
   # Detect file information only
   %(prog)s -i input.vcf.gz --info-only
 
+  # Convert many files, four at a time, with a summary report
+  %(prog)s -i "data/*.tsv.gz" --output-dir converted --workers 4
+
+  # Convert the files listed in a metadata TSV, adding its columns to each output
+  %(prog)s --metadata studies.tsv --output-dir converted --workers 4
+
 Supported data types:
   - Genomics: VCF, GWAS summary statistics, SNP data
   - Transcriptomics: RNA-seq counts, FPKM/TPM, differential expression
@@ -56,12 +82,46 @@ Supported data types:
     )
 
     # Input/Output arguments
-    parser.add_argument("-i", "--input", help="Input file path")
+    parser.add_argument(
+        "-i",
+        "--input",
+        nargs="+",
+        help="Input file path(s) or glob patterns; several inputs are converted "
+        "as a batch into --output-dir",
+    )
     parser.add_argument(
         "-o",
         "--output",
         help="Output file path (required unless --info-only is specified)",
     )
+    parser.add_argument(
+        "--output-dir",
+        help="Output directory for a batch; each input is written to "
+        "standardized_<name>.<format>[.gz] in it",
+    )
+    parser.add_argument(
+        "--metadata",
+        metavar="TSV",
+        help="Metadata table of the files to convert (tab-separated, with a header); "
+        "its other columns are added to each file's output as constant columns",
+    )
+    parser.add_argument(
+        "--file-column",
+        default="file",
+        help="Column of --metadata holding the file paths (default: file)",
+    )
+    parser.add_argument(
+        "--add-column",
+        action="append",
+        metavar="NAME=VALUE",
+        help="Add a constant column to the output (repeatable)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Merge all inputs into the one table -o/--output, streamed chunk by chunk "
+        "with a unified schema (columns an input lacks are written as nulls)",
+    )
 
     # File format arguments
     parser.add_argument(
@@ -69,7 +129,7 @@ Supported data types:
     )
     parser.add_argument(
         "--compression",
-        choices=["gzip", "bz2", "zip", "xz"],
+        choices=["gzip", "bz2", "zip", "xz", "zstd", "lz4"],
         help="Compression format (auto-detected if not specified)",
     )
     parser.add_argument("--comment", help="Comment character for lines to skip")
@@ -113,15 +173,126 @@ Supported data types:
         action="store_true",
         help="Keep columns that don't match any standard pattern",
     )
+    parser.add_argument(
+        "--coerce-types",
+        action="store_true",
+        help="Coerce standard columns (pval, beta, se, n, ...) to numeric dtypes",
+    )
+    parser.add_argument(
+        "--downcast",
+        action="store_true",
+        help="With --coerce-types, narrow numeric columns to float32/int32 where lossless "
+        "(in-memory conversion only)",
+    )
+    parser.add_argument(
+        "--derive-stats",
+        action="store_true",
+        help="Fill missing beta/se/or/z/pval from the statistics present",
+    )
+    parser.add_argument(
+        "--variant-key",
+        action="store_true",
+        help="Add a packed 64-bit variant_key column (chromosome code, position, "
+        "allele hash) for integer joins and deduplication",
+    )
     parser.add_argument(
         "--output-format",
-        choices=["csv", "tsv", "parquet"],
+        choices=["csv", "tsv", "parquet", "dataset", "arrow", "feather"],
         default="tsv",
         help="Output format (default: tsv)",
     )
     parser.add_argument(
         "--no-compression", action="store_true", help="Don't compress output file"
     )
+    parser.add_argument(
+        "--partition-by",
+        help="Comma-separated partition columns for --output-format dataset "
+        "(a Hive-partitioned Parquet directory), e.g. chr",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        # Literal so that building the parser does not import pandas (dataset.DEFAULT_ROW_GROUP_SIZE)
+        help="Rows per Parquet row group for parquet/dataset output (dataset default: 131072)",
+    )
+    parser.add_argument(
+        "--output-compression",
+        choices=["gzip", "bgzip", "zstd", "lz4"],
+        default="gzip",
+        help="Output compression for text formats; bgzip output is randomly accessible "
+        "and gets a tabix index with --sort/--index; zstd/lz4 are fast for "
+        "intermediate files (default: gzip)",
+    )
+    parser.add_argument(
+        "--index-format",
+        choices=["tbi", "csi"],
+        default="tbi",
+        help="Tabix index format for bgzip output (default: tbi; csi for contigs > 512 Mb)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        help="Output compression level, lower is faster: gzip/bgzip 1-9 (default 6), "
+        "zstd 1-22 (default 3), lz4 0-16 (default 0)",
+    )
+    parser.add_argument(
+        "--sort",
+        action="store_true",
+        help="Sort output by chromosome and position (external merge sort for chunked files)",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Write an index for region queries (tabix for bgzip output, "
+        "<output>.idx.json otherwise); implies --sort",
+    )
+    parser.add_argument(
+        "--temp-dir",
+        help="Directory for temporary sort runs (default: system temp dir)",
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        help="Only convert records in this region, e.g. chr6:28M-34M (repeatable); "
+        "uses a .tbi/.csi or .idx.json index when present",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="Threads for parallel BGZF decompression of input and gzip/bgzip/zstd "
+        "compression of output (default: all CPUs)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Parse byte ranges of a large uncompressed or BGZF input in this many "
+        "processes (chunked mode); for a batch, the number of files converted at once",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Checkpoint chunked conversion after every chunk (<output>.checkpoint.json) "
+        "and resume an interrupted run from it",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Content-addressed output cache: reuse (hardlink) the output of an earlier "
+        "conversion of identical input contents with identical options",
+    )
+    parser.add_argument(
+        "--memory-map",
+        action="store_true",
+        help="Read uncompressed input through mmap (parser reads mapped pages directly)",
+    )
+    parser.add_argument(
+        "--decompressor",
+        choices=["auto", "igzip", "pigz"],
+        help="External program for decompressing plain (non-BGZF) gzip input",
+    )
+    parser.add_argument(
+        "--regions-bed",
+        help="Only convert records overlapping the regions in this BED file",
+    )
 
     # Information and debugging
     parser.add_argument(
@@ -138,6 +309,29 @@ Supported data types:
         action="store_true",
         help="Show all supported column name patterns and exit",
     )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Profile the conversion with cProfile and write pstats output to FILE",
+    )
+    parser.add_argument(
+        "--sample-profile",
+        metavar="FILE",
+        help="Profile the conversion by stack sampling (low overhead) and write "
+        "folded stacks for flame graphs to FILE",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Append OpenTelemetry-style spans for the conversion, its stages and "
+        "chunks to FILE (JSON lines)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show live progress, throughput and ETA on stderr (based on the bytes "
+        "of input consumed, so it works for compressed input too)",
+    )
 
     # Report generation
     parser.add_argument(
@@ -157,7 +351,7 @@ Supported data types:
         help="Directory for conversion reports (default: same as output)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Show patterns and exit if requested
     if args.show_patterns:
@@ -165,21 +359,413 @@ Supported data types:
         return 0
 
     # Validate input argument
-    if not args.input:
+    if not args.input and not args.metadata:
         parser.error("-i/--input is required unless --show-patterns is specified")
+    try:
+        inputs = expand_inputs(args.input or [])
+        parse_added_columns(args.add_column)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Several inputs (or a glob matching several files) and metadata tables are batches
+    if args.metadata or args.output_dir or args.merge or len(inputs) > 1:
+        return run_batch(args, inputs, parser)
+    args.input = inputs[0]
 
     # Validate output argument
     if not args.info_only and not args.output:
         parser.error("--output is required unless --info-only is specified")
 
+    return convert_file(args)
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """
+    Input paths for -i/--input values, expanding glob patterns.
+
+    Existing paths are kept as given, even if they contain glob characters;
+    a pattern's matches are sorted, and paths given twice are converted once.
+
+    Raises:
+        ValueError: If a pattern matches no file
+    """
+    inputs = []
+    for pattern in patterns:
+        if glob.has_magic(pattern) and not Path(pattern).exists():
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise ValueError(f"No input files match: {pattern}")
+            inputs.extend(matches)
+        else:
+            inputs.append(pattern)
+    return list(dict.fromkeys(inputs))
+
+
+def parse_added_columns(values: Optional[List[str]]) -> Dict[str, str]:
+    """
+    Constant output columns from --add-column NAME=VALUE arguments.
+
+    Raises:
+        ValueError: If a value is not NAME=VALUE
+    """
+    columns = {}
+    for value in values or []:
+        name, equals, constant = value.partition("=")
+        if not equals or not name.strip():
+            raise ValueError(f"--add-column expects NAME=VALUE, got: {value}")
+        columns[name.strip()] = constant
+    return columns
+
+
+def batch_output_name(filename: str, args: argparse.Namespace) -> str:
+    """Output name of one input of a batch, named as ``save_results`` names its files."""
+    name = f"standardized_{Path(filename).stem.split('.')[0]}"
+    if args.output_format == "dataset":
+        return name
+    if args.output_format in ("parquet", "arrow", "feather") or args.no_compression:
+        return f"{name}.{args.output_format}"
+    extension = {"gzip": ".gz", "bgzip": ".gz", "zstd": ".zst", "lz4": ".lz4"}
+    return f"{name}.{args.output_format}{extension[args.output_compression]}"
+
+
+def read_metadata_table(filename: str, file_column: str) -> Dict[str, Dict[str, str]]:
+    """
+    Files listed in a metadata TSV, as ``convert_from_metadata`` takes them.
+
+    Returns:
+        Dictionary of file path -> {metadata column: value} for its other columns
+
+    Raises:
+        ValueError: If the table has no ``file_column`` column
+    """
+    import csv
+
+    with open(filename, newline="") as handle:
+        reader = csv.DictReader(handle, delimiter="\t")
+        if file_column not in (reader.fieldnames or []):
+            raise ValueError(f"Column '{file_column}' not found in {filename}")
+        files = {}
+        for row in reader:
+            path = (row.pop(file_column) or "").strip()
+            if path:
+                files[path] = {column: value for column, value in row.items() if column}
+    return files
+
+
+def _convert_batch_file(args: argparse.Namespace) -> Dict[str, object]:
+    """Convert one file of a batch in a pool process, capturing its console output."""
+    outcome = {"input": args.input, "output": args.output, "rows": None, "error": None}
+    stdout, stderr = io.StringIO(), io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            exit_code = convert_file(args, outcome)
+        except Exception as e:  # failures before the conversion starts
+            print(f"Error during conversion: {e}", file=sys.stderr)
+            exit_code = 1
+    outcome.update(
+        exit_code=exit_code,
+        elapsed_s=time.perf_counter() - started,
+        stdout=stdout.getvalue(),
+        stderr=stderr.getvalue(),
+    )
+    return outcome
+
+
+def run_batch(args: argparse.Namespace, inputs: List[str], parser: argparse.ArgumentParser) -> int:
+    """
+    Convert several inputs (-i values and globs, and the files of --metadata)
+    into --output-dir, ``--workers`` files at a time.
+
+    Every file is converted with the options given, in a pool process of its
+    own, so one failing file does not stop the others. Its console output is
+    captured and shown only if it fails (or with --verbose); a summary report
+    of all files is written to the report directory.
+
+    Returns:
+        Exit status: 0 if every file was converted
+    """
+    if args.interactive or args.batch_interactive:
+        parser.error("Interactive mapping converts one file; use --auto-suggest or --map for a batch")
+    if args.merge:
+        if not args.output and not args.info_only:
+            parser.error("--merge writes one table; name it with -o/--output")
+    elif args.output:
+        parser.error("-o/--output names a single output; use --output-dir for a batch, or --merge")
+    elif not args.output_dir and not args.info_only:
+        parser.error("--output-dir is required with several inputs or --metadata")
+
+    files = dict.fromkeys(inputs, {})
+    if args.metadata:
+        try:
+            files.update(read_metadata_table(args.metadata, args.file_column))
+        except (OSError, ValueError) as e:
+            parser.error(f"Cannot read --metadata: {e}")
+    if not files:
+        parser.error(f"No files listed in {args.metadata}")
+
+    if args.info_only:
+        status = 0
+        for filename in files:
+            status = max(status, convert_file(argparse.Namespace(**{**vars(args), "input": filename})))
+        return status
+    if args.merge:
+        return run_merge(args, files)
+
+    # Two inputs named alike would overwrite each other's output
+    names = {}
+    for filename in files:
+        name = batch_output_name(filename, args)
+        if name in names:
+            parser.error(f"{names[name]} and {filename} would both be written to {name}")
+        names[name] = filename
+
+    profiling = [
+        flag
+        for flag, value in (
+            ("--profile", args.profile),
+            ("--sample-profile", args.sample_profile),
+            ("--trace", args.trace),
+        )
+        if value
+    ]
+    if profiling:
+        print(f"Warning: {', '.join(profiling)} not supported for batches; ignored", file=sys.stderr)
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from bioconverter.conversion_report import BatchReport
+    from bioconverter.progress import ProgressBar, ProgressHook
+    from bioconverter.stage_timing import StageTimer, path_size
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_dir = Path(args.report_dir or output_dir)
+    tasks = []
+    for name, filename in names.items():
+        tasks.append(argparse.Namespace(**{
+            **vars(args),
+            "input": filename,
+            "output": str(output_dir / name),
+            # Columns from the metadata table win over --add-column
+            "add_column": (args.add_column or []) + [
+                f"{column}={value}" for column, value in files[filename].items()
+            ],
+            "report_dir": str(report_dir / "reports" / name),
+            "workers": None,
+            "metadata": None,
+            "output_dir": None,
+            "profile": None,
+            "sample_profile": None,
+            "trace": None,
+            "progress": False,
+        }))
+
+    workers = max(1, min(args.workers or 1, len(tasks)))
+    hooks = []
+    if args.progress:
+        hooks.append(ProgressHook(ProgressBar(), interval=0.2 if sys.stderr.isatty() else 10))
+    timer = StageTimer(hooks)
+    report = BatchReport()
+    started = time.perf_counter()
+    print(f"Converting {len(tasks)} files into {output_dir} ({workers} at a time)")
+
+    with timer.conversion(function="cli_batch", inputs=list(names.values())) as outcome:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_convert_batch_file, task): task for task in tasks}
+            for done, future in enumerate(as_completed(futures), 1):
+                task = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # the worker process died
+                    result = {
+                        "input": task.input, "output": task.output, "rows": None,
+                        "error": f"{type(e).__name__}: {e}", "exit_code": 1,
+                        "elapsed_s": None, "stdout": "", "stderr": "",
+                    }
+                ok = result["exit_code"] == 0
+                error = None
+                if not ok:
+                    lines = result["stderr"].strip().splitlines()
+                    error = result["error"] or (lines[-1] if lines else "conversion failed")
+                report.add_file(
+                    task.input,
+                    task.output,
+                    "ok" if ok else "failed",
+                    rows=result["rows"],
+                    elapsed_s=round(result["elapsed_s"], 3) if result["elapsed_s"] is not None else None,
+                    output_size_mb=round(path_size(task.output) / 1e6, 3) if ok else None,
+                    error=error,
+                )
+                timer.progress(input=task.input, rows=result["rows"], done=True)
+
+                if ok:
+                    rows = f"{result['rows']:,} rows, " if result["rows"] is not None else ""
+                    print(f"[{done}/{len(tasks)}] {task.input} -> {task.output} "
+                          f"({rows}{result['elapsed_s']:.1f}s)")
+                else:
+                    print(f"[{done}/{len(tasks)}] FAILED {task.input}: {error}", file=sys.stderr)
+                if args.verbose and result["stdout"].strip():
+                    print(result["stdout"].rstrip())
+                if args.verbose and result["stderr"].strip():
+                    print(result["stderr"].rstrip(), file=sys.stderr)
+        outcome["rows"] = report.total_rows
+
+    # Report files in the order given rather than the order they finished
+    order = {task.input: i for i, task in enumerate(tasks)}
+    report.files.sort(key=lambda record: order[record["input"]])
+    report.set_processing_info(elapsed_s=round(time.perf_counter() - started, 3), workers=workers)
+    if args.generate_report:
+        report.save_report(str(report_dir), "batch_report")
+    report.print_summary()
+    for hook in hooks:
+        hook.close()
+    return 1 if report.failed else 0
+
+
+def run_merge(args: argparse.Namespace, files: Dict[str, Dict[str, str]]) -> int:
+    """
+    Merge the inputs of a batch into the single table -o/--output.
+
+    Inputs are converted one chunk at a time in the order given and appended
+    to one writer (see ``merge_files``), so memory is bounded by a chunk, not
+    by the inputs; --workers does not apply.
+
+    Returns:
+        Exit status
+    """
+    from bioconverter.conversion_report import BatchReport
+    from bioconverter.merge import merge_files
+    from bioconverter.profiling import CProfileHook, SamplingProfilerHook, TraceFileHook
+    from bioconverter.progress import ProgressBar, ProgressHook
+
+    if args.sort or args.index or args.region or args.regions_bed:
+        print("Warning: --sort, --index and region reads do not apply to --merge; ignored",
+              file=sys.stderr)
+    if args.downcast:
+        print("Warning: --downcast does not apply to --merge; ignored", file=sys.stderr)
+    column_mapping = None
+    if args.map:
+        column_mapping = {}
+        for pair in args.map.split(","):
+            if "=" in pair:
+                old, new = pair.split("=", 1)
+                column_mapping[old.strip()] = new.strip()
+    added_columns = parse_added_columns(args.add_column)
+
+    hooks = []
+    if args.profile:
+        hooks.append(CProfileHook(args.profile))
+    if args.sample_profile:
+        hooks.append(SamplingProfilerHook(args.sample_profile))
+    if args.trace:
+        hooks.append(TraceFileHook(args.trace))
+    if args.progress:
+        hooks.append(ProgressHook(ProgressBar(), interval=0.2 if sys.stderr.isatty() else 10))
+
+    started = time.perf_counter()
+    try:
+        summary = merge_files(
+            list(files),
+            args.output,
+            output_format=args.output_format,
+            compression=None if args.no_compression else args.output_compression,
+            column_mapping=column_mapping,
+            keep_unmatched=args.keep_unmatched,
+            coerce_types=args.coerce_types,
+            derive_stats=args.derive_stats,
+            variant_key=args.variant_key,
+            # Columns from the metadata table win over --add-column
+            metadata={filename: {**added_columns, **columns} for filename, columns in files.items()},
+            chunksize=args.chunk_size or 100000,
+            partition_cols=(
+                [col.strip() for col in args.partition_by.split(",") if col.strip()]
+                if args.partition_by
+                else None
+            ),
+            row_group_size=args.row_group_size,
+            compression_level=args.compression_level,
+            threads=args.threads,
+            verbose=True,
+            hooks=hooks,
+        )
+    except Exception as e:
+        print(f"\nError during merge: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+
+            traceback.print_exc()
+        return 1
+    finally:
+        for hook in hooks:
+            hook.close()
+
+    report = BatchReport()
+    for filename, rows in summary["files"].items():
+        report.add_file(filename, args.output, "ok", rows=rows)
+    report.set_processing_info(elapsed_s=round(time.perf_counter() - started, 3), workers=1)
+    if args.generate_report:
+        report.save_report(str(args.report_dir or Path(args.output).parent), "merge_report")
+    report.print_summary()
+    print(f"Columns: {', '.join(summary['columns'])}")
+    return 0
+
+
+def convert_file(args: argparse.Namespace, outcome: Optional[Dict[str, object]] = None) -> int:
+    """
+    Convert (or with --info-only, describe) the single input ``args.input``.
+
+    Args:
+        args: Parsed command-line arguments
+        outcome: Dictionary to record the conversion's 'rows' and 'error' in
+
+    Returns:
+        Exit status
+    """
     # Get input file info
     input_path = Path(args.input)
     if not input_path.exists():
         print(f"Error: Input file not found: {args.input}", file=sys.stderr)
         return 1
 
+    # Imported here rather than at module level so that --help and
+    # --show-patterns start without loading pandas, pyarrow and scipy
+    import pandas as pd
+    from bioconverter.convertor import (
+        convert_single_file,
+        detect_file_format,
+        standardize_columns,
+        read_data,
+        read_delimited,
+        parse_regions,
+    )
+    from bioconverter.interactive_converter import (
+        interactive_column_mapping,
+        preview_mapping,
+        process_large_file,
+        get_file_size_gb,
+        suggest_chunk_size,
+        auto_suggest_mapping,
+        auto_detect_omics_type,
+    )
+    from bioconverter.conversion_report import ConversionReport
+    from bioconverter.coercion import coerce_standard_columns, text_read_dtypes
+    from bioconverter.derivation import derive_statistics
+    from bioconverter.genomic_index import sort_by_coordinates, write_indexed_table
+    from bioconverter.variants import VARIANT_KEY_COLUMN, add_variant_key
+    from bioconverter.writers import open_table_writer
+    from bioconverter.dataset import DEFAULT_ROW_GROUP_SIZE, write_parquet_dataset
+    from bioconverter.cache import ConversionCache, cache_key, unlink_shared
+    from bioconverter.manifest import file_hash
+    from bioconverter.profiling import CProfileHook, SamplingProfilerHook, TraceFileHook
+    from bioconverter.progress import ProgressBar, ProgressHook
+    from bioconverter.stage_timing import StageTimer
+
+    # Time spent in each stage, for the conversion report
+    timer = StageTimer()
+
     # Auto-detect file format
-    sep, compression, comment, is_vcf = detect_file_format(args.input)
+    with timer.stage("sniff"):
+        sep, compression, comment, is_vcf = detect_file_format(args.input)
 
     # Override with user-specified values
     if args.sep:
@@ -207,20 +793,23 @@ Supported data types:
     # Read first chunk to analyze
     print("\nReading sample data for analysis...")
     try:
-        if is_vcf:
-            from convertor import read_vcf_file
+        with timer.stage("sniff"):
+            if is_vcf:
+                from convertor import read_vcf_file
 
-            sample_df = read_vcf_file(args.input, compression=compression)
-            if len(sample_df) > 1000:
-                sample_df = sample_df.head(1000)
-        else:
-            sample_df = pd.read_csv(
-                args.input,
-                sep=sep,
-                compression=compression,
-                comment=comment,
-                nrows=1000,
-            )
+                sample_df = read_vcf_file(args.input, compression=compression)
+                if len(sample_df) > 1000:
+                    sample_df = sample_df.head(1000)
+            else:
+                sample_df = read_delimited(
+                    args.input,
+                    compression=compression,
+                    threads=args.threads,
+                    decompressor=args.decompressor,
+                    sep=sep,
+                    comment=comment,
+                    nrows=1000,
+                )
     except Exception as e:
         print(f"Error reading file: {e}", file=sys.stderr)
         return 1
@@ -229,7 +818,8 @@ Supported data types:
     print(f"Sample rows: {len(sample_df)}")
 
     # Detect omics type
-    omics_type = auto_detect_omics_type(sample_df)
+    with timer.stage("sniff", rows=len(sample_df)):
+        omics_type = auto_detect_omics_type(sample_df)
     print(f"Detected data type: {omics_type}")
 
     # Show column preview
@@ -244,7 +834,8 @@ Supported data types:
         return 0
 
     # Auto-suggest column mappings
-    suggested_mapping = auto_suggest_mapping(sample_df)
+    with timer.stage("sniff"):
+        suggested_mapping = auto_suggest_mapping(sample_df)
 
     if suggested_mapping and args.verbose:
         print("\nAuto-suggested mappings:")
@@ -304,9 +895,14 @@ Supported data types:
             print("Use --interactive, --batch-interactive, --auto-suggest, or --map")
             return 1
 
+    # Region reads only load the selected records, so no chunking is needed
+    regions = parse_regions(args.region, args.regions_bed)
+
     # Determine if we need chunked processing
-    chunk_size = args.chunk_size
-    if chunk_size is None and file_size_gb > 0.5:
+    chunk_size = None if regions else args.chunk_size
+    if regions and args.chunk_size and args.verbose:
+        print("\nIgnoring --chunk-size for region reads")
+    if chunk_size is None and not regions and file_size_gb > 0.5:
         chunk_size = suggest_chunk_size(args.input, args.memory)
         if chunk_size and args.verbose:
             print(f"\nUsing chunked processing with chunk size: {chunk_size:,} rows")
@@ -316,8 +912,102 @@ Supported data types:
     print("PROCESSING")
     print("=" * 80)
 
+    coercion_stats = None
+    derivation_stats = None
+    binary_output = args.output_format in ("parquet", "dataset", "arrow", "feather")
+    bgzip_output = (
+        args.output_compression == "bgzip"
+        and not args.no_compression
+        and not binary_output
+    )
+    # Compressed text output is written as BGZF blocks compressed in parallel
+    text_compression = (
+        None if args.no_compression or binary_output else args.output_compression
+    )
+    index_text = (
+        args.index
+        and args.output_format in ("csv", "tsv", "parquet")
+        and text_compression in (None, "bgzip")
+    )
+    if args.index and not index_text:
+        print(
+            "Warning: --index requires --no-compression or "
+            "--output-compression bgzip for text output (or parquet output); "
+            "index will not be written",
+            file=sys.stderr,
+        )
+    # Parquet codec for dataset output
+    dataset_compression = None
+    if args.output_format == "dataset" and not args.no_compression:
+        dataset_compression = {"bgzip": "gzip"}.get(
+            args.output_compression, args.output_compression
+        )
+    # Arrow IPC buffers are uncompressed (memory-mappable) unless lz4/zstd is chosen
+    arrow_compression = (
+        args.output_compression
+        if not args.no_compression and args.output_compression in ("lz4", "zstd")
+        else None
+    )
+    partition_cols = (
+        [col.strip() for col in args.partition_by.split(",") if col.strip()]
+        if args.partition_by
+        else None
+    )
+
+    hooks = []
+    if args.profile:
+        hooks.append(CProfileHook(args.profile))
+    if args.sample_profile:
+        hooks.append(SamplingProfilerHook(args.sample_profile))
+    if args.trace:
+        hooks.append(TraceFileHook(args.trace))
+    if args.progress:
+        # Redraw a terminal line often; write an occasional line to logs
+        hooks.append(ProgressHook(ProgressBar(), interval=0.2 if sys.stderr.isatty() else 10))
+    timer.add_hooks(hooks)
+    added_columns = parse_added_columns(args.add_column)
+    conversion_info = {"function": "cli", "input": args.input, "output": args.output}
+    timer.start_conversion(**conversion_info)
+    input_rows = None
+    error = None
+
     try:
-        if chunk_size:
+        # Identical input contents converted with identical options give identical output
+        cache = ConversionCache(args.cache_dir) if args.cache_dir else None
+        cached = None
+        if cache is not None:
+            key = cache_key(
+                file_hash(args.input),
+                {
+                    "column_mapping": column_mapping,
+                    "chunk_size": chunk_size,
+                    "regions_bed": file_hash(args.regions_bed) if args.regions_bed else None,
+                    "output_suffixes": "".join(Path(args.output).suffixes).lower(),
+                    "args": {
+                        name: value
+                        for name, value in vars(args).items()
+                        if name not in CACHE_NEUTRAL_ARGS and name != "regions_bed"
+                    },
+                },
+            )
+            cached = cache.lookup(key)
+        if cached is None:
+            # Never truncate a file whose data is shared with a cache entry
+            unlink_shared(args.output)
+        started = time.time()
+        output_columns = list(column_mapping.values()) + list(added_columns)
+        if args.variant_key:
+            output_columns.append(VARIANT_KEY_COLUMN)
+
+        if cached is not None:
+            with timer.stage("write"):
+                cache.restore_output(key, args.output)
+            coercion_stats = cached["info"].get("coercion_stats")
+            derivation_stats = cached["info"].get("derivation_stats")
+            input_rows = cached["info"].get("rows")
+            output_columns = cached["info"].get("columns", output_columns)
+            print(f"\nReused cached conversion: {args.output}")
+        elif chunk_size:
             # Large file processing
             output_path = args.output
 
@@ -328,63 +1018,206 @@ Supported data types:
             }
             if comment:
                 read_kwargs["comment"] = comment
+            if args.memory_map and compression is None:
+                read_kwargs["memory_map"] = True
+            # Streamed Parquet output is sorted but not indexed
+            write_index = index_text or (args.sort and bgzip_output)
+            if write_index and args.output_format == "parquet":
+                print(
+                    "Warning: chunked Parquet output is not indexed; sorting only",
+                    file=sys.stderr,
+                )
+                write_index = False
+            # Chunks must all be written with the same types
+            if args.downcast:
+                print("Warning: --downcast does not apply to chunked output; ignored", file=sys.stderr)
 
-            process_large_file(
+            summary = process_large_file(
                 args.input,
                 output_path,
                 column_mapping,
                 chunksize=chunk_size,
                 verbose=args.verbose,
+                coerce_types=args.coerce_types,
+                derive_stats=args.derive_stats,
+                variant_key=args.variant_key,
+                sort_output=args.sort or (args.index and args.output_format == "parquet"),
+                write_index=write_index,
+                temp_dir=args.temp_dir,
+                output_format=args.output_format,
+                output_compression=(
+                    dataset_compression
+                    if args.output_format == "dataset"
+                    else arrow_compression
+                    if args.output_format in ("arrow", "feather")
+                    else None
+                    if args.output_format == "parquet" and args.no_compression
+                    else args.output_compression
+                    if args.output_format == "parquet"
+                    else text_compression
+                ),
+                partition_cols=partition_cols,
+                row_group_size=args.row_group_size,
+                index_format=args.index_format,
+                threads=args.threads,
+                compression_level=args.compression_level,
+                decompressor=args.decompressor,
+                workers=args.workers,
+                checkpoint=f"{output_path}.checkpoint.json" if args.resume else None,
+                timer=timer,
+                metadata=added_columns or None,
                 **read_kwargs,
             )
+            input_rows = summary["rows_processed"]
+            coercion_stats = summary.get("coercion_stats")
+            derivation_stats = summary.get("derivation_stats")
         else:
             # Regular processing
-            df = read_data(
-                args.input,
-                sep=sep,
-                compression=compression,
-                comment=comment,
-                is_vcf=is_vcf,
-            )
+            with timer.stage("read"):
+                df = read_data(
+                    args.input,
+                    sep=sep,
+                    compression=compression,
+                    comment=comment,
+                    is_vcf=is_vcf,
+                    dtype=(
+                        text_read_dtypes(column_mapping) or None
+                        if args.coerce_types
+                        else None
+                    ),
+                    regions=regions or None,
+                    threads=args.threads,
+                    decompressor=args.decompressor,
+                    memory_map=args.memory_map,
+                )
 
+            input_rows = len(df)
+            timer.add("read", rows=input_rows)
+            timer.record_input(args.input)
+            timer.progress(input=args.input, bytes_done=Path(args.input).stat().st_size, rows=input_rows)
             if args.verbose:
                 print(f"Loaded data: {df.shape[0]:,} rows, {df.shape[1]} columns")
 
             # Apply mapping
-            result_df = pd.DataFrame()
-            for orig_col, std_col in column_mapping.items():
-                if orig_col in df.columns:
-                    result_df[std_col] = df[orig_col]
+            with timer.stage("map", rows=input_rows):
+                result_df = pd.DataFrame()
+                for orig_col, std_col in column_mapping.items():
+                    if orig_col in df.columns:
+                        result_df[std_col] = df[orig_col]
+
+                # Keep unmatched columns if requested
+                if args.keep_unmatched:
+                    for col in df.columns:
+                        if col not in column_mapping and col not in result_df.columns:
+                            result_df[col] = df[col]
+
+            if args.coerce_types:
+                with timer.stage("coerce", rows=input_rows):
+                    result_df, coercion_stats = coerce_standard_columns(
+                        result_df, downcast=args.downcast
+                    )
+
+            if args.derive_stats:
+                with timer.stage("derive", rows=input_rows):
+                    result_df, derivation_stats = derive_statistics(result_df)
+
+            if args.variant_key:
+                with timer.stage("key", rows=input_rows):
+                    result_df = add_variant_key(result_df)
+
+            for column, value in added_columns.items():
+                result_df[column] = value
 
-            # Keep unmatched columns if requested
             if args.keep_unmatched:
-                for col in df.columns:
-                    if col not in column_mapping and col not in result_df.columns:
-                        result_df[col] = df[col]
+                output_columns = result_df.columns.tolist()
 
             if args.verbose:
                 print(
                     f"Converted data: {result_df.shape[0]:,} rows, {result_df.shape[1]} columns"
                 )
 
+            if args.sort or args.index:
+                with timer.stage("sort", rows=len(result_df)):
+                    result_df = sort_by_coordinates(result_df)
+
             # Save output
             output_compression = None if args.no_compression else "gzip"
+            if output_compression and args.output_compression in ("zstd", "lz4"):
+                output_compression = args.output_compression  # parquet codecs
 
-            if args.output_format == "parquet":
-                result_df.to_parquet(
-                    args.output, compression=output_compression or "snappy"
-                )
-            elif args.output_format == "csv":
-                result_df.to_csv(
-                    args.output, index=False, compression=output_compression
-                )
-            else:  # tsv
-                result_df.to_csv(
-                    args.output, sep="\t", index=False, compression=output_compression
-                )
+            with timer.stage("write", rows=len(result_df)):
+                if text_compression:
+                    tabix_format = (
+                        args.index_format
+                        if bgzip_output
+                        and (args.sort or args.index)
+                        and args.output_format == "tsv"
+                        else None
+                    )
+                    with open_table_writer(
+                        args.output,
+                        output_format=args.output_format,
+                        compression=text_compression,
+                        write_index=tabix_format is not None,
+                        index_format=tabix_format or args.index_format,
+                        level=args.compression_level,
+                        threads=args.threads,
+                        timer=timer,
+                    ) as writer:
+                        writer.write(result_df)
+                elif args.output_format in ("arrow", "feather"):
+                    with open_table_writer(
+                        args.output,
+                        output_format=args.output_format,
+                        compression=arrow_compression,
+                    ) as writer:
+                        writer.write(result_df)
+                elif args.output_format == "dataset":
+                    write_parquet_dataset(
+                        {args.input: result_df},
+                        args.output,
+                        partition_cols=partition_cols,
+                        row_group_size=args.row_group_size or DEFAULT_ROW_GROUP_SIZE,
+                        compression=dataset_compression or "snappy",
+                        source_column=None,
+                    )
+                elif args.index and (
+                    args.output_format == "parquet" or output_compression is None
+                ):
+                    write_indexed_table(
+                        result_df, args.output, args.output_format, presorted=True
+                    )
+                elif args.output_format == "parquet":
+                    result_df.to_parquet(
+                        args.output,
+                        compression=output_compression or "snappy",
+                        row_group_size=args.row_group_size,
+                    )
+                elif args.output_format == "csv":
+                    result_df.to_csv(
+                        args.output, index=False, compression=output_compression
+                    )
+                else:  # tsv
+                    result_df.to_csv(
+                        args.output, sep="\t", index=False, compression=output_compression
+                    )
 
+            timer.record_output(args.output)
             print(f"\nOutput saved to: {args.output}")
 
+        if cache is not None and cached is None:
+            cache.store_output(
+                key,
+                args.output,
+                info={
+                    "rows": input_rows,
+                    "columns": output_columns,
+                    "coercion_stats": coercion_stats,
+                    "derivation_stats": derivation_stats,
+                },
+                since=started,
+            )
+
         # Generate conversion report
         if args.generate_report:
             report_dir = args.report_dir or Path(args.output).parent
@@ -394,33 +1227,30 @@ Supported data types:
             report.set_input_info(
                 filename=args.input,
                 columns=sample_df.columns.tolist(),
-                rows=len(df) if not chunk_size else None,
+                rows=input_rows,
                 file_size_mb=file_size_gb * 1024,
                 omics_type=omics_type,
             )
 
-            report.set_output_info(
-                filename=args.output,
-                columns=(
-                    list(column_mapping.values())
-                    if not args.keep_unmatched
-                    else (
-                        result_df.columns.tolist()
-                        if not chunk_size
-                        else list(column_mapping.values())
-                    )
-                ),
-            )
+            report.set_output_info(filename=args.output, columns=output_columns)
 
             # Get unmapped columns
             unmapped = [col for col in sample_df.columns if col not in column_mapping]
             report.set_column_mapping(column_mapping, unmapped)
+            if coercion_stats:
+                report.set_coercion_info(coercion_stats)
+            if derivation_stats:
+                report.set_derivation_info(derivation_stats)
 
             # Set processing info
             if chunk_size:
                 report.set_processing_info(method="chunked", chunk_size=chunk_size)
             else:
                 report.set_processing_info(method="in-memory")
+            report.set_stage_timings(
+                timer.summary(),
+                elapsed_s=time.time() - started + timer.stages["sniff"]["wall_s"],
+            )
 
             # Save reports
             report.save_report(str(report_dir), "conversion_report")
@@ -433,6 +1263,7 @@ Supported data types:
         return 0
 
     except Exception as e:
+        error = f"{type(e).__name__}: {e}"
         print(f"\nError during conversion: {e}", file=sys.stderr)
         if args.verbose:
             import traceback
@@ -440,6 +1271,13 @@ Supported data types:
             traceback.print_exc()
         return 1
 
+    finally:
+        timer.end_conversion(rows=input_rows, error=error, **conversion_info)
+        if outcome is not None:
+            outcome.update(rows=input_rows, error=error)
+        for hook in hooks:
+            hook.close()
+
 
 def show_patterns():
     """Display all supported column name patterns."""
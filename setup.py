@@ -38,6 +38,18 @@ setup(
         "pyarrow>=12.0.0",
     ],
     extras_require={
+        "stats": [
+            "scipy>=1.9.0",
+        ],
+        "zstd": [
+            "zstandard>=0.19.0",
+        ],
+        "lz4": [
+            "lz4>=4.0.0",
+        ],
+        "xxhash": [
+            "xxhash>=3.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -48,6 +60,7 @@ setup(
     entry_points={
         "console_scripts": [
             "bioconverter=bioconverter.cli:main",
+            "bioconverter-worker=bioconverter.worker:main",
         ],
     },
     keywords="bioinformatics genomics transcriptomics proteomics metabolomics data-conversion",
@@ -0,0 +1,114 @@
+"""Cross-study variant alignment."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bioconverter.alignment import (
+    ALIGN_MISSING,
+    ALIGN_SAME,
+    ALIGN_STRAND,
+    ALIGN_SWAPPED,
+    align_files,
+    align_frames,
+)
+from bioconverter.variants import add_variant_key
+
+
+@pytest.fixture
+def reference():
+    return pd.DataFrame({
+        "chr": ["1", "1", "1", "1", "2"],
+        "pos": [10, 20, 30, 40, 5],
+        "a1": ["A", "A", "A", "A", "C"],
+        "a2": ["G", "G", "T", "G", "T"],
+        "beta": [0.1, 0.2, 0.3, 0.4, 0.5],
+    })
+
+
+@pytest.fixture
+def study():
+    return pd.DataFrame({
+        "chr": ["chr1", "chr1", "chr1", "chr2"],
+        "pos": [10, 20, 30, 5],
+        "a1": ["G", "T", "T", "C"],
+        "a2": ["A", "C", "A", "T"],
+        "beta": [1.0, 2.0, 3.0, 4.0],
+        "frq": [0.1, 0.2, 0.3, 0.4],
+    })
+
+
+def test_orientation_and_harmonised_statistics(reference, study):
+    aligned = align_frames(reference, {"s": study})
+
+    assert aligned["s_orientation"].tolist() == [
+        ALIGN_SWAPPED, ALIGN_STRAND, ALIGN_SWAPPED, ALIGN_MISSING, ALIGN_SAME
+    ]
+    assert aligned["s_ambiguous"].tolist() == [False, False, True, False, False]
+    np.testing.assert_allclose(aligned["s_beta"], [-1.0, 2.0, -3.0, np.nan, 4.0])
+    np.testing.assert_allclose(aligned["s_frq"], [0.9, 0.2, 0.7, np.nan, 0.4])
+
+
+def test_inner_join_and_dropped_ambiguous(reference, study):
+    aligned = align_frames(reference, {"s": study}, how="inner", drop_ambiguous=True)
+    assert aligned["pos"].tolist() == [10, 20, 5]
+
+
+def test_packed_keys_join_like_hashed_keys(reference, study):
+    hashed = align_frames(reference, {"s": study})
+    packed = align_frames(add_variant_key(reference), {"s": add_variant_key(study)})
+    assert packed["s_orientation"].tolist() == hashed["s_orientation"].tolist()
+    assert "s_variant_key" not in packed.columns
+
+
+def _random_study(rng, rows):
+    alleles = np.array(["A", "C", "G", "T"])
+    chrom = rng.choice(["1", "2", "10", "X"], rows)
+    df = pd.DataFrame({
+        "chr": chrom,
+        "pos": rng.integers(1, 5000, rows),
+        "a1": rng.choice(alleles, rows),
+        "a2": rng.choice(alleles, rows),
+        "beta": rng.normal(size=rows),
+    })
+    order = np.lexsort((df["pos"], df["chr"].map({"1": 1, "2": 2, "10": 10, "X": 23})))
+    return df.iloc[order].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("how", ["left", "inner"])
+def test_align_files_matches_align_frames(tmp_path, how):
+    rng = np.random.default_rng(0)
+    reference = _random_study(rng, 4000)
+    study = reference.sample(frac=0.6, random_state=1).sort_index()
+    swap = rng.random(len(study)) < 0.5
+    study.loc[swap, ["a1", "a2"]] = study.loc[swap, ["a2", "a1"]].to_numpy()
+    other = _random_study(rng, 3000)
+    reference.to_csv(tmp_path / "ref.tsv.gz", sep="\t", index=False)
+    study.to_parquet(tmp_path / "study.parquet", index=False)
+    other.to_csv(tmp_path / "other.tsv", sep="\t", index=False)
+
+    expected = align_frames(reference, {"s": study, "o": other}, how=how)
+    summary = align_files(
+        str(tmp_path / "ref.tsv.gz"),
+        {"s": str(tmp_path / "study.parquet"), "o": str(tmp_path / "other.tsv")},
+        str(tmp_path / "aligned.tsv"),
+        how=how,
+        chunksize=333,
+        verbose=False,
+    )
+
+    result = pd.read_csv(tmp_path / "aligned.tsv", sep="\t", dtype={"chr": str})
+    assert summary["rows"] == len(expected)
+    for column in ("s_orientation", "o_orientation", "pos"):
+        assert result[column].tolist() == expected[column].tolist()
+    np.testing.assert_allclose(result["s_beta"], expected["s_beta"])
+
+
+def test_align_files_requires_sorted_input(tmp_path, reference):
+    reference.iloc[::-1].to_csv(tmp_path / "ref.tsv", sep="\t", index=False)
+    reference.to_csv(tmp_path / "study.tsv", sep="\t", index=False)
+    with pytest.raises(ValueError, match="sort"):
+        align_files(
+            str(tmp_path / "ref.tsv"), {"s": str(tmp_path / "study.tsv")},
+            str(tmp_path / "out.tsv"), verbose=False,
+        )
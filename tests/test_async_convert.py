@@ -0,0 +1,44 @@
+"""Concurrent batch conversion with convert_many."""
+
+import asyncio
+import threading
+
+import pandas as pd
+
+from bioconverter.async_convert import convert_many
+from bioconverter.profiling import ConversionHook
+
+
+class MeetingHook(ConversionHook):
+    """Holds each file's conversion until all of them have started."""
+
+    def __init__(self, parties):
+        self.barrier = threading.Barrier(parties, timeout=10)
+        self.met = []
+
+    def conversion_start(self, info):
+        if info["function"] == "convert_single_file":
+            self.barrier.wait()
+            self.met.append(info["input"])
+
+
+def test_files_convert_concurrently_and_failures_are_reported(tmp_path, capsys):
+    files = []
+    for index in range(3):
+        rows = index + 1
+        path = tmp_path / f"study{index}.tsv"
+        pd.DataFrame({"CHR": ["1"] * rows, "BP": range(rows), "P": [0.5] * rows}).to_csv(
+            path, sep="\t", index=False
+        )
+        files.append(str(path))
+    missing = str(tmp_path / "missing.tsv")
+    hook = MeetingHook(len(files))
+
+    results = asyncio.run(convert_many([files[0], missing, *files[1:]], concurrency=8, hooks=hook))
+
+    # Sequential conversion would have broken the barrier, and the hook would have been dropped
+    assert sorted(hook.met) == files
+    assert list(results) == files
+    assert [len(results[path]) for path in files] == [1, 2, 3]
+    assert results[files[2]]["pos"].tolist() == [0, 1, 2]
+    assert f"Error processing {missing}" in capsys.readouterr().out
@@ -0,0 +1,31 @@
+"""BGZF output with a tabix index, read back by region."""
+
+import pandas as pd
+import pytest
+
+from bioconverter.bgzf import is_bgzf
+from bioconverter.convertor import convert_single_file, save_results
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        "chr": ["2", "X", "1", "10", "1"] * 200,
+        "pos": range(1000, 0, -1),
+        "beta": [0.1] * 1000,
+    })
+
+
+def _expected(table, chrom, start, end):
+    mask = (table["chr"] == chrom) & table["pos"].between(start, end)
+    return sorted(table.loc[mask, "pos"])
+
+
+def test_bgzip_tabix_region_read(tmp_path, table):
+    saved = save_results({"t.tsv": table}, str(tmp_path), compression="bgzip", write_index=True)
+    output = saved["t.tsv"]
+    assert is_bgzf(str(output))
+    assert output.with_name(output.name + ".tbi").exists()
+
+    region = convert_single_file(str(output), region="1:100-400", verbose=False)
+    assert sorted(region["pos"]) == _expected(table, "1", 100, 400)
@@ -0,0 +1,21 @@
+"""Content-addressed conversion cache."""
+
+import pandas as pd
+
+from bioconverter.convertor import convert_single_file
+
+
+def test_cache_returns_the_same_frame(tmp_path):
+    table = pd.DataFrame({"chr": ["2", "1"] * 50, "pos": range(100), "beta": [0.1] * 100})
+    source = tmp_path / "t.tsv"
+    table.to_csv(source, sep="\t", index=False)
+    cache_dir = str(tmp_path / "cache")
+
+    first = convert_single_file(str(source), coerce_types=True, cache_dir=cache_dir, verbose=False)
+    second = convert_single_file(str(source), coerce_types=True, cache_dir=cache_dir, verbose=False)
+    other = convert_single_file(str(source), cache_dir=cache_dir, verbose=False)
+
+    assert any((tmp_path / "cache").rglob("*"))
+    pd.testing.assert_frame_equal(first, second)
+    assert second.attrs["coercion_stats"] == first.attrs["coercion_stats"]
+    assert "coercion_stats" not in other.attrs
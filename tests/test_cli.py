@@ -0,0 +1,78 @@
+"""Command-line conversions."""
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from bioconverter.cli import main
+
+
+@pytest.fixture
+def gwas(tmp_path):
+    rows = 5000
+    path = tmp_path / "gwas.tsv"
+    pd.DataFrame({
+        "CHR": ["2", "1"] * (rows // 2), "BP": range(rows, 0, -1), "P": [0.5] * rows,
+    }).to_csv(path, sep="\t", index=False)
+    return path
+
+
+@pytest.mark.parametrize("extra", [[], ["--sort"], ["--workers", "2"]])
+def test_chunked_parquet_output(tmp_path, gwas, extra):
+    output = tmp_path / "out.parquet"
+    code = main([
+        "-i", str(gwas), "-o", str(output), "--output-format", "parquet",
+        "--chunk-size", "700", "--no-report", *extra,
+    ])
+
+    assert code == 0
+    result = pq.read_table(output).to_pandas()
+    assert len(result) == 5000
+    if extra == ["--sort"]:
+        assert result["chr"].tolist() == ["1"] * 2500 + ["2"] * 2500
+
+
+def test_downcast_in_memory_output(tmp_path, gwas):
+    output = tmp_path / "out.parquet"
+    code = main([
+        "-i", str(gwas), "-o", str(output), "--output-format", "parquet",
+        "--coerce-types", "--downcast", "--no-report",
+    ])
+
+    assert code == 0
+    schema = pq.read_schema(output)
+    assert str(schema.field("pos").type) == "int32"
+    # P-values keep float64, which small values need
+    assert str(schema.field("pval").type) == "double"
+
+
+def test_batch_of_paths_and_a_glob(tmp_path, gwas):
+    studies = tmp_path / "studies"
+    studies.mkdir()
+    for name in ("c", "d"):
+        (studies / f"{name}.tsv").write_bytes(gwas.read_bytes())
+    first, second = tmp_path / "a.tsv", tmp_path / "b.tsv"
+    first.write_bytes(gwas.read_bytes())
+    second.write_bytes(gwas.read_bytes())
+    output_dir = tmp_path / "out"
+    options = ["--output-dir", str(output_dir), "--no-compression", "--workers", "2", "--no-report"]
+
+    code = main(["-i", str(first), str(second), str(studies / "*.tsv"), *options])
+
+    assert code == 0
+    for name in "abcd":
+        result = pd.read_csv(output_dir / f"standardized_{name}.tsv", sep="\t")
+        assert len(result) == 5000
+
+    # One failing input fails the run but not the other files
+    broken = tmp_path / "broken.tsv"
+    broken.write_bytes(b"")
+    for path in output_dir.glob("*.tsv"):
+        path.unlink()
+
+    code = main(["-i", str(first), str(broken), str(studies / "*.tsv"), *options])
+
+    assert code == 1
+    assert sorted(path.name for path in output_dir.glob("*.tsv")) == [
+        "standardized_a.tsv", "standardized_c.tsv", "standardized_d.tsv",
+    ]
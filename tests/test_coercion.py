@@ -0,0 +1,48 @@
+"""Typed coercion of standard columns."""
+
+import numpy as np
+import pandas as pd
+
+from bioconverter.coercion import coerce_standard_columns
+from bioconverter.convertor import convert_single_file
+
+
+def test_dtypes_do_not_depend_on_values():
+    # Values that would fit float32/int32 must still give the canonical dtypes,
+    # or chunks of one stream would disagree
+    exact = pd.DataFrame({"beta": ["0.5", "0.25"], "pos": ["1", "2"], "n": ["10", ""]})
+    wide = pd.DataFrame({"beta": ["0.1", "0.2"], "pos": ["1", "5000000000"], "n": ["10", "20"]})
+
+    for df in (exact, wide):
+        result, _ = coerce_standard_columns(df)
+        assert result["beta"].dtype == np.float64
+        assert result["pos"].dtype == np.int64
+        assert str(result["n"].dtype) in ("int64", "Int64")
+
+
+def test_downcast_is_opt_in():
+    df = pd.DataFrame({"beta": ["0.5", "0.25"], "pos": ["1", "2"]})
+    result, _ = coerce_standard_columns(df, downcast=True)
+    assert result["beta"].dtype == np.float32
+    assert result["pos"].dtype == np.int32
+
+
+def test_underflowing_pvalues_keep_their_magnitude():
+    result, stats = coerce_standard_columns(pd.DataFrame({"pval": ["1e-400", "0.5"]}))
+    assert stats["pval"]["underflow"] == 1
+    assert result["neglog10_pval"].iloc[0] == 400
+
+
+def test_convert_single_file_downcasts_on_request(tmp_path):
+    source = tmp_path / "gwas.tsv"
+    pd.DataFrame({"CHR": ["1", "2"], "BP": [10, 20], "BETA": [0.5, 0.25]}).to_csv(
+        source, sep="\t", index=False
+    )
+
+    default = convert_single_file(str(source), coerce_types=True, verbose=False)
+    narrowed = convert_single_file(str(source), coerce_types=True, downcast=True, verbose=False)
+
+    assert default["beta"].dtype == np.float64
+    assert narrowed["beta"].dtype == np.float32
+    assert narrowed["pos"].dtype == np.int32
+    assert narrowed["beta"].tolist() == [0.5, 0.25]
@@ -0,0 +1,28 @@
+"""Derived statistics."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bioconverter.derivation import derive_statistics
+
+
+def test_beta_and_z_from_odds_ratio_and_se():
+    df = pd.DataFrame({"or": [np.e, 1.0], "se": [0.5, 0.1]})
+    result, filled = derive_statistics(df)
+    np.testing.assert_allclose(result["beta"], [1.0, 0.0])
+    np.testing.assert_allclose(result["z"], [2.0, 0.0])
+    assert filled["beta"] == 2
+
+
+def test_existing_values_are_kept_and_gaps_filled():
+    df = pd.DataFrame({"beta": [0.2, np.nan], "se": [0.1, 0.1], "z": [np.nan, 3.0]})
+    result, _ = derive_statistics(df)
+    np.testing.assert_allclose(result["beta"], [0.2, 0.3])
+    np.testing.assert_allclose(result["z"], [2.0, 3.0])
+
+
+def test_pvalue_from_z():
+    pytest.importorskip("scipy")
+    result, _ = derive_statistics(pd.DataFrame({"beta": [0.2], "se": [0.1], "pval": [np.nan]}))
+    np.testing.assert_allclose(result["pval"], [0.04550026])
@@ -0,0 +1,30 @@
+"""Coordinate-sorted output with a block index."""
+
+import pandas as pd
+import pytest
+
+from bioconverter.convertor import save_results
+from bioconverter.genomic_index import query_region
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        "chr": ["2", "X", "1", "10", "1"] * 200,
+        "pos": range(1000, 0, -1),
+        "beta": [0.1] * 1000,
+    })
+
+
+def _expected(table, chrom, start, end):
+    mask = (table["chr"] == chrom) & table["pos"].between(start, end)
+    return sorted(table.loc[mask, "pos"])
+
+
+def test_block_index_query(tmp_path, table):
+    saved = save_results({"t.tsv": table}, str(tmp_path), compression=None, write_index=True)
+    output = saved["t.tsv"]
+
+    result = pd.read_csv(output, sep="\t", dtype={"chr": str})
+    assert list(dict.fromkeys(result["chr"])) == ["1", "2", "10", "X"]
+    assert sorted(query_region(str(output), "chr10:1-500")["pos"]) == _expected(table, "10", 1, 500)
@@ -0,0 +1,35 @@
+"""Chunked conversion with process_large_file."""
+
+import pandas as pd
+import pytest
+
+from bioconverter.interactive_converter import process_large_file
+
+MAPPING = {"CHR": "chr", "BP": "pos", "P": "pval"}
+
+
+@pytest.fixture
+def gwas():
+    return pd.DataFrame({"CHR": [1] * 2000, "BP": range(2000), "P": [0.5] * 2000})
+
+
+# Compressed inputs fall back to sequential / checkpoint-free conversion with a warning
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("suffix", [".tsv", ".tsv.gz", ".tsv.bz2"])
+@pytest.mark.parametrize("mode", ["sequential", "checkpoint", "parallel"])
+def test_compression_inferred_without_kwarg(tmp_path, gwas, suffix, mode):
+    source = tmp_path / f"gwas{suffix}"
+    gwas.to_csv(source, sep="\t", index=False)
+    output = tmp_path / "out.tsv"
+    options = {
+        "sequential": {},
+        "checkpoint": {"checkpoint": str(tmp_path / "checkpoint.json")},
+        "parallel": {"workers": 2},
+    }[mode]
+
+    summary = process_large_file(
+        str(source), str(output), MAPPING, chunksize=500, verbose=False, sep="\t", **options
+    )
+
+    assert summary["rows_processed"] == 2000
+    assert pd.read_csv(output)["pos"].tolist() == list(range(2000))
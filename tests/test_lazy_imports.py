@@ -0,0 +1,31 @@
+"""Importing the package must not import the heavy dependencies."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ["pandas", "pyarrow", "scipy"]
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import bioconverter",
+        "from bioconverter import cli",
+        "from bioconverter.cli import main\ntry:\n    main(['--help'])\nexcept SystemExit:\n    pass",
+    ],
+)
+def test_heavy_modules_are_not_imported(statement):
+    code = f"import json, sys\n{statement}\nprint(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    path = [str(ROOT), os.environ.get("PYTHONPATH")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, path))}
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+
+    assert json.loads(completed.stdout.splitlines()[-1]) == []
@@ -0,0 +1,92 @@
+"""Resumable conversions: chunk checkpoints and the batch manifest."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from bioconverter.convertor import convert_from_metadata
+from bioconverter.interactive_converter import process_large_file
+from bioconverter.manifest import ChunkCheckpoint, ConversionManifest
+
+MAPPING = {"CHR": "chr", "BP": "pos", "P": "pval"}
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def gwas(tmp_path):
+    path = tmp_path / "gwas.tsv"
+    pd.DataFrame({"CHR": ["1"] * 2000, "BP": range(2000), "P": [0.5] * 2000}).to_csv(
+        path, sep="\t", index=False
+    )
+    return path
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_interrupted_conversion_resumes_without_duplicates(tmp_path, monkeypatch, gwas, compression):
+    output = tmp_path / ("out.csv.gz" if compression else "out.csv")
+    checkpoint = str(tmp_path / "out.checkpoint.json")
+    options = dict(
+        chunksize=300, verbose=False, sep="\t", checkpoint=checkpoint,
+        output_compression=compression,
+    )
+    save = ChunkCheckpoint.save
+    saves = []
+
+    def save_then_die(self, **state):
+        save(self, **state)
+        saves.append(state)
+        if len(saves) == 3:
+            # Part of the next chunk reached the output before the process died
+            with open(output, "ab") as handle:
+                handle.write(b"1,999999,0.5\n1,999")
+            raise Interrupted
+
+    monkeypatch.setattr(ChunkCheckpoint, "save", save_then_die)
+    with pytest.raises(Interrupted):
+        process_large_file(str(gwas), str(output), MAPPING, **options)
+    assert os.path.exists(checkpoint)
+
+    monkeypatch.setattr(ChunkCheckpoint, "save", save)
+    summary = process_large_file(str(gwas), str(output), MAPPING, **options)
+
+    assert summary["rows_processed"] == 2000
+    assert not os.path.exists(checkpoint)
+    # One header, every row once, in order
+    result = pd.read_csv(output)
+    assert result.columns.tolist() == ["chr", "pos", "pval"]
+    assert result["pos"].tolist() == list(range(2000))
+
+
+def _convert(gwas, tmp_path):
+    metadata = pd.DataFrame({"file": [str(gwas)], "study": ["s1"]})
+    return convert_from_metadata(
+        metadata, column_mapping={str(gwas): MAPPING}, verbose=False,
+        output_dir=str(tmp_path / "out"), manifest=str(tmp_path / "manifest.jsonl"),
+    )
+
+
+def test_manifest_skips_unchanged_inputs(tmp_path, gwas):
+    assert list(_convert(gwas, tmp_path)) == [str(gwas)]
+    # Touching the input without changing it is not a change
+    os.utime(gwas, ns=(0, 0))
+
+    assert _convert(gwas, tmp_path) == {}
+    manifest = ConversionManifest(str(tmp_path / "manifest.jsonl"))
+    assert manifest.records[str(gwas)]["status"] == "done"
+
+
+def test_manifest_reconverts_changed_inputs(tmp_path, gwas):
+    first = _convert(gwas, tmp_path)[str(gwas)]
+    pd.DataFrame({"CHR": ["2"] * 10, "BP": range(10), "P": [0.1] * 10}).to_csv(
+        gwas, sep="\t", index=False
+    )
+
+    second = _convert(gwas, tmp_path)[str(gwas)]
+
+    assert len(first) == 2000
+    assert len(second) == 10
+    assert second["chr"].astype(str).unique().tolist() == ["2"]
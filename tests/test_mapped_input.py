@@ -0,0 +1,56 @@
+"""Reads through a memory map give the same tables as ordinary reads."""
+
+import pandas as pd
+import pytest
+
+from bioconverter.convertor import read_data
+from bioconverter.interactive_converter import process_large_file
+from bioconverter.mapped_input import MappedInput
+
+
+@pytest.fixture
+def gwas(tmp_path):
+    path = tmp_path / "gwas.tsv"
+    with open(path, "w") as handle:
+        handle.write("## comment line\n")
+        pd.DataFrame({
+            "CHR": ["1", "X"] * 1500, "BP": range(3000), "P": ["1e-400", "NA", "0.5"] * 1000,
+        }).to_csv(handle, sep="\t", index=False)
+    return path
+
+
+def test_read_data_memory_map_matches(gwas, monkeypatch):
+    opened = []
+    open_range = MappedInput.open_range
+
+    def recording_open_range(self, *args):
+        opened.append(self.filename)
+        return open_range(self, *args)
+
+    monkeypatch.setattr(MappedInput, "open_range", recording_open_range)
+
+    mapped = read_data(str(gwas), sep="\t", comment="#", dtype={"P": str}, memory_map=True)
+    plain = read_data(str(gwas), sep="\t", comment="#", dtype={"P": str})
+
+    assert opened == [str(gwas)]
+    pd.testing.assert_frame_equal(mapped, plain)
+
+
+def test_empty_input_fails_like_an_ordinary_read(tmp_path):
+    empty = tmp_path / "empty.tsv"
+    empty.write_bytes(b"")
+    with pytest.raises(pd.errors.EmptyDataError):
+        read_data(str(empty), sep="\t", memory_map=True)
+
+
+def test_chunked_memory_map_matches(tmp_path, gwas):
+    mapping = {"CHR": "chr", "BP": "pos", "P": "pval"}
+    outputs = []
+    for memory_map in (True, False):
+        output = tmp_path / f"out_{memory_map}.tsv"
+        process_large_file(
+            str(gwas), str(output), mapping, chunksize=700, verbose=False,
+            sep="\t", comment="#", memory_map=memory_map,
+        )
+        outputs.append(output.read_bytes())
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,49 @@
+"""Streaming merge of many inputs into one table."""
+
+import pandas as pd
+import pytest
+
+from bioconverter.merge import merge_files
+
+
+def _write(path, df):
+    df.to_csv(path, sep="\t", index=False)
+    return str(path)
+
+
+def test_union_of_columns_with_typed_nulls(tmp_path):
+    first = _write(tmp_path / "a.tsv", pd.DataFrame({"CHR": ["1"], "BP": [10], "BETA": [0.1]}))
+    second = _write(tmp_path / "b.tsv", pd.DataFrame({"CHR": ["X"], "BP": [20], "N": [500]}))
+    output = tmp_path / "merged.parquet"
+
+    summary = merge_files([first, second], str(output), verbose=False)
+
+    merged = pd.read_parquet(output)
+    assert summary["rows"] == 2
+    assert merged["chr"].tolist() == ["1", "X"]
+    assert merged["beta"].isna().tolist() == [False, True]
+    assert merged["n"].isna().tolist() == [True, False]
+    assert merged["source_file"].tolist() == ["a.tsv", "b.tsv"]
+
+
+def test_drifting_unmatched_column_is_not_dropped(tmp_path):
+    df = pd.DataFrame({"CHR": ["1"] * 6000, "BP": range(6000), "lab": ["1"] * 1000 + ["x"] * 5000})
+    source = _write(tmp_path / "drift.tsv", df)
+
+    with pytest.raises(ValueError, match="'lab' has non-numeric values"):
+        merge_files([source], str(tmp_path / "merged.parquet"), chunksize=1000, verbose=False)
+
+    output = tmp_path / "planned.parquet"
+    merge_files([source], str(output), chunksize=1000, sample_rows=6000, verbose=False)
+    assert pd.read_parquet(output)["lab"].tolist() == df["lab"].tolist()
+
+
+def test_text_in_standard_columns_warns(tmp_path):
+    df = pd.DataFrame({"CHR": ["1"] * 2000, "BP": range(2000), "BETA": ["0.1"] * 1500 + ["NA"] * 250 + ["bad"] * 250})
+    source = _write(tmp_path / "gwas.tsv", df)
+    output = tmp_path / "merged.parquet"
+
+    with pytest.warns(UserWarning, match="250 non-numeric values of 'beta'"):
+        merge_files([source], str(output), chunksize=500, verbose=False)
+
+    assert pd.read_parquet(output)["beta"].notna().sum() == 1500
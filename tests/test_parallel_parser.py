@@ -0,0 +1,38 @@
+"""Parallel parsing of byte ranges of one large input."""
+
+import pandas as pd
+import pytest
+
+from bioconverter.parallel_parser import process_file_parallel
+
+MAPPING = {"CHR": "chr", "BP": "pos", "P": "pval"}
+
+
+@pytest.fixture
+def gwas(tmp_path):
+    rows = 20000
+    path = tmp_path / "gwas.tsv"
+    pd.DataFrame({"CHR": ["1"] * rows, "BP": range(rows), "P": [0.5] * rows}).to_csv(
+        path, sep="\t", index=False
+    )
+    return path
+
+
+@pytest.mark.parametrize("output_format", ["tsv", "parquet", "arrow"])
+def test_merged_parts_hold_every_row(tmp_path, gwas, output_format):
+    output = tmp_path / f"out.{output_format}"
+    summary = process_file_parallel(
+        str(gwas), str(output), MAPPING, workers=3, chunksize=1500, verbose=False,
+        output_format=output_format, sep="\t",
+    )
+
+    assert summary["rows_processed"] == 20000
+    assert output.exists()
+    if output_format == "parquet":
+        result = pd.read_parquet(output)
+    elif output_format == "arrow":
+        result = pd.read_feather(output)
+    else:
+        result = pd.read_csv(output, sep="\t")
+    assert result["pos"].tolist() == list(range(20000))
+    assert not list(tmp_path.glob("out.*.part-*"))
@@ -0,0 +1,88 @@
+"""Hooks called around conversions, stages and chunks."""
+
+import pandas as pd
+import pytest
+
+from bioconverter.convertor import convert_single_file
+from bioconverter.interactive_converter import process_large_file
+from bioconverter.profiling import ConversionHook
+
+MAPPING = {"CHR": "chr", "BP": "pos", "P": "pval"}
+
+
+class RecordingHook(ConversionHook):
+    def __init__(self):
+        self.events = []
+
+    def conversion_start(self, info):
+        self.events.append(("conversion_start", info))
+
+    def stage_start(self, stage, info):
+        self.events.append(("stage_start", stage))
+
+    def stage_end(self, stage, info):
+        self.events.append(("stage_end", stage))
+
+    def chunk(self, info):
+        self.events.append(("chunk", info))
+
+    def conversion_end(self, info):
+        self.events.append(("conversion_end", info))
+
+
+@pytest.fixture
+def gwas(tmp_path):
+    path = tmp_path / "gwas.tsv"
+    pd.DataFrame({"CHR": ["1"] * 2000, "BP": range(2000), "P": [0.5] * 2000}).to_csv(
+        path, sep="\t", index=False
+    )
+    return path
+
+
+def _check_nesting(events):
+    open_stages = []
+    for event, value in events:
+        if event == "stage_start":
+            open_stages.append(value)
+        elif event == "stage_end":
+            assert open_stages.pop() == value
+    assert open_stages == []
+
+
+def test_chunked_conversion_events(tmp_path, gwas):
+    hook = RecordingHook()
+    process_large_file(
+        str(gwas), str(tmp_path / "out.tsv"), MAPPING, chunksize=500, verbose=False,
+        sep="\t", hooks=hook,
+    )
+
+    events = hook.events
+    assert events[0][0] == "conversion_start"
+    assert events[-1][0] == "conversion_end"
+    end = events[-1][1]
+    assert end["rows"] == 2000 and end["error"] is None
+    assert {"read", "map", "write"} <= set(end["stages"])
+
+    chunks = [info for event, info in events if event == "chunk"]
+    assert [chunk["index"] for chunk in chunks] == [1, 2, 3, 4]
+    assert [chunk["rows"] for chunk in chunks] == [500] * 4
+    assert all(chunk["latency_s"] >= 0 for chunk in chunks)
+    _check_nesting(events)
+
+
+def test_in_memory_conversion_events_and_failing_hooks(gwas):
+    hook = RecordingHook()
+
+    def broken(event, info):
+        raise RuntimeError("boom")
+
+    with pytest.warns(UserWarning, match="hook removed"):
+        result = convert_single_file(str(gwas), verbose=False, hooks=[broken, hook])
+
+    # A failing hook is dropped; the conversion and the other hooks carry on
+    assert len(result) == 2000
+    stages = [value for event, value in hook.events if event == "stage_start"]
+    assert stages[:2] == ["sniff", "read"] and "map" in stages
+    assert hook.events[0][1]["function"] == "convert_single_file"
+    assert hook.events[-1][1]["rows"] == 2000
+    _check_nesting(hook.events)
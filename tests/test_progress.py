@@ -0,0 +1,45 @@
+"""Byte-based progress of chunked conversions."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from bioconverter.interactive_converter import process_large_file
+
+MAPPING = {"CHR": "chr", "BP": "pos", "P": "pval"}
+
+
+@pytest.fixture(scope="module")
+def table():
+    # Several MB, so the input is consumed over several reader buffers
+    rows = 300_000
+    return pd.DataFrame({"CHR": ["1"] * rows, "BP": range(rows), "P": [0.5] * rows})
+
+
+@pytest.mark.parametrize(
+    "suffix, options",
+    [
+        (".tsv", {}),
+        (".tsv.gz", {}),
+        (".tsv", {"workers": 2}),
+        (".tsv", {"checkpoint": "checkpoint.json"}),
+    ],
+)
+def test_progress_increases_to_the_file_size(tmp_path, table, suffix, options):
+    source = tmp_path / f"gwas{suffix}"
+    table.to_csv(source, sep="\t", index=False)
+    if "checkpoint" in options:
+        options = {"checkpoint": str(tmp_path / options["checkpoint"])}
+    events = []
+
+    process_large_file(
+        str(source), str(tmp_path / "out.tsv"), MAPPING, chunksize=40_000, verbose=False,
+        sep="\t", hooks=lambda event, info: events.append((event, info)), **options,
+    )
+
+    done = [info["bytes_done"] for event, info in events if event == "progress"]
+    assert len(done) > 1
+    assert all(isinstance(value, int) for value in done)
+    assert done == sorted(done)
+    assert done[0] < done[-1] == os.path.getsize(source)
@@ -0,0 +1,35 @@
+"""Saving converted tables with save_results."""
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from bioconverter.convertor import save_results
+
+
+@pytest.fixture
+def results():
+    return {"study.tsv": pd.DataFrame({"chr": ["2", "1"], "pos": [5, 10], "beta": [0.1, 0.2]})}
+
+
+@pytest.mark.parametrize("output_format", ["arrow", "feather"])
+@pytest.mark.parametrize("compression", [None, "lz4"])
+def test_arrow_output_skips_index(tmp_path, results, output_format, compression):
+    with pytest.warns(UserWarning, match="not indexed"):
+        saved = save_results(
+            results, str(tmp_path), output_format=output_format,
+            compression=compression, write_index=True,
+        )
+    result = pd.read_feather(saved["study.tsv"])
+    assert result["chr"].tolist() == ["1", "2"]
+
+
+@pytest.mark.parametrize("write_index", [False, True])
+@pytest.mark.parametrize("compression, codec", [("bgzip", "GZIP"), ("bz2", "SNAPPY"), (None, "SNAPPY")])
+def test_parquet_codec(tmp_path, results, write_index, compression, codec):
+    saved = save_results(
+        results, str(tmp_path), output_format="parquet",
+        compression=compression, write_index=write_index,
+    )
+    metadata = pq.ParquetFile(saved["study.tsv"]).metadata
+    assert metadata.row_group(0).column(0).compression == codec
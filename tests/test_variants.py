@@ -0,0 +1,39 @@
+"""Hashed and packed variant keys."""
+
+import numpy as np
+import pandas as pd
+
+from bioconverter.variants import add_variant_key, packed_variant_keys, variant_hash_keys
+
+
+def _variants():
+    return pd.DataFrame({
+        "chr": ["chr1", "1", "1", "1", "X", "GL000", "GL001", None, "2"],
+        "pos": [10, 10, 10, 10, 5, 7, 7, 1, 300_000_000],
+        "a1": ["A", "G", "T", "A", "C", "A", "A", "A", "A"],
+        "a2": ["G", "A", "C", "C", "T", "G", "G", "G", "G"],
+    })
+
+
+def test_keys_ignore_allele_order_strand_and_prefix():
+    df = _variants()
+    for keys in (variant_hash_keys(df), packed_variant_keys(df).to_numpy()):
+        # A/G, G/A and T/C are one variant; A/C is another
+        assert keys[0] == keys[1] == keys[2]
+        assert keys[3] != keys[0]
+        # Other contigs are told apart by name
+        assert keys[5] != keys[6]
+
+
+def test_packed_keys_sort_by_coordinates_and_mark_unpackable_rows():
+    keys = packed_variant_keys(_variants())
+    assert str(keys.dtype) == "Int64"
+    assert keys.isna().tolist() == [False] * 7 + [True, True]
+    assert keys[0] < keys[4] < keys[5]  # chr1 < chrX < other contigs
+
+
+def test_add_variant_key_without_alleles_keys_positions():
+    df = add_variant_key(pd.DataFrame({"chr": ["1", "1", "2"], "pos": [5, 5, 5]}))
+    keys = df["variant_key"].tolist()
+    assert keys[0] == keys[1] != keys[2]
+    assert np.all(np.diff(df["variant_key"].to_numpy(dtype=np.int64)) >= 0)
@@ -0,0 +1,56 @@
+"""JSON-lines protocol of the conversion worker over stdin/stdout."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_stdio_protocol(tmp_path):
+    pd.DataFrame({"CHR": ["1", "2"], "BP": [10, 20], "P": [0.5, 0.1]}).to_csv(
+        tmp_path / "in.tsv", sep="\t", index=False
+    )
+    convert = ["-i", "in.tsv", "-o", "out.tsv", "--no-compression", "--no-report"]
+    jobs = [
+        {"id": "convert", "args": convert, "cwd": str(tmp_path)},
+        {"id": "missing", "args": ["-i", "missing.tsv", "-o", "x.csv"], "cwd": str(tmp_path)},
+        {"id": "no-args"},
+        {"command": "frobnicate", "id": "unknown"},
+        {"command": "ping"},
+    ]
+    lines = [json.dumps(job) for job in jobs]
+    lines.insert(2, "{not json")
+
+    path = [str(ROOT), os.environ.get("PYTHONPATH")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, path))}
+    completed = subprocess.run(
+        [sys.executable, "-m", "bioconverter.worker", "serve", "--processes", "2"],
+        input="\n".join(lines) + "\n", capture_output=True, text=True, env=env, timeout=120,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    results = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert len(results) == 6
+    by_id = {result.get("id"): result for result in results}
+
+    assert by_id["convert"]["status"] == "ok"
+    assert by_id["convert"]["exit_code"] == 0
+    assert pd.read_csv(tmp_path / "out.tsv", sep="\t")["pos"].tolist() == [10, 20]
+
+    assert by_id["missing"]["status"] == "error"
+    assert by_id["missing"]["exit_code"] != 0
+    assert not (tmp_path / "x.csv").exists()
+
+    assert "'args'" in by_id["no-args"]["stderr"]
+    assert by_id["unknown"]["stderr"] == "unknown command: frobnicate"
+
+    untagged = [result for result in results if "id" not in result]
+    invalid = [result for result in untagged if result["status"] == "error"]
+    assert len(invalid) == 1 and invalid[0]["stderr"].startswith("invalid job:")
+    pings = [result for result in untagged if "pid" in result]
+    assert pings[0]["processes"] == 2
@@ -0,0 +1,120 @@
+"""Chunked output must hold the same values as the in-memory conversion."""
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pytest
+
+from bioconverter.convertor import convert_single_file
+from bioconverter.interactive_converter import process_large_file
+from bioconverter.writers import open_table_writer
+
+MAPPING = {"CHR": "chr", "BP": "pos", "BETA": "beta", "P": "pval", "N": "n"}
+
+
+@pytest.fixture
+def drifting_gwas(tmp_path):
+    """Values that fit float32/int32 (or are integral) in the first chunk only."""
+    first = pd.DataFrame({
+        "CHR": ["1"] * 500, "BP": range(500), "BETA": [0.5, 1.0] * 250,
+        "P": [0.25] * 500, "N": [1000] * 500,
+    })
+    later = pd.DataFrame({
+        "CHR": ["X"] * 500, "BP": range(5_000_000_000, 5_000_000_500), "BETA": [0.1] * 500,
+        "P": [1e-50] * 500, "N": [None] * 250 + [3_000_000_000] * 250,
+    })
+    path = tmp_path / "gwas.tsv"
+    pd.concat([first, later]).to_csv(path, sep="\t", index=False)
+    return path
+
+
+def _read(path, output_format):
+    if output_format in ("arrow", "feather"):
+        return pd.read_feather(path)
+    if output_format == "dataset":
+        return ds.dataset(path, format="parquet", partitioning="hive").to_table().to_pandas()
+    return pd.read_csv(path, sep="\t" if output_format == "tsv" else ",", dtype={"chr": str})
+
+
+def _assert_same_values(result, expected):
+    result = result.sort_values(["chr", "pos"]).reset_index(drop=True)
+    expected = expected.sort_values(["chr", "pos"]).reset_index(drop=True)
+    assert result["chr"].astype(str).tolist() == expected["chr"].astype(str).tolist()
+    for column in expected.columns.drop("chr"):
+        # Text parsing may differ in the last bit; float32 truncation would not
+        np.testing.assert_allclose(
+            result[column].astype("float64").to_numpy(),
+            expected[column].astype("float64").to_numpy(),
+            rtol=1e-15, err_msg=column,
+        )
+
+
+@pytest.mark.parametrize("output_format", ["csv", "tsv", "arrow", "dataset"])
+@pytest.mark.parametrize("coerce_types", [False, True])
+def test_chunked_matches_in_memory(tmp_path, drifting_gwas, output_format, coerce_types):
+    expected = convert_single_file(
+        str(drifting_gwas), column_mapping=MAPPING, coerce_types=coerce_types,
+        keep_unmatched=False, verbose=False,
+    )
+    output = tmp_path / f"out.{output_format}"
+    process_large_file(
+        str(drifting_gwas), str(output), MAPPING, chunksize=100, verbose=False,
+        coerce_types=coerce_types, output_format=output_format, sep="\t",
+    )
+    _assert_same_values(_read(output, output_format), expected[list(MAPPING.values())])
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow", "dataset"])
+def test_writer_schema_fits_later_chunks(tmp_path, output_format):
+    first = pd.DataFrame({
+        "chr": [1], "pos": np.array([1], dtype=np.int32),
+        "beta": np.array([0.5], dtype=np.float32), "n": [10],
+    })
+    later = pd.DataFrame({"chr": ["X"], "pos": [5_000_000_000], "beta": [0.1], "n": [np.nan]})
+    output = tmp_path / "out"
+    with open_table_writer(str(output), output_format=output_format) as writer:
+        writer.write(first)
+        writer.write(later)
+
+    if output_format == "parquet":
+        result = pd.read_parquet(output)
+    else:
+        result = _read(output, output_format)
+    result = result.sort_values("pos").reset_index(drop=True)
+    assert result["pos"].tolist() == [1, 5_000_000_000]
+    assert result["beta"].tolist() == [0.5, 0.1]
+    assert result["chr"].tolist() == ["1", "X"]
+
+
+@pytest.fixture
+def mixed_type_gwas(tmp_path):
+    """P values and alleles whose inferred types change from chunk to chunk."""
+    rows = 9000
+    pvals = ["0.5"] * 3000 + ["1e-400"] * 1000 + ["<1e-300"] * 1000 + ["NA"] * 1000 + ["0.01"] * 3000
+    df = pd.DataFrame({
+        "CHR": ["1"] * rows, "BP": range(rows), "P": pvals, "A1": ["A"] * 3000 + ["1"] * 6000,
+    })
+    path = tmp_path / "mixed.tsv"
+    df.to_csv(path, sep="\t", index=False)
+    return path
+
+
+def _convert_mixed(tmp_path, source, output_format):
+    output = tmp_path / f"mixed.{output_format}"
+    summary = process_large_file(
+        str(source), str(output), {"CHR": "chr", "BP": "pos", "P": "pval", "A1": "a1"},
+        chunksize=3000, verbose=False, output_format=output_format, sep="\t",
+    )
+    assert summary["rows_processed"] == 9000
+    result = _read(output, output_format).sort_values("pos").reset_index(drop=True)
+    assert result["pval"].iloc[[0, 3500, 4500, 8000]].tolist() == [0.5, 0.0, 1e-300, 0.01]
+    assert result["pval"].iloc[5000:6000].isna().all()
+    assert result["a1"].iloc[[0, 8000]].tolist() == ["A", "1"]
+
+
+def test_arrow_chunks_with_mixed_types(tmp_path, mixed_type_gwas):
+    _convert_mixed(tmp_path, mixed_type_gwas, "arrow")
+
+
+def test_dataset_chunks_with_mixed_types(tmp_path, mixed_type_gwas):
+    _convert_mixed(tmp_path, mixed_type_gwas, "dataset")